@@ -0,0 +1,54 @@
+from typing import Any, Dict, Iterable, Tuple, Type
+from django.db import models
+
+
+def sync_many_to_many(
+    model: Type[models.Model],
+    field_name: str,
+    related_ids_by_id: Dict[Any, Iterable[Any]]
+) -> Tuple[int, int]:
+    """
+    Synchronise a many-to-many relation for many objects at once.
+
+    related_ids_by_id maps the primary key of each object to the complete list of
+    related primary keys it should end up with, e.g. {resource_id: [tag_id, ...]}.
+    The current through-table rows of all objects are read with one query, then the
+    missing rows are bulk inserted and the stale ones deleted with one query each.
+    Objects absent from the mapping are left untouched. Note that, like any bulk
+    operation, this does not send m2m_changed signals.
+
+    Returns the number of (added, removed) through-table rows.
+    """
+    if not related_ids_by_id:
+        return 0, 0
+
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source_attname = through._meta.get_field(field.m2m_field_name()).attname
+    target_attname = through._meta.get_field(field.m2m_reverse_field_name()).attname
+
+    wanted = {
+        (source_id, target_id)
+        for source_id, target_ids in related_ids_by_id.items()
+        for target_id in target_ids
+    }
+    current = {
+        (source_id, target_id): row_id
+        for row_id, source_id, target_id in through.objects.filter(
+            **{f'{source_attname}__in': list(related_ids_by_id)}
+        ).values_list('pk', source_attname, target_attname)
+    }
+
+    stale_row_ids = [row_id for pair, row_id in current.items() if pair not in wanted]
+    missing_rows = [
+        through(**{source_attname: source_id, target_attname: target_id})
+        for source_id, target_id in wanted
+        if (source_id, target_id) not in current
+    ]
+
+    if stale_row_ids:
+        through.objects.filter(pk__in=stale_row_ids).delete()
+    if missing_rows:
+        through.objects.bulk_create(missing_rows, ignore_conflicts=True)
+
+    return len(missing_rows), len(stale_row_ids)
@@ -35,3 +35,16 @@ class LearningResourceIndex(algoliasearch.AlgoliaIndex):
     # For example: heiko_local_learning_resource
 
 algoliasearch.register(LearningResource, LearningResourceIndex)
+
+
+def save_learning_resource_records(queryset):
+    """
+    Push learning resources to Algolia in a single batch request.
+    Bulk writes bypass the post_save signal that normally keeps the index in sync.
+    """
+    if not algoliasearch.algolia_engine.is_registered(LearningResource):
+        return
+    adapter = algoliasearch.get_adapter(LearningResource)
+    records = [adapter.get_raw_record(resource) for resource in queryset]
+    if records:
+        algoliasearch.algolia_engine.client.init_index(adapter.index_name).save_objects(records)
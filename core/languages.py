@@ -0,0 +1,96 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+import pycountry
+
+# Native names pycountry doesn't carry, for the languages platforms tend to spell out
+NATIVE_NAMES = {
+    'العربية': 'ar',
+    'български': 'bg',
+    'català': 'ca',
+    'čeština': 'cs',
+    'dansk': 'da',
+    'deutsch': 'de',
+    'ελληνικά': 'el',
+    'español': 'es',
+    'castellano': 'es',
+    'eesti': 'et',
+    'فارسی': 'fa',
+    'suomi': 'fi',
+    'français': 'fr',
+    'עברית': 'he',
+    'हिन्दी': 'hi',
+    'hrvatski': 'hr',
+    'magyar': 'hu',
+    'bahasa indonesia': 'id',
+    'italiano': 'it',
+    '日本語': 'ja',
+    '한국어': 'ko',
+    'lietuvių': 'lt',
+    'latviešu': 'lv',
+    'bahasa melayu': 'ms',
+    'nederlands': 'nl',
+    'norsk': 'no',
+    'polski': 'pl',
+    'português': 'pt',
+    'română': 'ro',
+    'русский': 'ru',
+    'slovenčina': 'sk',
+    'slovenščina': 'sl',
+    'српски': 'sr',
+    'svenska': 'sv',
+    'kiswahili': 'sw',
+    'ไทย': 'th',
+    'türkçe': 'tr',
+    'українська': 'uk',
+    'اردو': 'ur',
+    'tiếng việt': 'vi',
+    '中文': 'zh',
+    '普通话': 'zh',
+}
+
+
+class LanguageIndex(NamedTuple):
+    # Lower-cased alpha-2, alpha-3, bibliographic code, English or native name -> alpha-2
+    codes: Mapping[str, str]
+    # alpha-2 -> English name
+    names: Mapping[str, str]
+
+
+@lru_cache(maxsize=None)
+def language_index() -> LanguageIndex:
+    """
+    Build the language lookup once per process from pycountry's ISO 639 data.
+    Only languages with an ISO 639-1 (alpha-2) code are included.
+    """
+    codes = {}
+    names = {}
+    for language in pycountry.languages:
+        alpha_2 = getattr(language, 'alpha_2', None)
+        if not alpha_2:
+            continue
+        names[alpha_2] = language.name
+        for key in ('name', 'common_name', 'inverted_name', 'bibliographic', 'alpha_3'):
+            value = getattr(language, key, None)
+            if value:
+                codes.setdefault(value.casefold(), alpha_2)
+    # Codes take precedence over names
+    codes.update({alpha_2.casefold(): alpha_2 for alpha_2 in names})
+    for native_name, alpha_2 in NATIVE_NAMES.items():
+        codes.setdefault(native_name.casefold(), alpha_2)
+    return LanguageIndex(MappingProxyType(codes), MappingProxyType(names))
+
+
+def resolve_language(value: str) -> Optional[str]:
+    """Return the ISO 639-1 code for a code, English name or native name, or None if unknown"""
+    return language_index().codes.get(value.strip().casefold())
+
+
+def is_language_code(code: str) -> bool:
+    """Whether code is a known ISO 639-1 code"""
+    return code in language_index().names
+
+
+def language_name(code: str) -> Optional[str]:
+    """English name of an ISO 639-1 code"""
+    return language_index().names.get(code)
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from core.languages import language_index, resolve_language, is_language_code
+import pycountry
+import time
+
+# What platforms put in their language fields
+SAMPLE_LANGUAGES = ['en', 'English', 'eng', 'es', 'Spanish', 'spa', 'Español', 'fr', 'French', 'zh', 'Chinese', 'xx']
+
+
+def legacy_resolve_language(lang):
+    """The pycountry lookups LearningResourceInput made before core.languages"""
+    lang = lang.strip()
+    try:
+        language = pycountry.languages.get(alpha_2=lang.lower())
+        if language:
+            return language.alpha_2
+        language = pycountry.languages.get(alpha_3=lang.lower())
+        if language:
+            return language.alpha_2
+        language = pycountry.languages.get(name=lang.title())
+        if language and hasattr(language, 'alpha_2'):
+            return language.alpha_2
+        return lang.lower()
+    except (AttributeError, KeyError):
+        return lang.lower()
+
+
+def legacy_is_language_code(code):
+    return pycountry.languages.get(alpha_2=code) is not None
+
+
+class Command(BaseCommand):
+    help = 'Compare the precomputed language index against per-call pycountry lookups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('languages', nargs='*', help='Language values to resolve (defaults to a sample)')
+        parser.add_argument('--repeat', type=int, default=20000, help='Passes over the languages per resolver')
+
+    def _measure(self, resolve, languages, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for lang in languages:
+                resolve(lang)
+        return len(languages) * repeat / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        languages = options['languages'] or SAMPLE_LANGUAGES
+        repeat = max(1, options['repeat'])
+
+        started = time.perf_counter()
+        legacy_resolve_language('en')
+        self.stdout.write(f'pycountry database load: {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        language_index.cache_clear()
+        started = time.perf_counter()
+        index = language_index()
+        self.stdout.write(
+            f'Index build: {(time.perf_counter() - started) * 1000:.1f} ms '
+            f'({len(index.codes)} keys, {len(index.names)} languages)'
+        )
+
+        for lang in languages:
+            legacy = legacy_resolve_language(lang)
+            resolved = resolve_language(lang) or lang.strip().lower()
+            if legacy != resolved:
+                self.stdout.write(self.style.WARNING(f'  {lang!r}: pycountry {legacy!r}, index {resolved!r}'))
+
+        for label, resolve, check in (
+            ('pycountry per call', legacy_resolve_language, legacy_is_language_code),
+            ('precomputed index ', resolve_language, is_language_code),
+        ):
+            self.stdout.write(
+                f'{label}: {self._measure(resolve, languages, repeat):,.0f} resolutions/sec, '
+                f'{self._measure(check, ["en", "fr", "xx"], repeat):,.0f} code checks/sec'
+            )
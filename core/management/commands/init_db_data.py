@@ -3,6 +3,7 @@ import os
 from django.core.management.base import BaseCommand
 from django.db import connection, transaction
 from core.models import Level, Creator, Platform, Format, Language, Tag, LearningResource
+from core.languages import resolve_language, language_name
 
 class Command(BaseCommand):
     help = 'Initialize database with initial data'
@@ -63,6 +64,15 @@ class Command(BaseCommand):
             self.stdout.write(f'No data file found for {model.__name__}, skipping...')
 
     def create_instance(self, model, data):
+        if model == Language:
+            # Store languages under their ISO 639-1 code, named as the validators resolve them
+            iso_code = resolve_language(data.get('iso_code', ''))
+            if iso_code is None:
+                self.stdout.write(self.style.WARNING(f"Skipping unknown language: {data.get('iso_code')}"))
+                return
+            data['iso_code'] = iso_code
+            data['name'] = data.get('name') or language_name(iso_code)
+
         if model == Tag:
             # Special handling for Tag model due to self-referential relationship
             parent_tag_name = data.get('parent_tag')
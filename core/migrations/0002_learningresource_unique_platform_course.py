@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-18 09:32
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_resources(apps, schema_editor):
+    """
+    The per-item save path could store a course twice. Keep the most recently updated
+    row of each (platform, platform_course_id) so the unique constraint can be added.
+    """
+    LearningResource = apps.get_model('core', 'LearningResource')
+    duplicates = (
+        LearningResource.objects.values('platform_id', 'platform_course_id')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        ids = list(
+            LearningResource.objects.filter(
+                platform_id=duplicate['platform_id'],
+                platform_course_id=duplicate['platform_course_id'],
+            ).order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+        LearningResource.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_resources, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='learningresource',
+            constraint=models.UniqueConstraint(fields=('platform_id', 'platform_course_id'), name='unique_platform_course'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 09:35
+
+from django.db import migrations, models
+
+
+def merge_duplicate_creators(apps, schema_editor):
+    """
+    Merge creators stored more than once for the same (platform, platform_creator_id),
+    including creators without a platform, into the most recently updated row so the
+    unique constraints can be added. Their learning resources are moved to that row.
+    """
+    Creator = apps.get_model('core', 'Creator')
+    LearningResource = apps.get_model('core', 'LearningResource')
+    Through = LearningResource.creators.through
+
+    duplicates = (
+        Creator.objects.exclude(platform_creator_id=None)
+        .values('platform', 'platform_creator_id')
+        .annotate(rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        if duplicate['platform'] is None:
+            rows = Creator.objects.filter(platform__isnull=True)
+        else:
+            rows = Creator.objects.filter(platform=duplicate['platform'])
+        ids = list(
+            rows.filter(platform_creator_id=duplicate['platform_creator_id'])
+            .order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+        keep, merged = ids[0], ids[1:]
+        linked = set(Through.objects.filter(creator_id=keep).values_list('learningresource_id', flat=True))
+        moved = set(Through.objects.filter(creator_id__in=merged).values_list('learningresource_id', flat=True))
+        Through.objects.bulk_create([
+            Through(learningresource_id=resource_id, creator_id=keep) for resource_id in moved - linked
+        ])
+        # Deleting the merged creators also deletes their links
+        Creator.objects.filter(id__in=merged).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_learningresource_unique_platform_course'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_creators, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='creator',
+            constraint=models.UniqueConstraint(fields=('platform', 'platform_creator_id'), name='unique_platform_creator'),
+        ),
+        migrations.AddConstraint(
+            model_name='creator',
+            constraint=models.UniqueConstraint(condition=models.Q(('platform__isnull', True)), fields=('platform_creator_id',), name='unique_creator_without_platform'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_creator_unique_platform_creator'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningresource',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -39,6 +39,20 @@ class Creator(TimeStampMixin, models.Model):
     description = models.TextField(blank=True, null=True)
     platform_thumbnail_url = models.URLField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['platform', 'platform_creator_id'],
+                name='unique_platform_creator'
+            ),
+            # NULLs are distinct under the constraint above, so creators without a platform need their own
+            models.UniqueConstraint(
+                fields=['platform_creator_id'],
+                condition=models.Q(platform__isnull=True),
+                name='unique_creator_without_platform'
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -70,6 +84,9 @@ class Tag(TimeStampMixin, models.Model):
     slug = models.SlugField(max_length=255, unique=True)
     name = models.CharField(max_length=255)
 
+    # Per-process cache of cleaned tag name -> tag id, shared by every crawl in the process
+    _id_cache = {}
+
     class Meta:
         indexes = [
             models.Index(fields=['name']),
@@ -92,21 +109,70 @@ class Tag(TimeStampMixin, models.Model):
         """Clean and standardize tag names."""
         return name.lower().strip()
 
+    @classmethod
+    def clear_id_cache(cls):
+        """Forget cached tag ids, e.g. after the transaction that created them was rolled back."""
+        cls._id_cache.clear()
+
+    @classmethod
+    def get_or_create_tag_ids(cls, tag_names):
+        """
+        Resolve tag names to tag ids, creating the missing tags in bulk.
+        Names are cleaned with clean_tag_name and the ids are returned in input order
+        (duplicates and empty names removed). Resolved ids are cached per process.
+        """
+        cleaned_names = list(dict.fromkeys(
+            cleaned_name
+            for cleaned_name in (cls.clean_tag_name(name) for name in tag_names)
+            if cleaned_name
+        ))
+
+        missing_names = [name for name in cleaned_names if name not in cls._id_cache]
+        if missing_names:
+            cls._cache_ids(missing_names)
+
+            new_names = [name for name in missing_names if name not in cls._id_cache]
+            if new_names:
+                cls.objects.bulk_create(
+                    [cls(name=name, slug=slugify(name)) for name in new_names],
+                    ignore_conflicts=True
+                )
+                cls._cache_ids(new_names)
+
+                # A name whose slug is taken by a different tag needs a suffixed slug
+                for name in new_names:
+                    if name not in cls._id_cache:
+                        tag = cls.objects.create(name=name, slug=cls._unique_slug(name))
+                        cls._id_cache[name] = tag.id
+
+        return [cls._id_cache[name] for name in cleaned_names]
+
     @classmethod
     def get_or_create_tags(cls, tag_names):
         """
         Get or create multiple tags at once.
-        Returns a list of Tag objects.
+        Returns a list of Tag objects in input order.
         """
-        tags = []
-        for name in tag_names:
-            cleaned_name = cls.clean_tag_name(name)
-            tag, _ = cls.objects.get_or_create(
-                name=cleaned_name,
-                defaults={'slug': slugify(cleaned_name)}
-            )
-            tags.append(tag)
-        return tags
+        tag_ids = cls.get_or_create_tag_ids(tag_names)
+        tags = cls.objects.in_bulk(tag_ids)
+        return [tags[tag_id] for tag_id in tag_ids]
+
+    @classmethod
+    def _cache_ids(cls, names):
+        """Load the ids of existing tags with the given cleaned names with a single query."""
+        for tag_id, name in cls.objects.filter(name__in=names).values_list('id', 'name'):
+            cls._id_cache.setdefault(name, tag_id)
+
+    @classmethod
+    def _unique_slug(cls, name):
+        base_slug = slugify(name) or 'tag'
+        taken_slugs = set(cls.objects.filter(slug__startswith=base_slug).values_list('slug', flat=True))
+        slug = base_slug
+        suffix = 2
+        while slug in taken_slugs:
+            slug = f'{base_slug}-{suffix}'
+            suffix += 1
+        return slug
 
 
 class LearningResource(TimeStampMixin, models.Model):
@@ -142,7 +208,16 @@ class LearningResource(TimeStampMixin, models.Model):
         null=True, 
         blank=True
     )
-    
+    # Hash of the scraped content, used to skip writes when a re-crawl finds no changes
+    content_hash = models.CharField(max_length=64, blank=True, null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['platform_id', 'platform_course_id'],
+                name='unique_platform_course'
+            ),
+        ]
 
     def __str__(self):
         return self.name
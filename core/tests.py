@@ -1,3 +1,60 @@
+from algoliasearch_django.decorators import disable_auto_indexing
 from django.test import TestCase
 
-# Create your tests here.
+from core.bulk import sync_many_to_many
+from core.models import LearningResource, Platform, Tag
+
+
+class SyncManyToManyTests(TestCase):
+    def setUp(self):
+        platform = Platform.objects.create(id='edx', name='edX', url='https://www.edx.org')
+        with disable_auto_indexing():
+            self.first, self.second, self.untouched = [
+                LearningResource.objects.create(
+                    platform_id=platform,
+                    platform_course_id=course_id,
+                    name=course_id,
+                    url=f'https://www.edx.org/learn/{course_id}',
+                    description='',
+                    short_description='',
+                )
+                for course_id in ('first', 'second', 'untouched')
+            ]
+        self.python, self.sql, self.rust = [
+            Tag.objects.create(name=name).id for name in ('python', 'sql', 'rust')
+        ]
+
+    def tag_ids(self, resource):
+        return set(resource.tags.values_list('id', flat=True))
+
+    def test_adds_missing_and_removes_stale_rows(self):
+        self.first.tags.set([self.python, self.sql])
+        self.untouched.tags.set([self.python])
+
+        # One read, one delete, one insert, whatever the number of resources
+        with self.assertNumQueries(3):
+            added, removed = sync_many_to_many(LearningResource, 'tags', {
+                self.first.id: [self.sql, self.rust],
+                self.second.id: [self.python],
+            })
+
+        self.assertEqual((added, removed), (2, 1))
+        self.assertEqual(self.tag_ids(self.first), {self.sql, self.rust})
+        self.assertEqual(self.tag_ids(self.second), {self.python})
+        self.assertEqual(self.tag_ids(self.untouched), {self.python})
+
+    def test_unchanged_relations_only_read(self):
+        self.first.tags.set([self.python, self.sql])
+
+        with self.assertNumQueries(1):
+            result = sync_many_to_many(LearningResource, 'tags', {self.first.id: [self.sql, self.python]})
+
+        self.assertEqual(result, (0, 0))
+        self.assertEqual(self.tag_ids(self.first), {self.python, self.sql})
+
+    def test_empty_list_clears_the_relation(self):
+        self.first.tags.set([self.python, self.sql])
+
+        self.assertEqual(sync_many_to_many(LearningResource, 'tags', {self.first.id: []}), (0, 2))
+        self.assertEqual(self.tag_ids(self.first), set())
+        self.assertEqual(sync_many_to_many(LearningResource, 'tags', {}), (0, 0))
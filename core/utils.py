@@ -1,3 +1,21 @@
+import csv
+import os
+from functools import lru_cache
+
+INIT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'init_data')
+
 
 def determine_platform_name_from_slug_code(slug_code: str):
-    return slug_code.capitalize().replace('-', ' ').replace('_', ' ')
\ No newline at end of file
+    return slug_code.capitalize().replace('-', ' ').replace('_', ' ')
+
+
+@lru_cache(maxsize=None)
+def init_platform_names():
+    """Platform names by id, as init_db_data loads them from init_data/platform.csv"""
+    with open(os.path.join(INIT_DATA_DIR, 'platform.csv'), 'r', encoding='utf-8') as file:
+        return {row['id']: row['name'] for row in csv.DictReader(file)}
+
+
+def platform_name(platform_id: str):
+    """Name of a platform created while saving; the id itself for platforms not in the init data"""
+    return init_platform_names().get(platform_id, platform_id)
@@ -3,15 +3,15 @@ from django.contrib import admin
 import sqlite3
 import tempfile
 
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.db.models import OuterRef, Subquery, Count
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, HttpResponseRedirect
 from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.html import mark_safe
 
-from scraper.models import Spider, Execution, Item
-from scraper.tasks import run_spider
+from scraper.models import Spider, Execution, Item, SitemapUrl, HttpValidator
+from scraper.tasks import schedule_spider
 
 
 def dict_to_html_table(d):
@@ -61,7 +61,7 @@ class SpiderAdmin(admin.ModelAdmin):
 
     def schedule_for_execution(self, request, qs):
         for obj in qs:
-            run_spider.delay(obj.id)
+            schedule_spider(obj)
         self.message_user(request, f'{len(qs)} spiders scheduled for execution')
 
     def set_active(self, request, qs):
@@ -196,6 +196,11 @@ class ExecutionAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.download('sqlite')),
                 name='scraper_execution_download_sqlite',
             ),
+            path(
+                '<int:pk>/download/parquet/',
+                self.admin_site.admin_view(self.download('parquet')),
+                name='scraper_execution_download_parquet',
+            ),
         ]
         return custom_urls + urls
 
@@ -222,6 +227,31 @@ class ExecutionAdmin(admin.ModelAdmin):
                 t.close()
                 extension = 'sqlite3'
                 content_type = 'application/octet-stream'
+            elif format == 'parquet':
+                # Imported here so the admin doesn't load Scrapy, or need pyarrow, until a Parquet download
+                from scraper.scrapy_project.exporters import ParquetItemExporter
+
+                # Streamed from the database a row group at a time instead of through a DataFrame
+                t = tempfile.NamedTemporaryFile()
+                try:
+                    exporter = ParquetItemExporter(
+                        t,
+                        metadata={'execution_id': execution.pk, 'execution_stats': execution.stats},
+                    )
+                except ImportError as e:
+                    t.close()
+                    self.message_user(request, f'Parquet download unavailable: {e}', messages.ERROR)
+                    return HttpResponseRedirect(reverse('admin:scraper_execution_change', args=[pk]))
+                exporter.start_exporting()
+                items = Item.objects.filter(execution=execution).order_by('pk')
+                for data in items.values_list('data', flat=True).iterator(chunk_size=2000):
+                    exporter.export_item(data)
+                exporter.finish_exporting()
+                t.seek(0)
+                response.write(t.read())
+                t.close()
+                extension = 'parquet'
+                content_type = 'application/vnd.apache.parquet'
 
             response['Content-Disposition'] = f'attachment; filename={execution.spider.name}_{execution.time_started.strftime("%Y-%m-%d")}.{extension}'
             response['Content-Type'] = content_type
@@ -233,9 +263,11 @@ class ExecutionAdmin(admin.ModelAdmin):
     def download_markup(self, obj):
         return format_html(
             '<a class="button" download href="{}">Excel</a>&nbsp;'
-            '<a class="button" download href="{}">SQLite</a>',
+            '<a class="button" download href="{}">SQLite</a>&nbsp;'
+            '<a class="button" download href="{}">Parquet</a>',
             reverse('admin:scraper_execution_download_excel', args=[obj.pk]),
             reverse('admin:scraper_execution_download_sqlite', args=[obj.pk]),
+            reverse('admin:scraper_execution_download_parquet', args=[obj.pk]),
         )
 
     download_markup.short_description = 'Download Items'
@@ -271,7 +303,21 @@ def get_queryset(self, request):
     return super().get_queryset(request).select_related('spider')
 
 
+class SitemapUrlAdmin(admin.ModelAdmin):
+    list_display = ['url', 'platform_id', 'lastmod', 'last_fetched']
+    list_filter = ['platform_id']
+    search_fields = ['url']
+
+
+class HttpValidatorAdmin(admin.ModelAdmin):
+    list_display = ['url', 'spider_name', 'etag', 'last_modified', 'time_updated']
+    list_filter = ['spider_name']
+    search_fields = ['url']
+
+
 admin.site.register(Spider, SpiderAdmin)
 admin.site.register(Execution, ExecutionAdmin)
 admin.site.register(Item, ItemAdmin)
+admin.site.register(SitemapUrl, SitemapUrlAdmin)
+admin.site.register(HttpValidator, HttpValidatorAdmin)
 
@@ -0,0 +1,49 @@
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator
+from scraper.scrapy_project.pipelines.temp_save.segments import is_segment_directory, segment_files
+
+DUMP_EXTENSIONS = ('.json', '.jl', '.jsonl', '.jl.gz', '.jsonl.gz')
+
+
+def dump_files(paths: Iterable[str]) -> Iterator[str]:
+    """Expand files and directories into the dump files they contain"""
+    for path in paths:
+        if os.path.isdir(path) and is_segment_directory(path):
+            # A temp-save segment set is replayed segment by segment, in write order
+            yield from segment_files(path)
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(DUMP_EXTENSIONS):
+                    yield os.path.join(path, name)
+        elif os.path.exists(path):
+            yield path
+        else:
+            raise FileNotFoundError(f'No such file or directory: {path}')
+
+
+def read_dump_items(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield learning resource items from a feed export (.jl/.jsonl, one item per line),
+    a temp-save segment (.jl.gz, item data per line) or a single legacy temp-save
+    dump (.json, the item data only).
+    """
+    opener = gzip.open if file_path.endswith('.gz') else open
+    with opener(file_path, 'rt', encoding='utf-8') as f:
+        if file_path.endswith('.json'):
+            records = [json.load(f)]
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            # Feed exports hold whole items, temp-save dumps only the item data
+            if 'type' in record and 'data' in record:
+                if record['type'] == 'learning_resource':
+                    yield record
+            else:
+                yield {'type': 'learning_resource', 'data': record}
+
+
+def iter_dump_items(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for file_path in dump_files(paths):
+        yield from read_dump_items(file_path)
@@ -3,6 +3,7 @@ import json
 import logging
 import os
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.timezone import now
 from scrapy.crawler import CrawlerRunner
 from scrapy.utils.spider import iter_spider_classes
@@ -20,18 +21,29 @@ crochet.setup()
 logger = logging.getLogger(__name__)
 
 class SpiderExecutor:
-    def __init__(self, spider_model):
+    def __init__(self, spider_model, execution=None, shard=None, shards=1):
+        """
+        Pass the coordinating execution, shard and shards to run one shard of a sharded
+        crawl; the execution is then left to the coordinator and execute returns the stats.
+        """
         self.spider = spider_model
         self.logger = SpiderExecutionLogger(spider_model.name)
         self.stats_manager = SpiderStatisticsManager()
+        self.execution = execution
+        self.shard = shard
+        self.shards = shards
         self.settings = self._prepare_settings()
-        self.execution = None
         self.runner = CrawlerRunner(self.settings)
 
     def _prepare_settings(self):
         base_settings = get_project_settings()
         spider_settings = self.spider.settings or {}
         base_settings.update(spider_settings)
+        if self.shards > 1:
+            base_settings.set('SPIDER_MIDDLEWARES', {
+                **base_settings.getdict('SPIDER_MIDDLEWARES'),
+                'scraper.scrapy_project.middlewares.ShardedCrawlMiddleware': 543,
+            })
         return base_settings
 
     @crochet.wait_for(timeout=3600)
@@ -41,11 +53,12 @@ class SpiderExecutor:
             # Setup logging
             log_capture_string, handlers = self.logger.setup_logging()
             
-            # Create execution record
-            self.execution = Execution.objects.create(
-                spider=self.spider,
-                time_started=now()
-            )
+            # Create execution record, unless this is a shard of one
+            if self.execution is None:
+                self.execution = Execution.objects.create(
+                    spider=self.spider,
+                    time_started=now()
+                )
 
             # Load spider class
             spider_class = self._get_spider_class()
@@ -59,15 +72,34 @@ class SpiderExecutor:
                 'settings': self.spider.settings,
                 'log_level': self.spider.log_level
             }
+            if self.shards > 1:
+                spider_kwargs.update(shard=self.shard, shards=self.shards)
 
             # Run spider
-            deferred = self.runner.crawl(spider_class, **spider_kwargs)
+            crawler = self.runner.create_crawler(spider_class)
+            deferred = self.runner.crawl(crawler, **spider_kwargs)
+            deferred.addBoth(self._finish_execution, crawler)
             return deferred
 
         except Exception as e:
             logger.error(f"Spider execution failed: {str(e)}", exc_info=True)
             raise
 
+    def _finish_execution(self, result, crawler):
+        """Store the crawl stats on the execution record once the crawl is done"""
+        try:
+            stats = crawler.stats.get_stats() if crawler.stats else {}
+            if self.shards > 1:
+                # The coordinator merges the stats of all shards, see scraper.tasks
+                return json.loads(json.dumps(stats, cls=DjangoJSONEncoder))
+            self.execution.stats = stats
+            self.execution.time_ended = now()
+            self.execution.items_scraped = stats.get('item_scraped_count', 0)
+            self.execution.save(update_fields=['stats', 'time_ended', 'items_scraped'])
+        except Exception as e:
+            logger.error(f"Failed to store execution stats: {str(e)}", exc_info=True)
+        return result
+
     def _get_spider_class(self):
         """Import and return the spider class"""
         try:
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from scrapy.extensions.postprocessing import GzipPlugin
+from scraper.dumps import iter_dump_items
+from scraper.management.commands.benchmark_validation import SAMPLE_DATA
+from scraper.scrapy_project.exporters import JsonLinesItemExporter, FastJsonLinesItemExporter
+from scraper.scrapy_project.validation import validate_resource
+from pydantic import AnyUrl, ValidationError
+import copy
+import io
+import json
+import time
+
+
+def stringify_urls(value):
+    """
+    JsonLinesItemExporter can't encode HttpUrl values (its _serialize_value hook is never
+    called by Scrapy's JSON lines exporter), so it only gets items with the URLs as strings
+    """
+    if isinstance(value, AnyUrl):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: stringify_urls(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [stringify_urls(item) for item in value]
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Compare the orjson feed exporter against the urlparse-based JsonLinesItemExporter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Feed exports or temp-save dumps to export')
+        parser.add_argument('--items', type=int, default=20000, help='Number of items when using the built-in sample')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per exporter, the best is reported')
+
+    def _corpus(self, paths, count):
+        """Validated items, carrying the HttpUrl, Decimal and datetime values a crawl exports"""
+        if paths:
+            source = [item['data'] for item in iter_dump_items(paths)]
+        else:
+            source = []
+            for index in range(count):
+                data = copy.deepcopy(SAMPLE_DATA)
+                data['platform_course_id'] = f"{SAMPLE_DATA['platform_course_id'][:-6]}{index:06d}"
+                source.append(data)
+        corpus = []
+        for data in source:
+            try:
+                corpus.append({'type': 'learning_resource', 'data': validate_resource(data).model_dump()})
+            except ValidationError:
+                continue
+        return corpus
+
+    def _export(self, exporter_class, corpus, compress=False):
+        buffer = io.BytesIO()
+        file = GzipPlugin(buffer, {'gzip_compresslevel': 5}) if compress else buffer
+        exporter = exporter_class(file)
+        started = time.perf_counter()
+        exporter.start_exporting()
+        for item in corpus:
+            exporter.export_item(item)
+        exporter.finish_exporting()
+        if compress:
+            file.close()
+        return time.perf_counter() - started, buffer.getvalue()
+
+    def handle(self, *args, **options):
+        try:
+            corpus = self._corpus(options['paths'], options['items'])
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        if not corpus:
+            raise CommandError('No valid learning resources to export')
+
+        string_corpus = [stringify_urls(item) for item in corpus]
+        _, legacy_output = self._export(JsonLinesItemExporter, string_corpus)
+        _, fast_output = self._export(FastJsonLinesItemExporter, corpus)
+        legacy_lines = legacy_output.decode('utf-8').splitlines()
+        fast_lines = fast_output.decode('utf-8').splitlines()
+        if [json.loads(line) for line in legacy_lines] != [json.loads(line) for line in fast_lines]:
+            self.stdout.write(self.style.WARNING('The exporters produced different items'))
+
+        self.stdout.write(f'{len(corpus)} learning resources, {len(legacy_output) / len(corpus):.0f} bytes/item')
+        baseline = None
+        for label, exporter_class, items, compress in (
+            ('JsonLinesItemExporter (before)   ', JsonLinesItemExporter, string_corpus, False),
+            ('FastJsonLinesItemExporter        ', FastJsonLinesItemExporter, string_corpus, False),
+            ('FastJsonLinesItemExporter HttpUrl', FastJsonLinesItemExporter, corpus, False),
+            ('FastJsonLinesItemExporter gzip   ', FastJsonLinesItemExporter, corpus, True),
+        ):
+            runs = [self._export(exporter_class, items, compress) for _ in range(max(1, options['repeat']))]
+            elapsed, output = min(runs, key=lambda run: run[0])
+            rate = len(corpus) / elapsed
+            baseline = baseline or rate
+            self.stdout.write(
+                f'{label}: {rate:,.0f} items/sec ({rate / baseline:.1f}x), {len(output) / 1024:,.0f} KiB'
+            )
@@ -0,0 +1,137 @@
+from django.core.management.base import BaseCommand, CommandError
+from scraper.scrapy_project.httpcache import iter_recorded_bodies
+from scraper.scrapy_project.page_data import get_path, load_subtree
+from scraper.scrapy_project.spiders.edx import EdxSpider
+import json
+import orjson
+import time
+import tracemalloc
+
+# The parts of a recorded edX course that EdxSpider.parse reads
+SAMPLE_COURSE = {
+    'uuid': '3a4e8b2f-2f02-4b44-8e8a-9d6d5ba47a5e',
+    'title': 'Introduction to Computer Science and Programming Using Python',
+    'fullDescription': '<p>This course is the first of a two-course sequence: Introduction to Computer Science '
+                       'and Programming Using Python, and Introduction to Computational Thinking and Data Science.</p>',
+    'shortDescription': '<p>An introduction to computer science as a tool to solve real-world analytical problems.</p>',
+    'language': 'English',
+    'updatedAt': '2024-10-28T09:12:44Z',
+    'originalImage': {'src': 'https://prod-discovery.edx-cdn.org/media/course/image/intro-cs.jpg'},
+    'courseReview': {'reviewCount': 1204, 'avgCourseRating': 4.61},
+    'levelType': 'Introductory',
+    'enrollmentCount': 1654321,
+    'skillNames': ['Python', 'Algorithms'],
+    'subjects': [{'name': 'Computer Science'}],
+    'owners': [{
+        'name': 'MITx',
+        'uuid': '2a73d2ce-c34a-4e08-8223-83bca9d2f01d',
+        'marketingUrl': 'https://www.edx.org/school/mitx',
+        'logoImageUrl': 'https://prod-discovery.edx-cdn.org/organization/logos/mitx.png',
+    }],
+    'activeCourseRun': {
+        'seats': [{'type': 'audit', 'price': '0.00'}, {'type': 'verified', 'price': '75.00'}],
+        'enrollmentStart': None,
+        'enrollmentEnd': None,
+        'minEffort': 14,
+        'maxEffort': 16,
+        'weeksToComplete': 9,
+        'isEnrollable': True,
+    },
+}
+
+
+def sample_page(related_courses):
+    """A page-data.json whose page context carries related courses besides the course itself"""
+    related = [
+        {'course': {**SAMPLE_COURSE, 'uuid': f'{index:08d}-related', 'title': f'Related "course": {{{index}\\'}}
+        for index in range(related_courses)
+    ]
+    return orjson.dumps({
+        'componentChunkName': 'component---src-templates-course-page-tsx',
+        'path': '/learn/computer-science/mitx-introduction-to-computer-science',
+        'result': {'pageContext': {'relatedCourses': related, 'course': SAMPLE_COURSE}},
+        'staticQueryHashes': ['1234567890', '2345678901'],
+    })
+
+
+def legacy_course(body):
+    """What EdxSpider.parse did: response.json(), i.e. decode to text and json.loads it all"""
+    json_data = json.loads(body.decode('utf-8'))
+    return json_data.get('result', {}).get('pageContext', {}).get('course', {})
+
+
+class Command(BaseCommand):
+    help = 'Compare page-data.json parsing CPU time and peak memory before and after subtree extraction'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*',
+            help='page-data.json files or SQLite HTTP caches recorded with HTTPCACHE_SQLITE_MODE = "record"'
+        )
+        parser.add_argument('--related-courses', type=int, default=200,
+                            help='Unrelated page context in the built-in sample, in courses')
+        parser.add_argument('--repeat', type=int, default=20, help='Passes over the pages per parser')
+
+    def _pages(self, paths, related_courses):
+        if not paths:
+            return [sample_page(related_courses)]
+        pages = []
+        for path in paths:
+            try:
+                if path.endswith('.sqlite3'):
+                    pages.extend(body for _, body in iter_recorded_bodies(path, 'page-data.json'))
+                else:
+                    with open(path, 'rb') as f:
+                        pages.append(f.read())
+            except OSError as e:
+                raise CommandError(str(e))
+        return pages
+
+    def _cpu(self, parse, pages, repeat):
+        started = time.process_time()
+        for _ in range(repeat):
+            for body in pages:
+                parse(body)
+        return (time.process_time() - started) / (len(pages) * repeat) * 1000
+
+    def _peak(self, parse, pages):
+        """Largest traced allocation peak while parsing one page"""
+        peak = 0
+        for body in pages:
+            tracemalloc.start()
+            course = parse(body)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            del course
+        return peak
+
+    def handle(self, *args, **options):
+        pages = self._pages(options['paths'], options['related_courses'])
+        if not pages:
+            raise CommandError('No page-data.json responses to parse')
+        path = EdxSpider.COURSE_PATH
+        parsers = (
+            ('response.json()      ', legacy_course),
+            ('orjson, whole page   ', lambda body: get_path(orjson.loads(body), path)),
+            ('course subtree only  ', lambda body: load_subtree(body, path, max_full_parse_bytes=0)),
+        )
+
+        for body in pages:
+            expected = legacy_course(body)
+            for label, parse in parsers[1:]:
+                if parse(body) != expected:
+                    raise CommandError(f'{label.strip()} extracted a different course ({len(body):,} bytes page)')
+
+        sizes = sorted(len(body) for body in pages)
+        self.stdout.write(
+            f'{len(pages)} pages, {sizes[len(sizes) // 2] / 1024:,.0f} KiB median, {sizes[-1] / 1024:,.0f} KiB largest'
+        )
+        repeat = max(1, options['repeat'])
+        baseline = None
+        for label, parse in parsers:
+            cpu = self._cpu(parse, pages, repeat)
+            baseline = baseline or cpu
+            self.stdout.write(
+                f'{label}: {cpu:.2f} ms CPU/page ({baseline / cpu:.1f}x), '
+                f'peak {self._peak(parse, pages) / 1024:,.0f} KiB'
+            )
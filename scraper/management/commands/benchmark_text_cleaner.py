@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand, CommandError
+from bs4 import BeautifulSoup
+from scraper.dumps import iter_dump_items
+from scraper.scrapy_project.html_processing import html_to_text
+import re
+import time
+
+# Representative edX fields, used when no dump is given
+SAMPLE_FIELDS = [
+    'Introduction to Computer Science and Programming Using Python',
+    'An introduction to computer science as a tool to solve real-world analytical problems using Python 3.5.',
+    'Learn the fundamentals of data science & machine learning from MIT faculty.',
+    '<p>This course is the first of a two-course sequence: <strong>Introduction to Computer Science '
+    'and Programming Using Python</strong>, and Introduction to Computational Thinking and Data Science.</p>'
+    '<ul><li>Python&nbsp;3 basics</li><li>Simple algorithms &mdash; search and sort</li>'
+    '<li>Testing &amp; debugging</li></ul>',
+    '<p>Taught by instructors from <a href="https://www.edx.org/school/mitx">MITx</a>.</p>\n<p>No prior '
+    'programming experience is required.</p>',
+    'Harvard University',
+    '<div><p>Week 1: Getting started</p><p>Week 2: Data types &lt;int&gt;, &lt;str&gt;</p></div>',
+    'Earn a verified certificate — share it on LinkedIn.',
+]
+
+
+def legacy_clean_text(text):
+    """The BeautifulSoup-based cleaner TextCleanerPipeline used before html_to_text"""
+    if not text:
+        return text
+    text = BeautifulSoup(text, 'html.parser').get_text()
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&amp;', '&')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&quot;', '"')
+    text = text.replace('&#39;', "'")
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+class Command(BaseCommand):
+    help = 'Compare the text cleaner against the previous BeautifulSoup cleaner and report fields per second'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Feed exports or temp-save dumps to take fields from')
+        parser.add_argument('--repeat', type=int, default=20, help='Passes over the corpus per cleaner')
+
+    def _corpus(self, paths):
+        if not paths:
+            return list(SAMPLE_FIELDS)
+        fields = []
+        for item in iter_dump_items(paths):
+            data = item['data']
+            # The fields TextCleanerPipeline cleans, plus the raw HTML to exercise the parser
+            for key in ('name', 'description', 'short_description', 'html_description'):
+                if data.get(key):
+                    fields.append(data[key])
+            for creator in data.get('creators') or []:
+                for key in ('name', 'description'):
+                    if creator.get(key):
+                        fields.append(creator[key])
+        return fields
+
+    def _measure(self, clean, corpus, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for text in corpus:
+                clean(text)
+        elapsed = time.perf_counter() - started
+        return len(corpus) * repeat / elapsed if elapsed else float('inf')
+
+    def handle(self, *args, **options):
+        try:
+            corpus = self._corpus(options['paths'])
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        if not corpus:
+            raise CommandError('No text fields found in the given dumps')
+
+        mismatches = [
+            (text, expected, actual)
+            for text, expected, actual in (
+                (text, legacy_clean_text(text), html_to_text(text)) for text in corpus
+            )
+            if expected != actual
+        ]
+        markup = sum(1 for text in corpus if '<' in text or '&' in text)
+        self.stdout.write(
+            f'{len(corpus)} fields ({markup} with markup or entities), {len(mismatches)} differ from the legacy cleaner'
+        )
+        for text, expected, actual in mismatches[:10]:
+            self.stdout.write(self.style.WARNING(f'  {text[:80]!r}: {expected[:80]!r} != {actual[:80]!r}'))
+
+        repeat = max(1, options['repeat'])
+        legacy_rate = self._measure(legacy_clean_text, corpus, repeat)
+        fast_rate = self._measure(html_to_text, corpus, repeat)
+        self.stdout.write(f'legacy (BeautifulSoup): {legacy_rate:,.0f} fields/sec')
+        self.stdout.write(f'html_to_text:           {fast_rate:,.0f} fields/sec')
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {fast_rate / legacy_rate:.1f}x'))
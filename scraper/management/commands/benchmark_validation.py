@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand, CommandError
+from scraper.dumps import iter_dump_items
+from scraper.scrapy_project.validators import LearningResourceInput, LearningResourceOutput, CreatorOutput
+from scraper.scrapy_project.validation import validate_resource, validate_resources, revalidate_changes, validated_text
+import copy
+import time
+
+# A recorded edX item, used when no dump is given
+SAMPLE_DATA = {
+    'creators': [{
+        'name': 'MITx',
+        'platform_id': 'edx',
+        'platform_creator_id': '2a73d2ce-c34a-4e08-8223-83bca9d2f01d',
+        'url': 'https://www.edx.org/school/mitx',
+        'platform_thumbnail_url': 'https://prod-discovery.edx-cdn.org/organization/logos/mitx.png',
+        'description': '',
+    }],
+    'name': 'Introduction to Computer Science and Programming Using Python',
+    'url': 'https://www.edx.org/learn/computer-science/massachusetts-institute-of-technology-introduction-to-computer-science',
+    'scraped_timestamp': '2024-11-02T14:21:07.511382',
+    'platform_id': 'edx',
+    'description': 'This course is the first of a two-course sequence: Introduction to Computer Science and '
+                   'Programming Using Python, and Introduction to Computational Thinking and Data Science.',
+    'html_description': '<p>This course is the first of a two-course sequence: Introduction to Computer Science '
+                        'and Programming Using Python, and Introduction to Computational Thinking and Data Science.</p>',
+    'platform_course_id': '3a4e8b2f-2f02-4b44-8e8a-9d6d5ba47a5e',
+    'languages': ['English'],
+    'is_free': False,
+    'is_limited_free': True,
+    'dollar_price': 75.0,
+    'has_certificate': True,
+    'short_description': 'An introduction to computer science as a tool to solve real-world analytical problems.',
+    'platform_last_update': '2024-10-28T09:12:44Z',
+    'platform_thumbnail_url': 'https://prod-discovery.edx-cdn.org/media/course/image/intro-cs.jpg',
+    'duration_h': 81.0,
+    'platform_reviews_rating': 4.6,
+    'level': 'Beginner',
+    'enrollment_count': 1654321,
+    'is_active': True,
+    'tags': ['Computer Science', 'Python'],
+    'format': 'Video',
+}
+
+
+def legacy_validate(data):
+    """The two validation passes the pipelines made before the single-pass engine"""
+    data = LearningResourceInput(**data).model_dump()
+    data['creators'] = [CreatorOutput(**creator).model_dump() for creator in data['creators']]
+    return LearningResourceOutput(**data).model_dump()
+
+
+def single_pass_validate(data):
+    model = validate_resource(data)
+    data = model.model_dump()
+    revalidate_changes(validated_text(model), data)
+    return data
+
+
+def batch_validate(batch):
+    return [model.model_dump() for model in validate_resources(batch)]
+
+
+class Command(BaseCommand):
+    help = 'Measure learning resource validation throughput before and after the single-pass engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Feed exports or temp-save dumps to validate')
+        parser.add_argument('--items', type=int, default=2000, help='Number of items when using the built-in sample')
+        parser.add_argument('--batch-size', type=int, default=100, help='Items per TypeAdapter call')
+
+    def _corpus(self, paths, count):
+        if paths:
+            return [item['data'] for item in iter_dump_items(paths)]
+        corpus = []
+        for index in range(count):
+            data = copy.deepcopy(SAMPLE_DATA)
+            data['platform_course_id'] = f"{SAMPLE_DATA['platform_course_id'][:-6]}{index:06d}"
+            corpus.append(data)
+        return corpus
+
+    def _rate(self, run, count):
+        started = time.perf_counter()
+        run()
+        return count / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        try:
+            corpus = self._corpus(options['paths'], options['items'])
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        corpus = [data for data in corpus if self._is_valid(data)]
+        if not corpus:
+            raise CommandError('No valid learning resources to validate')
+
+        size = max(1, options['batch_size'])
+        batches = [corpus[start:start + size] for start in range(0, len(corpus), size)]
+        results = (
+            ('two passes (before)', lambda: [legacy_validate(data) for data in corpus]),
+            ('single pass        ', lambda: [single_pass_validate(data) for data in corpus]),
+            (f'batches of {size:<8}', lambda: [batch_validate(batch) for batch in batches]),
+        )
+        self.stdout.write(f'{len(corpus)} learning resources')
+        rates = [(label, self._rate(run, len(corpus))) for label, run in results]
+        for label, rate in rates:
+            self.stdout.write(f'{label}: {rate:,.0f} items/sec ({rate / rates[0][1]:.1f}x)')
+
+    def _is_valid(self, data):
+        try:
+            legacy_validate(data)
+            return True
+        except Exception:
+            return False
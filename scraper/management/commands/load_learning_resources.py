@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from pydantic import ValidationError
+from scraper.scrapy_project.validation import validate_resources
+from scraper.scrapy_project.pipelines.learning_resources.database_save import DatabaseSavePipeline
+from scraper.dumps import dump_files, read_dump_items
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk load learning resources from JSON dumps through the COPY staging path. '
+        'Accepts feed exports (.jl/.jsonl) and temp-save JSON files or directories of them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Dump files or directories to replay')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of resources sent to the staging table per COPY',
+        )
+
+    def _batches(self, items, size):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('load_learning_resources requires a PostgreSQL database')
+
+        pipeline = DatabaseSavePipeline(
+            mode=DatabaseSavePipeline.COPY_MODE,
+            batch_size=options['batch_size'],
+            batch_timeout=0,
+        )
+
+        started = time.monotonic()
+        loaded = invalid = 0
+        pipeline.open_spider(None)
+        try:
+            for file_path in dump_files(options['paths']):
+                self.stdout.write(f'Loading {file_path}...')
+                for batch in self._batches(read_dump_items(file_path), options['batch_size']):
+                    for result in validate_resources([item['data'] for item in batch]):
+                        if isinstance(result, ValidationError):
+                            invalid += 1
+                            continue
+                        pipeline.process_item({'type': 'learning_resource', 'data': result.model_dump()}, None)
+                        loaded += 1
+        except FileNotFoundError as e:
+            pipeline.loader.close()
+            raise CommandError(str(e))
+        except BaseException:
+            pipeline.loader.close()
+            raise
+        pipeline.close_spider(None)
+
+        outcomes = pipeline.loader.outcomes or {}
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {loaded} learning resources in {time.monotonic() - started:.1f}s: "
+            f"{outcomes.get('inserted', 0)} inserted, {outcomes.get('updated', 0)} updated, "
+            f"{outcomes.get('skipped', 0)} unchanged, {invalid} invalid"
+        ))
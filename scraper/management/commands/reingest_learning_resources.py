@@ -0,0 +1,125 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.project import get_project_settings
+from scraper.dumps import iter_dump_items
+from scraper.reingest import process_items
+from scraper.scrapy_project.pipelines.learning_resources.database_save import DatabaseSavePipeline
+import os
+import time
+
+
+class ReingestSpider(Spider):
+    """Stands in for the spider that recorded the crawl so the pipelines have stats to write to"""
+    name = 'reingest'
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a recorded crawl through the validation, cleaning and save stages without any network. '
+        'Accepts feed exports (.jl/.jsonl), temp-save segment sets and temp-save JSON files or directories of them. '
+        'Validation and cleaning run in a process pool; all writes go through one batched writer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Recorded crawls to replay')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes validating and cleaning items; 0 runs everything in this process (for profiling)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=200, help='Items sent to a worker at a time')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Items per database write')
+        parser.add_argument(
+            '--mode',
+            choices=[DatabaseSavePipeline.BATCH_MODE, DatabaseSavePipeline.COPY_MODE],
+            default=DatabaseSavePipeline.BATCH_MODE,
+            help="Save mode; 'copy' stages everything and merges once at the end (PostgreSQL only)",
+        )
+
+    def _chunks(self, items, size):
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _processed(self, chunks, workers):
+        """Yield the processed chunks in input order, keeping only a few in flight per worker"""
+        if workers <= 0:
+            for chunk in chunks:
+                yield process_items(chunk)
+            return
+
+        # Workers don't use the database; don't let them inherit our connection
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(process_items, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def handle(self, *args, **options):
+        crawler = Crawler(ReingestSpider, get_project_settings())
+        crawler.stats = MemoryStatsCollector(crawler)
+        spider = ReingestSpider.from_crawler(crawler)
+        stats = crawler.stats
+
+        pipeline = DatabaseSavePipeline(
+            mode=options['mode'],
+            batch_size=options['batch_size'],
+            batch_timeout=0,
+            crawler=crawler,
+        )
+
+        started = time.monotonic()
+        seen = set()
+        stats.open_spider(spider)
+        pipeline.open_spider(spider)
+        chunks = self._chunks(iter_dump_items(options['paths']), max(1, options['chunk_size']))
+        try:
+            for results in self._processed(chunks, options['workers']):
+                for item, error in results:
+                    stats.inc_value('reingest/items_read', spider=spider)
+                    if item is None:
+                        stats.inc_value('reingest/invalid', spider=spider)
+                        continue
+                    # The same rule DuplicateFilterPipeline applies during a crawl
+                    key = (item['data'].get('platform_id'), item['data'].get('platform_course_id'))
+                    if key in seen:
+                        stats.inc_value('reingest/duplicates', spider=spider)
+                        continue
+                    seen.add(key)
+                    pipeline.process_item(item, spider)
+        except FileNotFoundError as e:
+            if pipeline.loader is not None:
+                pipeline.loader.close()
+            raise CommandError(str(e))
+        except BaseException:
+            if pipeline.loader is not None:
+                pipeline.loader.close()
+            raise
+        pipeline.close_spider(spider)
+
+        elapsed = time.monotonic() - started
+        read = stats.get_value('reingest/items_read', 0)
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {read} items in {elapsed:.1f}s ({read / max(elapsed, 1e-9):,.0f} items/sec): "
+            f"{stats.get_value('database_save/resources/inserted', 0)} inserted, "
+            f"{stats.get_value('database_save/resources/updated', 0)} updated, "
+            f"{stats.get_value('database_save/resources/skipped', 0)} unchanged, "
+            f"{stats.get_value('database_save/items_failed', 0)} failed, "
+            f"{stats.get_value('reingest/invalid', 0)} invalid, "
+            f"{stats.get_value('reingest/duplicates', 0)} duplicates"
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapUrl',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform_id', models.CharField(max_length=255)),
+                ('url', models.URLField(max_length=2048)),
+                ('lastmod', models.DateTimeField(blank=True, null=True)),
+                ('last_fetched', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='sitemapurl',
+            constraint=models.UniqueConstraint(fields=('platform_id', 'url'), name='unique_platform_sitemap_url'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0002_sitemapurl'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HttpValidator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spider_name', models.CharField(max_length=200)),
+                ('url', models.URLField(max_length=2048)),
+                ('etag', models.CharField(blank=True, max_length=512)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('content_length', models.IntegerField(default=0)),
+                ('time_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='httpvalidator',
+            constraint=models.UniqueConstraint(fields=('spider_name', 'url'), name='unique_spider_http_validator'),
+        ),
+    ]
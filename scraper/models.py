@@ -128,3 +128,49 @@ class Item(models.Model):
         except (ValueError, TypeError):
             val = None
         return val
+
+
+class SitemapUrl(models.Model):
+    """
+    The crawl frontier of sitemap-driven spiders: the sitemap lastmod of every URL last
+    fetched, so later runs only request URLs that changed.
+    """
+    platform_id = models.CharField(max_length=255)
+    url = models.URLField(max_length=2048)
+    lastmod = models.DateTimeField(null=True, blank=True)
+    last_fetched = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['platform_id', 'url'],
+                name='unique_platform_sitemap_url'
+            ),
+        ]
+
+    def __str__(self):
+        return self.url
+
+
+class HttpValidator(models.Model):
+    """
+    The ETag and Last-Modified a URL was last served with, sent back as If-None-Match and
+    If-Modified-Since so unchanged pages come back as an empty 304.
+    """
+    spider_name = models.CharField(max_length=200)
+    url = models.URLField(max_length=2048)
+    etag = models.CharField(max_length=512, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    content_length = models.IntegerField(default=0)
+    time_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['spider_name', 'url'],
+                name='unique_spider_http_validator'
+            ),
+        ]
+
+    def __str__(self):
+        return self.url
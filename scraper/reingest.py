@@ -0,0 +1,37 @@
+"""
+The CPU-bound item pipeline stages, run outside Scrapy so a recorded crawl can be
+replayed across worker processes. Nothing here touches the database.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from scrapy.exceptions import DropItem
+from scraper.scrapy_project.pipelines.validators.pre_process_validator import PreProcessValidatorPipeline
+from scraper.scrapy_project.pipelines.learning_resources.clean_text import TextCleanerPipeline
+from scraper.scrapy_project.pipelines.validators.database_validator import DatabaseValidatorPipeline
+
+# Built once per worker process, in ITEM_PIPELINES order. DuplicateFilterPipeline is
+# left to the parent since it needs to see every item
+_stages = None
+
+
+def _pipeline_stages() -> List[Any]:
+    global _stages
+    if _stages is None:
+        _stages = [PreProcessValidatorPipeline(), TextCleanerPipeline(), DatabaseValidatorPipeline()]
+    return _stages
+
+
+def process_items(items: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Run items through validation and cleaning. The result has (item, None) for each item
+    ready to save, or (None, reason) for each dropped one, in input order.
+    """
+    results = []
+    for item in items:
+        try:
+            for stage in _pipeline_stages():
+                item = stage.process_item(item, None)
+        except DropItem as e:
+            results.append((None, str(e)))
+        else:
+            results.append((item, None))
+    return results
@@ -1,6 +1,21 @@
-from scrapy.exporters import JsonLinesItemExporter
+from scrapy.exporters import BaseItemExporter, JsonLinesItemExporter
+from scrapy.utils.serialize import ScrapyJSONEncoder
 from django.core.serializers.json import DjangoJSONEncoder
+from itemadapter import ItemAdapter, is_item
 from urllib.parse import urlparse
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+from uuid import UUID
+import json
+from pydantic import AnyUrl, HttpUrl
+from pydantic_core import Url
+import orjson
+
+DATE_FORMAT = ScrapyJSONEncoder.DATE_FORMAT
+TIME_FORMAT = ScrapyJSONEncoder.TIME_FORMAT
+DATETIME_FORMAT = f'{DATE_FORMAT} {TIME_FORMAT}'
+
 
 class JsonLinesItemExporter(JsonLinesItemExporter):
     """Custom JSON Lines exporter that handles Django-specific types"""
@@ -24,4 +39,283 @@ class JsonLinesItemExporter(JsonLinesItemExporter):
                     return str(value)
             except Exception:
                 pass
-        return super()._serialize_value(value)
\ No newline at end of file
+        return super()._serialize_value(value)
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime(DATETIME_FORMAT)
+
+
+def _format_date(value: date) -> str:
+    return value.strftime(DATE_FORMAT)
+
+
+def _format_time(value: time) -> str:
+    return value.strftime(TIME_FORMAT)
+
+
+# Serializers by exact type, giving the same output as JsonLinesItemExporter above
+# (dates as ScrapyJSONEncoder formats them, Decimal as a string)
+SERIALIZERS: Dict[type, Callable[[Any], Any]] = {
+    HttpUrl: str,
+    AnyUrl: str,
+    Url: str,
+    Decimal: str,
+    datetime: _format_datetime,
+    date: _format_date,
+    time: _format_time,
+    UUID: str,
+    set: list,
+    frozenset: list,
+}
+
+
+class FastJsonLinesItemExporter(BaseItemExporter):
+    """
+    JSON Lines exporter encoding whole items with orjson.
+
+    Types orjson doesn't handle natively are serialized through SERIALIZERS, looked up
+    by exact type, so plain strings and numbers are never inspected. Encoded lines are
+    collected and written buffer_size bytes at a time; for a compressed feed add
+    scrapy.extensions.postprocessing.GzipPlugin to the feed's postprocessing.
+    """
+
+    OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def __init__(self, file, buffer_size: int = 1024 * 1024, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+        self.buffer_size = buffer_size
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.serializers = dict(SERIALIZERS)
+
+    def _default(self, value: Any) -> Any:
+        serializer = self.serializers.get(type(value))
+        if serializer is None:
+            # Subclasses resolve through their MRO once, then dispatch like their base
+            serializer = next(
+                (SERIALIZERS[base] for base in type(value).__mro__ if base in SERIALIZERS),
+                None
+            )
+            if serializer is None:
+                raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+            self.serializers[type(value)] = serializer
+        return serializer(value)
+
+    def _serialize_value(self, value: Any) -> Any:
+        if is_item(value) and not isinstance(value, dict):
+            return ItemAdapter(value).asdict()
+        return value
+
+    def export_item(self, item: Any) -> None:
+        # Dicts go straight to the encoder; items and field selections go through the base class
+        if type(item) is dict and self.fields_to_export is None and not self.export_empty_fields:
+            payload = item
+        else:
+            payload = dict(self._get_serialized_fields(item))
+        line = orjson.dumps(payload, default=self._default, option=self.OPTIONS)
+        self.buffer.append(line)
+        self.buffered += len(line)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write(b''.join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+
+    def finish_exporting(self) -> None:
+        self.flush()
+
+
+def _as_string(value: Any) -> Any:
+    return None if value is None else str(value)
+
+
+def _as_float(value: Any) -> Any:
+    return None if value is None else float(value)
+
+
+def _as_int(value: Any) -> Any:
+    return None if value is None else int(value)
+
+
+def _as_timestamp(value: Any) -> Any:
+    # Dumps and Item rows hold the ISO or ScrapyJSONEncoder string, items from a crawl the datetime
+    if isinstance(value, str):
+        return datetime.fromisoformat(value) if value else None
+    return value
+
+
+def _as_strings(value: Any) -> Any:
+    return None if value is None else [str(element) for element in value]
+
+
+CREATOR_COLUMNS = ('name', 'platform_creator_id', 'url', 'platform_id', 'description', 'platform_thumbnail_url')
+
+
+def _as_creators(value: Any) -> Any:
+    if value is None:
+        return None
+    return [{column: _as_string(creator.get(column)) for column in CREATOR_COLUMNS} for creator in value]
+
+
+# Learning resource columns and how item values are coerced for them, in LearningResourceBase order
+PARQUET_COLUMNS = (
+    ('platform_course_id', 'string', _as_string),
+    ('scraped_timestamp', 'timestamp', _as_timestamp),
+    ('platform_id', 'string', _as_string),
+    ('url', 'string', _as_string),
+    ('name', 'string', _as_string),
+    ('description', 'string', _as_string),
+    ('html_description', 'string', _as_string),
+    ('languages', 'strings', _as_strings),
+    ('is_free', 'bool', None),
+    ('is_limited_free', 'bool', None),
+    ('is_active', 'bool', None),
+    ('dollar_price', 'float', _as_float),
+    ('has_certificate', 'bool', None),
+    ('creators', 'creators', _as_creators),
+    ('format', 'string', _as_string),
+    ('tags', 'strings', _as_strings),
+    ('platform_last_update', 'timestamp', _as_timestamp),
+    ('platform_thumbnail_url', 'string', _as_string),
+    ('duration_h', 'float', _as_float),
+    ('platform_reviews_count', 'int', _as_int),
+    ('platform_reviews_rating', 'float', _as_float),
+    ('enrollment_count', 'int', _as_int),
+    ('level', 'string', _as_string),
+    ('short_description', 'string', _as_string),
+)
+
+
+def learning_resource_schema():
+    """The Arrow schema for PARQUET_COLUMNS; creators, languages and tags are list columns"""
+    import pyarrow as pa
+    types = {
+        'string': pa.string(),
+        'strings': pa.list_(pa.string()),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'bool': pa.bool_(),
+        'float': pa.float64(),
+        'int': pa.int64(),
+        'creators': pa.list_(pa.struct([(column, pa.string()) for column in CREATOR_COLUMNS])),
+    }
+    return pa.schema([(name, types[kind]) for name, kind, _ in PARQUET_COLUMNS])
+
+
+class _KeepOpen:
+    """
+    The export file as pyarrow sees it: closing the Parquet writer closes its sink, but
+    the file belongs to whoever passed it in (feed storages upload it after the export)
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self.file.write(data)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.flush()
+        self.closed = True
+
+
+class ParquetItemExporter(BaseItemExporter):
+    """
+    Parquet exporter for learning resources, one row per item.
+
+    Rows are collected column by column and written as a row group every
+    row_group_size items, so memory stays bounded however long the crawl. When built
+    by the feed exporter, the crawl stats and execution id are added to the file's
+    key-value metadata on close. Needs the optional pyarrow dependency.
+    """
+
+    def __init__(
+        self,
+        file,
+        row_group_size: int = 10000,
+        compression: str = 'snappy',
+        metadata: Dict[str, Any] = None,
+        crawler=None,
+        **kwargs
+    ):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                'ParquetItemExporter requires pyarrow, install it with: pip install swotting[parquet]'
+            )
+        super().__init__(dont_fail=True, **kwargs)
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.file = file
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.metadata = dict(metadata or {})
+        self.crawler = crawler
+        self.schema = learning_resource_schema()
+        self.writer = None
+        self.columns = {name: [] for name, _, _ in PARQUET_COLUMNS}
+        self.rows = 0
+
+    @classmethod
+    def from_crawler(cls, crawler, file, **kwargs):
+        return cls(file, crawler=crawler, **kwargs)
+
+    def start_exporting(self) -> None:
+        sink = self.pa.PythonFile(_KeepOpen(self.file), mode='w')
+        self.writer = self.pq.ParquetWriter(sink, self.schema, compression=self.compression)
+
+    def export_item(self, item: Any) -> None:
+        # Feed items wrap the resource, Item rows and dumps are the resource itself
+        item = ItemAdapter(item).asdict()
+        if 'type' in item and 'data' in item:
+            if item['type'] != 'learning_resource':
+                return
+            item = item['data']
+        for name, _, convert in PARQUET_COLUMNS:
+            value = item.get(name)
+            self.columns[name].append(convert(value) if convert is not None else value)
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        if not self.rows:
+            return
+        table = self.pa.Table.from_pydict(self.columns, schema=self.schema)
+        self.writer.write_table(table, row_group_size=self.rows)
+        self.columns = {name: [] for name in self.columns}
+        self.rows = 0
+
+    def _file_metadata(self) -> Dict[str, str]:
+        metadata = dict(self.metadata)
+        if self.crawler is not None and self.crawler.stats is not None:
+            metadata.setdefault('execution_stats', self.crawler.stats.get_stats())
+            spider = self.crawler.spider
+            if getattr(spider, 'execution_id', None) is not None:
+                metadata.setdefault('execution_id', spider.execution_id)
+        return {
+            key: value if isinstance(value, str) else json.dumps(value, default=str)
+            for key, value in metadata.items()
+        }
+
+    def finish_exporting(self) -> None:
+        self._write_row_group()
+        metadata = self._file_metadata()
+        if metadata:
+            self.writer.add_key_value_metadata(metadata)
+        self.writer.close()
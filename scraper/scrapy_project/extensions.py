@@ -0,0 +1,179 @@
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SlotState:
+    responses: int = 0
+    errors: int = 0
+    latency: Optional[float] = None
+
+
+class AdaptiveConcurrency:
+    """
+    Adjusts each download slot's (domain's) concurrency and delay from what the server
+    shows us, between the ADAPTIVE_CONCURRENCY_* floor and ceiling.
+
+    - 429 and 503 halve the slot's concurrency and at least double its delay, or raise
+      it to the Retry-After the server asked for.
+    - Every ADAPTIVE_CONCURRENCY_WINDOW downloads the window is judged: too many errors
+      (5xx-like statuses, and downloads that failed without a response such as timeouts
+      and refused connections) backs off the same way, a latency average above the
+      target drops one request, and a healthy window adds one and shortens the delay
+      by a quarter.
+
+    Decisions are counted under adaptive_concurrency/ in the stats, with each slot's
+    final concurrency and delay written on close. The floor and ceiling are ordinary
+    settings, so a Spider row's settings can override them per spider.
+    """
+
+    BACKOFF_CODES = (429, 503)
+    ERROR_CODES = (500, 502, 504, 408, 522, 524)
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool('ADAPTIVE_CONCURRENCY_ENABLED'):
+            raise NotConfigured
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.min_concurrency = max(1, settings.getint('ADAPTIVE_CONCURRENCY_MIN', 1))
+        self.max_concurrency = max(self.min_concurrency, settings.getint('ADAPTIVE_CONCURRENCY_MAX', 8))
+        self.min_delay = settings.getfloat('ADAPTIVE_CONCURRENCY_MIN_DELAY', 0.0)
+        self.max_delay = max(self.min_delay, settings.getfloat('ADAPTIVE_CONCURRENCY_MAX_DELAY', 60.0))
+        self.target_latency = settings.getfloat('ADAPTIVE_CONCURRENCY_TARGET_LATENCY', 2.0)
+        self.window = max(1, settings.getint('ADAPTIVE_CONCURRENCY_WINDOW', 20))
+        self.max_error_rate = settings.getfloat('ADAPTIVE_CONCURRENCY_MAX_ERROR_RATE', 0.1)
+        self.states: Dict[str, _SlotState] = {}
+        # Requests that got a response; any other request leaving the downloader failed
+        self.downloaded = weakref.WeakSet()
+        crawler.signals.connect(self.response_downloaded, signal=signals.response_downloaded)
+        crawler.signals.connect(self.request_left_downloader, signal=signals.request_left_downloader)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def _get_slot(self, request):
+        key = request.meta.get('download_slot')
+        if key is None or self.crawler.engine is None:
+            return None, None
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _retry_after(self, response) -> Optional[float]:
+        """Seconds from a Retry-After header, given as a number or an HTTP date"""
+        value = response.headers.get(b'Retry-After')
+        if not value:
+            return None
+        value = value.decode('latin-1').strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _set(self, key, slot, concurrency: int, delay: float, decision: str, spider) -> None:
+        concurrency = min(max(self.min_concurrency, concurrency), self.max_concurrency)
+        delay = min(max(self.min_delay, delay), self.max_delay)
+        if concurrency == slot.concurrency and delay == slot.delay:
+            return
+        logger.debug(
+            f"{key}: {decision}, concurrency {slot.concurrency} -> {concurrency}, "
+            f"delay {slot.delay:.2f}s -> {delay:.2f}s",
+            extra={'spider': spider},
+        )
+        slot.concurrency = concurrency
+        slot.delay = delay
+        self.stats.inc_value(f'adaptive_concurrency/{decision}', spider=spider)
+
+    def _back_off(self, key, slot, spider, floor_delay: float = 0.0) -> None:
+        # Doubling a zero delay would never slow the slot down, so start from half a second
+        self._set(
+            key, slot,
+            slot.concurrency // 2,
+            max(slot.delay * 2, floor_delay, self.min_delay, 0.5),
+            'backoff',
+            spider,
+        )
+
+    def _get_state(self, key, slot, spider) -> _SlotState:
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = _SlotState()
+            # Start new slots inside the configured range
+            self._set(key, slot, slot.concurrency, slot.delay, 'initial', spider)
+        return state
+
+    def response_downloaded(self, response, request, spider):
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return
+        # Sent before request_left_downloader for the same request
+        self.downloaded.add(request)
+        state = self._get_state(key, slot, spider)
+
+        state.responses += 1
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+
+        if response.status in self.BACKOFF_CODES:
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                self.stats.inc_value('adaptive_concurrency/retry_after', spider=spider)
+                self.stats.max_value('adaptive_concurrency/max_retry_after', retry_after, spider=spider)
+            self._back_off(key, slot, spider, floor_delay=retry_after or 0.0)
+            self._reset(state)
+            return
+        if response.status in self.ERROR_CODES:
+            state.errors += 1
+        self._judge_window(key, slot, state, spider)
+
+    def request_left_downloader(self, request, spider):
+        """Sent for every download; without a response before it, the download failed"""
+        if request in self.downloaded:
+            self.downloaded.discard(request)
+            return
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return
+        state = self._get_state(key, slot, spider)
+        state.responses += 1
+        state.errors += 1
+        self.stats.inc_value('adaptive_concurrency/download_errors', spider=spider)
+        self._judge_window(key, slot, state, spider)
+
+    def _judge_window(self, key, slot, state: _SlotState, spider) -> None:
+        if state.responses < self.window:
+            return
+        if state.errors / state.responses > self.max_error_rate:
+            self._back_off(key, slot, spider)
+        elif state.latency is not None and state.latency > self.target_latency:
+            self._set(key, slot, slot.concurrency - 1, slot.delay, 'decrease', spider)
+        else:
+            self._set(key, slot, slot.concurrency + 1, slot.delay * 0.75, 'increase', spider)
+        self._reset(state)
+
+    def _reset(self, state: _SlotState) -> None:
+        state.responses = 0
+        state.errors = 0
+
+    def spider_closed(self, spider):
+        if self.crawler.engine is None:
+            return
+        for key in self.states:
+            slot = self.crawler.engine.downloader.slots.get(key)
+            if slot is not None:
+                self.stats.set_value(f'adaptive_concurrency/slots/{key}/concurrency', slot.concurrency, spider=spider)
+                self.stats.set_value(f'adaptive_concurrency/slots/{key}/delay', round(slot.delay, 3), spider=spider)
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Optional, Tuple
+from django.utils import timezone
+from scraper.models import SitemapUrl
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a sitemap <lastmod> (W3C datetime, possibly just a date); None if absent or malformed"""
+    if not value:
+        return None
+    try:
+        lastmod = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if timezone.is_naive(lastmod):
+        lastmod = lastmod.replace(tzinfo=dt_timezone.utc)
+    return lastmod
+
+
+class SitemapFrontier:
+    """
+    Decides which sitemap URLs a crawl requests from the lastmod recorded for each URL.
+
+    A URL is requested if it has never been fetched, its lastmod advanced, the sitemap gives
+    no lastmod, or its last fetch is older than max_age. force_refresh requests everything.
+    Fetches are recorded with mark_fetched and written in one bulk upsert by save.
+    """
+
+    def __init__(self, platform_id: str, force_refresh: bool = False, max_age: Optional[timedelta] = None):
+        self.platform_id = platform_id
+        self.force_refresh = force_refresh
+        self.max_age = max_age
+        self.known: Dict[str, Tuple[Optional[datetime], datetime]] = {}
+        # lastmod of the URLs requested this run, by URL, until they are fetched
+        self.pending: Dict[str, Optional[datetime]] = {}
+        self.fetched: Dict[str, Optional[datetime]] = {}
+        self.started = timezone.now()
+        self.counts = {'new': 0, 'modified': 0, 'expired': 0, 'no_lastmod': 0, 'forced': 0, 'skipped': 0}
+
+    def load(self) -> None:
+        """Load every recorded URL of the platform with one query"""
+        if self.force_refresh:
+            return
+        rows = SitemapUrl.objects.filter(platform_id=self.platform_id).values_list('url', 'lastmod', 'last_fetched')
+        self.known = {url: (lastmod, last_fetched) for url, lastmod, last_fetched in rows.iterator()}
+
+    def _reason(self, url: str, lastmod: Optional[datetime]) -> Optional[str]:
+        if self.force_refresh:
+            return 'forced'
+        if url not in self.known:
+            return 'new'
+        known_lastmod, last_fetched = self.known[url]
+        if self.max_age is not None and self.started - last_fetched >= self.max_age:
+            return 'expired'
+        if lastmod is None:
+            return 'no_lastmod'
+        if known_lastmod is None or lastmod > known_lastmod:
+            return 'modified'
+        return None
+
+    def should_fetch(self, url: str, lastmod: Any = None) -> bool:
+        """Whether to request url, given its sitemap lastmod (a string or datetime)"""
+        if not isinstance(lastmod, datetime):
+            lastmod = parse_lastmod(lastmod)
+        reason = self._reason(url, lastmod)
+        if reason is None:
+            self.counts['skipped'] += 1
+            return False
+        self.counts[reason] += 1
+        self.pending[url] = lastmod
+        return True
+
+    def mark_fetched(self, url: str) -> None:
+        """Record that url was fetched and parsed; only then is its lastmod stored"""
+        if url in self.pending:
+            self.fetched[url] = self.pending.pop(url)
+
+    def hand_off(self, url: str) -> Optional[datetime]:
+        """Forget a requested url another process will fetch, returning its lastmod for expect"""
+        return self.pending.pop(url, None)
+
+    def expect(self, url: str, lastmod: Optional[datetime]) -> None:
+        """Take over a url handed off by another process, so mark_fetched records it here"""
+        self.pending[url] = lastmod
+
+    def save(self, batch_size: int = 1000) -> int:
+        if not self.fetched:
+            return 0
+        now = timezone.now()
+        SitemapUrl.objects.bulk_create(
+            [
+                SitemapUrl(platform_id=self.platform_id, url=url, lastmod=lastmod, last_fetched=now)
+                for url, lastmod in self.fetched.items()
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['platform_id', 'url'],
+            update_fields=['lastmod', 'last_fetched'],
+        )
+        saved = len(self.fetched)
+        self.fetched = {}
+        return saved
+
+    def report_stats(self, stats, spider) -> None:
+        for reason, count in self.counts.items():
+            stats.set_value(f'frontier/{reason}', count, spider=spider)
+        stats.set_value('frontier/known_urls', len(self.known), spider=spider)
+        stats.set_value('frontier/unfetched', len(self.pending), spider=spider)
@@ -0,0 +1,236 @@
+import html
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+WHITESPACE_RE = re.compile(r'\s+')
+TAG_NAME_RE = re.compile(r'[a-z][a-z0-9-]*\Z')
+ATTRIBUTE_NAME_RE = re.compile(r'[a-z_:][a-z0-9_:.-]*\Z')
+
+# Elements whose strings BeautifulSoup's get_text() leaves out (its special string containers)
+NON_TEXT_TAGS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+
+# Elements BeautifulSoup closes as soon as they open; they never hold content
+VOID_TAGS = frozenset((
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+))
+
+# Elements removed from the stored html_description together with their content
+UNSAFE_TAGS = frozenset((
+    'script', 'style', 'template', 'iframe', 'frame', 'object', 'embed', 'applet', 'form', 'link', 'meta', 'base',
+))
+
+UNSAFE_URL_SCHEMES = ('javascript:', 'vbscript:', 'data:')
+URL_ATTRIBUTES = ('href', 'src', 'action', 'formaction', 'xlink:href')
+
+# Named entities with or without their semicolon, resolved the way BeautifulSoup does
+ENTITIES: Dict[str, str] = {}
+for _name in sorted(html5):
+    ENTITIES.setdefault(_name[:-1] if _name.endswith(';') else _name, html5[_name])
+
+# The entities TextCleanerPipeline has always decoded a second time, in this order, for
+# text that was escaped twice at the source
+DOUBLE_ESCAPED_ENTITIES = (
+    ('&nbsp;', ' '), ('&amp;', '&'), ('&lt;', '<'), ('&gt;', '>'), ('&quot;', '"'), ('&#39;', "'"),
+)
+
+
+class ProcessedHtml(NamedTuple):
+    """The derived forms of an HTML blob, produced by a single parse"""
+    # Text strings joined by single spaces, like BeautifulSoup's stripped_strings
+    text: str
+    # text with entities escaped twice at the source decoded and whitespace collapsed
+    normalized_text: str
+    # The markup without scripts, embeds, comments, event handlers or javascript: links
+    html: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return self._asdict()
+
+
+class _HtmlTokenizer(HTMLParser):
+    """
+    Text extraction, and optionally sanitizing, on the same html.parser tokenizer
+    BeautifulSoup's 'html.parser' builder drives. Entities, CDATA, the tag stack and
+    the boundaries between strings are handled the way BeautifulSoup handles them,
+    so strings match what it would put in the tree, without building the tree.
+    """
+
+    def __init__(self, sanitize: bool = False):
+        super().__init__(convert_charrefs=False)
+        self.strings: List[str] = []
+        self.data: List[str] = []
+        # Open elements as (tag, whether its start tag was written to markup)
+        self.stack: List[Tuple[str, bool]] = []
+        self.closed_void: List[str] = []
+        self.non_text_depth = 0
+        self.unsafe_depth = 0
+        self.markup: Optional[List[str]] = [] if sanitize else None
+
+    def _end_data(self) -> None:
+        if self.data:
+            if not self.non_text_depth:
+                self.strings.append(''.join(self.data))
+            self.data = []
+
+    def _push(self, tag: str, attrs) -> None:
+        self._end_data()
+        written = False
+        if self.markup is not None and not self.unsafe_depth and tag not in UNSAFE_TAGS and TAG_NAME_RE.match(tag):
+            self.markup.append(f'<{tag}{self._safe_attributes(attrs)}>')
+            written = True
+        self.stack.append((tag, written))
+        if tag in NON_TEXT_TAGS:
+            self.non_text_depth += 1
+        if tag in UNSAFE_TAGS and tag not in VOID_TAGS:
+            self.unsafe_depth += 1
+
+    def _pop_to(self, tag: str) -> None:
+        """Close the most recent open tag of this name and everything opened after it"""
+        self._end_data()
+        if not any(name == tag for name, _ in self.stack):
+            return
+        while True:
+            name, written = self.stack.pop()
+            if name in NON_TEXT_TAGS:
+                self.non_text_depth -= 1
+            if name in UNSAFE_TAGS and name not in VOID_TAGS:
+                self.unsafe_depth -= 1
+            if written and name not in VOID_TAGS:
+                self.markup.append(f'</{name}>')
+            if name == tag:
+                return
+
+    @staticmethod
+    def _safe_attributes(attrs) -> str:
+        parts = []
+        for name, value in attrs:
+            if not ATTRIBUTE_NAME_RE.match(name) or name.startswith('on'):
+                continue
+            if value is None:
+                parts.append(f' {name}')
+                continue
+            if name in URL_ATTRIBUTES and WHITESPACE_RE.sub('', value).lower().startswith(UNSAFE_URL_SCHEMES):
+                continue
+            parts.append(f' {name}="{html.escape(value)}"')
+        return ''.join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        self._push(tag, attrs)
+        if tag in VOID_TAGS:
+            self._pop_to(tag)
+            # A later explicit end tag for it is redundant
+            self.closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._push(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.closed_void:
+            self.closed_void.remove(tag)
+        else:
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self.data.append(data)
+        if self.markup is not None and not self.unsafe_depth:
+            self.markup.append(html.escape(data, quote=False))
+
+    def handle_charref(self, name):
+        # Numbers below 256 are read as windows-1252, as BeautifulSoup does
+        number = int(name[1:], 16) if name[:1] in ('x', 'X') else int(name)
+        data = None
+        if number < 256:
+            try:
+                data = bytes([number]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(number)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or '\N{REPLACEMENT CHARACTER}')
+
+    def handle_entityref(self, name):
+        # An unknown name is literal text
+        self.handle_data(ENTITIES.get(name, f'&{name}'))
+
+    def unknown_decl(self, data):
+        # CDATA sections are text, even inside non-text elements; other declarations aren't
+        self._end_data()
+        if data.upper().startswith('CDATA['):
+            self.strings.append(data[len('CDATA['):])
+            if self.markup is not None and not self.unsafe_depth:
+                self.markup.append(html.escape(data[len('CDATA['):], quote=False))
+
+    def handle_comment(self, data):
+        self._end_data()
+
+    def handle_decl(self, decl):
+        self._end_data()
+
+    def handle_pi(self, data):
+        self._end_data()
+
+    def close(self):
+        super().close()
+        self._end_data()
+        if self.markup is not None:
+            # Leave the sanitized markup balanced
+            while self.stack:
+                self._pop_to(self.stack[-1][0])
+
+
+def _tokenize(markup: str, sanitize: bool = False) -> _HtmlTokenizer:
+    tokenizer = _HtmlTokenizer(sanitize)
+    tokenizer.feed(markup)
+    tokenizer.close()
+    return tokenizer
+
+
+def normalize_text(text: str) -> str:
+    """Decode entities escaped twice at the source (e.g. '&amp;nbsp;') and collapse whitespace"""
+    if '&' in text:
+        for entity, character in DOUBLE_ESCAPED_ENTITIES:
+            text = text.replace(entity, character)
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def html_to_text(text: Optional[str]) -> Optional[str]:
+    """
+    Convert an HTML fragment to plain text with whitespace normalized, with the same
+    result as BeautifulSoup's get_text() followed by normalize_text().
+
+    Text without '<' or '&' is only whitespace-normalized; everything else goes
+    through the tokenizer.
+    """
+    if not text:
+        return text
+
+    if '<' in text or '&' in text:
+        text = ''.join(_tokenize(text).strings)
+
+    return normalize_text(text)
+
+
+def process_html(markup: Optional[str]) -> ProcessedHtml:
+    """Parse an HTML blob once and derive its plain text, normalized text and sanitized markup"""
+    if not markup:
+        return ProcessedHtml('', '', '')
+
+    if '<' not in markup and '&' not in markup:
+        text = markup.strip()
+        return ProcessedHtml(text, normalize_text(text), markup)
+
+    tokenizer = _tokenize(markup, sanitize=True)
+    text = ' '.join(stripped for stripped in (string.strip() for string in tokenizer.strings) if stripped)
+    return ProcessedHtml(text, normalize_text(text), ''.join(tokenizer.markup))
+
+
+def processed_field(item: Dict[str, Any], field: str) -> Optional[Dict[str, str]]:
+    """Return the forms attached to an item for one of its fields by process_html, if any"""
+    return (item.get('processed_html') or {}).get(field)
@@ -0,0 +1,53 @@
+from typing import Dict, NamedTuple
+from scraper.models import HttpValidator
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: str
+    # Size of the body last downloaded, counted as saved on a 304
+    content_length: int
+
+
+class HttpValidatorStore:
+    """
+    The stored validators of one spider's URLs. Everything is loaded with one query when
+    the spider opens; changes are written in bulk every flush_size updates and on close.
+    """
+
+    def __init__(self, spider_name: str, flush_size: int = 500):
+        self.spider_name = spider_name
+        self.flush_size = max(1, flush_size)
+        self.validators: Dict[str, Validators] = {}
+        self.changed: Dict[str, Validators] = {}
+
+    def load(self) -> None:
+        rows = HttpValidator.objects.filter(spider_name=self.spider_name).values_list(
+            'url', 'etag', 'last_modified', 'content_length'
+        )
+        self.validators = {url: Validators(*values) for url, *values in rows.iterator()}
+
+    def get(self, url: str) -> Validators:
+        return self.validators.get(url)
+
+    def update(self, url: str, validators: Validators) -> None:
+        if self.validators.get(url) == validators:
+            return
+        self.validators[url] = validators
+        self.changed[url] = validators
+        if len(self.changed) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.changed:
+            return
+        HttpValidator.objects.bulk_create(
+            [
+                HttpValidator(spider_name=self.spider_name, url=url, **validators._asdict())
+                for url, validators in self.changed.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['spider_name', 'url'],
+            update_fields=['etag', 'last_modified', 'content_length', 'time_updated'],
+        )
+        self.changed = {}
@@ -0,0 +1,162 @@
+import logging
+import sqlite3
+import zlib
+from pathlib import Path
+from time import time
+from typing import Optional
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class _Gzip:
+    name = 'gzip'
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class _Zstd:
+    name = 'zstd'
+
+    def __init__(self, level: int):
+        try:
+            import zstandard
+        except ImportError:
+            raise NotConfigured("HTTPCACHE_SQLITE_COMPRESSION = 'zstd' requires the zstandard package")
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.decompressor.decompress(data)
+
+
+class SqliteCacheStorage:
+    """
+    HTTP cache storage keeping every response of a spider compressed in one SQLite file,
+    <HTTPCACHE_DIR>/<spider>.sqlite3, instead of a directory per request.
+
+    HTTPCACHE_SQLITE_MODE:
+      'cache'  - the usual read-through cache, honouring HTTPCACHE_EXPIRATION_SECS
+      'record' - always download and store, replacing what was recorded before
+      'replay' - only serve recorded responses; requests that weren't recorded are ignored,
+                 so a crawl replays offline at disk speed
+    """
+
+    MODES = ('cache', 'record', 'replay')
+
+    def __init__(self, settings):
+        self.cachedir = data_path(settings['HTTPCACHE_DIR'], createdir=True)
+        self.expiration_secs = settings.getint('HTTPCACHE_EXPIRATION_SECS')
+        self.mode = settings.get('HTTPCACHE_SQLITE_MODE', 'cache')
+        if self.mode not in self.MODES:
+            raise NotConfigured(f"Unknown HTTPCACHE_SQLITE_MODE: {self.mode}")
+        self.commit_every = max(1, settings.getint('HTTPCACHE_SQLITE_COMMIT_EVERY', 100))
+        level = settings.getint('HTTPCACHE_SQLITE_COMPRESSION_LEVEL', 6)
+        compression = settings.get('HTTPCACHE_SQLITE_COMPRESSION', 'gzip')
+        codecs = {'gzip': _Gzip, 'zstd': _Zstd}
+        if compression not in codecs:
+            raise NotConfigured(f"Unknown HTTPCACHE_SQLITE_COMPRESSION: {compression}")
+        self.codec = codecs[compression](level)
+        # Rows remember their codec, so a file recorded with one still replays after switching
+        self.codecs = {self.codec.name: self.codec}
+        self.db = None
+        self.uncommitted = 0
+
+    def open_spider(self, spider) -> None:
+        dbpath = Path(self.cachedir, f'{spider.name}.sqlite3')
+        self.db = sqlite3.connect(str(dbpath))
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'fingerprint BLOB PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, '
+            'headers BLOB NOT NULL, body BLOB NOT NULL, codec TEXT NOT NULL, time REAL NOT NULL)'
+        )
+        self.db.commit()
+        self._fingerprinter = spider.crawler.request_fingerprinter
+        self.stats = spider.crawler.stats
+        logger.debug(
+            f"Using SQLite cache storage in {dbpath} ({self.mode} mode, {self.codec.name})",
+            extra={'spider': spider},
+        )
+
+    def close_spider(self, spider) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def _decompress(self, codec_name: str, data: bytes) -> bytes:
+        codec = self.codecs.get(codec_name)
+        if codec is None:
+            codec = self.codecs[codec_name] = {'gzip': _Gzip, 'zstd': _Zstd}[codec_name](0)
+        return codec.decompress(data)
+
+    def retrieve_response(self, spider, request):
+        if self.mode == 'record':
+            return None
+        row = self.db.execute(
+            'SELECT url, status, headers, body, codec, time FROM responses WHERE fingerprint = ?',
+            (self._fingerprinter.fingerprint(request),)
+        ).fetchone()
+        if row is None or (self.mode == 'cache' and 0 < self.expiration_secs < time() - row[5]):
+            if self.mode == 'replay':
+                self.stats.inc_value('httpcache/replay_missing', spider=spider)
+                raise IgnoreRequest(f'Not recorded: {request.url}')
+            return None
+
+        url, status, raw_headers, body, codec_name, _ = row
+        headers = Headers(headers_raw_to_dict(self._decompress(codec_name, raw_headers)))
+        body = self._decompress(codec_name, body)
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    def store_response(self, spider, request, response) -> None:
+        # A 304 has no body to replay
+        if response.status == 304 or self.mode == 'replay':
+            return
+        raw_headers = headers_dict_to_raw(response.headers)
+        body = self.codec.compress(response.body)
+        self.db.execute(
+            'INSERT OR REPLACE INTO responses (fingerprint, url, status, headers, body, codec, time) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (
+                self._fingerprinter.fingerprint(request), response.url, response.status,
+                self.codec.compress(raw_headers), body, self.codec.name, time(),
+            )
+        )
+        self.stats.inc_value('httpcache/stored_bytes', len(body), spider=spider)
+        self.uncommitted += 1
+        if self.uncommitted >= self.commit_every:
+            self.db.commit()
+            self.uncommitted = 0
+
+
+def iter_recorded_bodies(dbpath: str, url_suffix: str = ''):
+    """Yield (url, body) for the responses recorded in a SqliteCacheStorage file"""
+    codecs = {}
+    db = sqlite3.connect(f'file:{dbpath}?mode=ro', uri=True)
+    try:
+        rows = db.execute(
+            'SELECT url, body, codec FROM responses WHERE status = 200 AND url LIKE ? ORDER BY time',
+            (f'%{url_suffix}',)
+        )
+        for url, body, codec_name in rows:
+            codec = codecs.get(codec_name)
+            if codec is None:
+                codec = codecs[codec_name] = {'gzip': _Gzip, 'zstd': _Zstd}[codec_name](0)
+            yield url, codec.decompress(body)
+    finally:
+        db.close()
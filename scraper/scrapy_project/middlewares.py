@@ -3,11 +3,18 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
 from scrapy import signals
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
+from scrapy.http import Request
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+from scraper.scrapy_project.http_validators import HttpValidatorStore, Validators
+from scraper.scrapy_project.shared_queue import SharedCrawlQueue
+from scraper.scrapy_project.frontier import parse_lastmod
+
 
 class ScrapyProjectSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -57,47 +64,216 @@ class ScrapyProjectSpiderMiddleware:
 
 
 class ScrapyProjectDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+    """
+    Conditional requests: the ETag and Last-Modified of each page are stored per spider and
+    sent back as If-None-Match / If-Modified-Since on later crawls. A 304 is dropped here,
+    so the page is neither downloaded again nor re-parsed.
+
+    Reports conditional/requests (sent with validators), conditional/not_modified (304s),
+    conditional/modified, conditional/hit_rate and conditional/bytes_saved.
+    Sitemaps are always fetched in full, the spider needs them to find the pages.
+    """
+
+    def __init__(self, stats=None, enabled: bool = True, flush_size: int = 500):
+        self.stats = stats
+        self.enabled = enabled
+        self.flush_size = flush_size
+        self.store = None
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
+        s = cls(
+            stats=crawler.stats,
+            enabled=crawler.settings.getbool('CONDITIONAL_REQUESTS_ENABLED'),
+            flush_size=crawler.settings.getint('CONDITIONAL_REQUESTS_FLUSH_SIZE', 500),
+        )
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
+    def _is_conditional(self, request, spider) -> bool:
+        return (
+            self.store is not None
+            and request.method == 'GET'
+            and not request.meta.get('dont_conditional', False)
+            and getattr(request.callback, '__name__', None) != '_parse_sitemap'
+        )
+
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
-
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        if not self._is_conditional(request, spider):
+            return None
+        validators = self.store.get(request.url)
+        if validators is None:
+            return None
+        if validators.etag and b'If-None-Match' not in request.headers:
+            request.headers[b'If-None-Match'] = validators.etag
+        if validators.last_modified and b'If-Modified-Since' not in request.headers:
+            request.headers[b'If-Modified-Since'] = validators.last_modified
+        request.meta['conditional_request'] = True
+        self.stats.inc_value('conditional/requests', spider=spider)
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
+        if not self._is_conditional(request, spider):
+            return response
+
+        if response.status == 304 and request.meta.get('conditional_request'):
+            validators = self.store.get(request.url)
+            self.stats.inc_value('conditional/not_modified', spider=spider)
+            self.stats.inc_value('conditional/bytes_saved', validators.content_length, spider=spider)
+            # The page was seen, unchanged, so the sitemap frontier can record it as fetched
+            if hasattr(spider, 'mark_fetched'):
+                spider.mark_fetched(request)
+            raise IgnoreRequest(f'Not modified: {request.url}')
 
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+        if response.status == 200:
+            if request.meta.get('conditional_request'):
+                self.stats.inc_value('conditional/modified', spider=spider)
+            etag = response.headers.get(b'ETag', b'').decode('latin-1')
+            last_modified = response.headers.get(b'Last-Modified', b'').decode('latin-1')
+            if etag or last_modified:
+                self.store.update(request.url, Validators(etag, last_modified, len(response.body)))
         return response
 
-    def process_exception(self, request, exception, spider):
-        # Called when a download handler or a process_request()
-        # (from other downloader middleware) raises an exception.
+    def spider_opened(self, spider):
+        spider.logger.info("Spider opened: %s" % spider.name)
+        if self.enabled:
+            self.store = HttpValidatorStore(spider.name, flush_size=self.flush_size)
+            self.store.load()
+            spider.logger.info(f"Loaded HTTP validators for {len(self.store.validators)} URLs")
 
-        # Must either:
-        # - return None: continue processing this exception
-        # - return a Response object: stops process_exception() chain
-        # - return a Request object: stops process_exception() chain
-        pass
+    def spider_closed(self, spider):
+        if self.store is None:
+            return
+        self.store.flush()
+        requests = self.stats.get_value('conditional/requests', 0, spider=spider)
+        if requests:
+            hits = self.stats.get_value('conditional/not_modified', 0, spider=spider)
+            self.stats.set_value('conditional/hit_rate', round(hits / requests, 4), spider=spider)
+
+
+def _is_sitemap_request(request) -> bool:
+    return getattr(request.callback, '__name__', None) == '_parse_sitemap'
+
+
+class ShardedCrawlMiddleware:
+    """
+    Spreads a sitemap spider's crawl over the shards of one execution, each a separate
+    process whose spider gets shard=<n> and shards=<N> (see scraper.tasks.run_sharded_spider).
+    SpiderExecutor only adds it to SPIDER_MIDDLEWARES for those runs.
+
+    Start requests are split between the shards by URL hash. Everything a sitemap leads to,
+    child sitemaps and pages, isn't requested by the shard that found it but pushed to a
+    queue shared through Redis and deduplicated by URL; shards take batches from it whenever
+    they run out of requests, so the work spreads to whichever shard is free.
+    A shard closes once every shard is idle and the queue is empty, or after waiting
+    SHARDED_CRAWL_MAX_IDLE_SECONDS for work (e.g. when a shard task never started).
+
+    Reports sharded/queued, sharded/duplicates, sharded/claimed and sharded/start_requests_skipped.
+    """
+
+    def __init__(self, crawler, queue: SharedCrawlQueue, shard: int, batch_size: int = 100,
+                 max_idle_seconds: float = 300):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.queue = queue
+        self.shard = shard
+        self.batch_size = batch_size
+        self.max_idle_seconds = max_idle_seconds
+        self.idle_since = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        spider = crawler.spider
+        shards = int(getattr(spider, 'shards', 1) or 1)
+        if shards <= 1:
+            raise NotConfigured('Not a sharded crawl')
+        execution_id = getattr(spider, 'execution_id', None)
+        if execution_id is None:
+            raise NotConfigured('A sharded crawl needs the execution_id its shards share')
+        settings = crawler.settings
+        queue = SharedCrawlQueue.from_url(
+            settings.get('SHARDED_CRAWL_REDIS_URL'),
+            execution_id,
+            shards,
+            ttl=settings.getint('SHARDED_CRAWL_KEY_TTL', 24 * 3600),
+        )
+        s = cls(
+            crawler,
+            queue,
+            shard=int(spider.shard),
+            batch_size=settings.getint('SHARDED_CRAWL_BATCH_SIZE', 100),
+            max_idle_seconds=settings.getfloat('SHARDED_CRAWL_MAX_IDLE_SECONDS', 300),
+        )
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_idle, signal=signals.spider_idle)
+        return s
+
+    def process_start_requests(self, start_requests, spider):
+        for request in start_requests:
+            if self.queue.owner(request.url) != self.shard:
+                self.stats.inc_value('sharded/start_requests_skipped', spider=spider)
+                continue
+            yield request
+
+    def process_spider_output(self, response, result, spider):
+        from_sitemap = _is_sitemap_request(response.request)
+        batch = []
+        for obj in result:
+            if from_sitemap and isinstance(obj, Request) and getattr(obj.callback, '__self__', None) is spider:
+                batch.append(self._entry(obj, spider))
+                if len(batch) >= self.batch_size:
+                    self._push(batch, spider)
+                    batch = []
+            else:
+                yield obj
+        self._push(batch, spider)
+
+    def _entry(self, request, spider):
+        """What a shard needs to rebuild the request, including the lastmod the frontier records"""
+        lastmod = None
+        frontier = getattr(spider, 'frontier', None)
+        if frontier is not None:
+            lastmod = frontier.hand_off(request.url)
+        return {
+            'url': request.url,
+            'callback': request.callback.__name__,
+            'lastmod': lastmod.isoformat() if lastmod else None,
+        }
+
+    def _push(self, batch, spider):
+        if not batch:
+            return
+        queued = self.queue.push(batch)
+        self.stats.inc_value('sharded/queued', queued, spider=spider)
+        self.stats.inc_value('sharded/duplicates', len(batch) - queued, spider=spider)
 
     def spider_opened(self, spider):
-        spider.logger.info("Spider opened: %s" % spider.name)
+        self.stats.set_value('sharded/shard', self.shard, spider=spider)
+        self.stats.set_value('sharded/shards', self.queue.shards, spider=spider)
+        spider.logger.info(f"Crawling shard {self.shard} of {self.queue.shards}")
+
+    def spider_idle(self, spider):
+        entries = self.queue.claim(self.shard, self.batch_size)
+        if entries:
+            self.idle_since = None
+            frontier = getattr(spider, 'frontier', None)
+            for entry in entries:
+                if frontier is not None:
+                    frontier.expect(entry['url'], parse_lastmod(entry['lastmod']))
+                # Already deduplicated across the shards by the queue
+                request = Request(entry['url'], callback=getattr(spider, entry['callback']), dont_filter=True)
+                self.crawler.engine.crawl(request)
+            self.stats.inc_value('sharded/claimed', len(entries), spider=spider)
+            raise DontCloseSpider
+
+        if self.queue.park(self.shard):
+            return
+        if self.idle_since is None:
+            self.idle_since = time.monotonic()
+        if time.monotonic() - self.idle_since < self.max_idle_seconds:
+            raise DontCloseSpider
+        spider.logger.warning(
+            f"Shard {self.shard} closing after {self.max_idle_seconds}s without work while other shards are busy"
+        )
@@ -0,0 +1,93 @@
+import json
+import re
+from itertools import accumulate
+from typing import Any, Optional, Sequence, Tuple
+import orjson
+
+# Everything but quotes and brackets, deleted from a segment to leave its structure
+_NOT_STRUCTURE = bytes(set(range(256)) - set(b'"{}[]'))
+# Opening brackets to 1 and closing ones to -1, read as signed bytes
+_STEPS = bytes.maketrans(b'{[}]', b'\x01\x01\xff\xff')
+_WHITESPACE = re.compile(rb'\s*')
+_DECODER = json.JSONDecoder()
+
+
+def get_path(data: Any, path: Sequence[str]) -> Any:
+    """Follow path through nested dicts, None as soon as a step is missing or not a dict"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _depth(segment: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Change in nesting depth over segment and the lowest depth reached on the way, both
+    relative to its start, or None if it ends inside a string
+    """
+    # Drop escaped backslashes, then escaped quotes, so every quote left delimits a string
+    structure = segment.replace(b'\\\\', b'').replace(b'\\"', b'').translate(None, _NOT_STRUCTURE)
+    parts = structure.split(b'"')
+    if len(parts) % 2 == 0:
+        return None
+    # Even parts are outside strings, so their brackets are structure
+    steps = memoryview(b''.join(parts[::2]).translate(_STEPS)).cast('b')
+    return sum(steps), min(accumulate(steps), default=0)
+
+
+def _value_offset(body: bytes, path: Sequence[str]) -> Optional[int]:
+    """
+    Offset of the value at path, found with C-level searches: each key is looked up with a
+    regex search and accepted only when it is a direct member of the enclosing object.
+    None once the scan leaves that object, i.e. the key isn't one of its members.
+    """
+    start = _WHITESPACE.match(body).end()
+    for key in path:
+        if body[start:start + 1] != b'{':
+            return None
+        key_pattern = re.compile(re.escape(orjson.dumps(key)) + rb'\s*:\s*')
+        # Depth is accumulated between candidates, so the object is scanned once
+        depth = 0
+        checked = start
+        position = start
+        while True:
+            match = key_pattern.search(body, position)
+            if match is None:
+                return None
+            position = match.end()
+            measured = _depth(body[checked:match.start()])
+            if measured is None:
+                # Inside a string; measure from the same place at the next candidate
+                continue
+            delta, lowest = measured
+            if depth + lowest <= 0:
+                # Closed the enclosing object, so anything further belongs to a sibling
+                return None
+            depth += delta
+            checked = match.start()
+            if depth == 1:
+                break
+        start = match.end()
+    return start
+
+
+def load_subtree(body: bytes, path: Sequence[str], max_full_parse_bytes: int = 256 * 1024) -> Any:
+    """
+    Return the value at path in the JSON document body.
+
+    Documents up to max_full_parse_bytes are parsed whole with orjson, which is faster than
+    locating anything in them. Larger ones are searched for the subtree, which is then the
+    only part decoded, so the unrelated parts of the document are never built as objects.
+    Falls back to a full parse when the subtree can't be located.
+    """
+    if len(body) > max_full_parse_bytes:
+        offset = _value_offset(body, path)
+        if offset is not None:
+            try:
+                # raw_decode stops at the end of the value instead of requiring the whole rest
+                value, _ = _DECODER.raw_decode(body[offset:].decode('utf-8'))
+                return value
+            except (ValueError, UnicodeDecodeError):
+                pass
+    return get_path(orjson.loads(body), path)
@@ -1,6 +1,6 @@
-import re
-from bs4 import BeautifulSoup
 from typing import Any, Dict, Optional
+from scraper.scrapy_project.html_processing import html_to_text, processed_field
+
 
 class TextCleanerPipeline:
     """Pipeline to clean text fields in learning resources by removing HTML tags and special characters."""
@@ -15,27 +15,16 @@ class TextCleanerPipeline:
         Returns:
             Cleaned string with HTML removed and whitespace normalized
         """
-        if not text:
-            return text
-            
-        # Remove HTML tags
-        soup = BeautifulSoup(text, 'html.parser')
-        text = soup.get_text()
-        
-        # Replace HTML entities
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&#39;', "'")
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Strip leading/trailing whitespace
-        return text.strip()
+        return html_to_text(text)
     
+    def _clean_field(self, item: Dict[str, Any], field: str) -> Optional[str]:
+        """Reuse the normalized text the spider derived for a field instead of parsing it again."""
+        text = item['data'].get(field)
+        processed = processed_field(item, field)
+        if processed is not None and text == processed['text']:
+            return processed['normalized_text']
+        return self._clean_text(text)
+
     def _clean_creator(self, creator: Dict[str, Any]) -> Dict[str, Any]:
         """Clean text fields in a creator dictionary."""
         if not creator:
@@ -63,8 +52,8 @@ class TextCleanerPipeline:
         
         # Clean main text fields
         data['name'] = self._clean_text(data.get('name'))
-        data['description'] = self._clean_text(data.get('description'))
-        data['short_description'] = self._clean_text(data.get('short_description'))
+        data['description'] = self._clean_field(item, 'description')
+        data['short_description'] = self._clean_field(item, 'short_description')
         
         # Clean creator text fields
         if 'creators' in data:
@@ -72,5 +61,7 @@ class TextCleanerPipeline:
                 self._clean_creator(creator) 
                 for creator in data['creators']
             ]
-            
+
+        # Nothing after this stage needs the derived forms, keep them out of the feed
+        item.pop('processed_html', None)
         return item
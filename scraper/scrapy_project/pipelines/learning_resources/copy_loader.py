@@ -0,0 +1,252 @@
+from typing import Any, Callable, Dict, List, Tuple
+from django.db import connections, transaction
+from core.models import LearningResource
+from uuid import uuid4
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Relations loaded through their own staging table, with the item key they hang off
+M2M_FIELDS = ['creators', 'languages', 'tags']
+
+# Columns that keep their original value when an existing resource is merged
+INSERT_ONLY_FIELDS = ['id', 'uuid', 'created_at', 'scraped_timestamp']
+
+
+def _copy_text(value: Any) -> str:
+    """Encode a value for COPY ... FROM STDIN in text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+class CopyLoader:
+    """
+    Postgres initial-load path for full catalog ingests.
+
+    Validated resources are streamed with COPY into a temporary staging table, and
+    their creator, language and tag ids into one staging table per relation. merge()
+    then folds everything into core_learningresource and the through tables with
+    set-based INSERT ... ON CONFLICT statements in a single transaction. Rows whose
+    content_hash is unchanged are left alone. A course staged more than once keeps
+    its latest resource row and only that row's relations.
+
+    The staging tables are temporary, so Postgres drops them with the session even
+    if the crawl dies before close(); the connection must stay open while staging.
+
+    build_resource maps an item onto an unsaved LearningResource and resolve_relations
+    maps a list of items onto {relation: [related ids per item]}; both are supplied by
+    DatabaseSavePipeline so the loader writes exactly what the ORM path would.
+    """
+
+    def __init__(
+        self,
+        build_resource: Callable[[Dict[str, Any]], LearningResource],
+        resolve_relations: Callable[[List[Dict[str, Any]]], Dict[str, List[List[Any]]]],
+        using: str = 'default'
+    ):
+        self.build_resource = build_resource
+        self.resolve_relations = resolve_relations
+        self.using = using
+        suffix = uuid4().hex[:12]
+        self.resource_table = f'staging_learningresource_{suffix}'
+        self.m2m_tables = {field_name: f'staging_learningresource_{field_name}_{suffix}' for field_name in M2M_FIELDS}
+        self.fields = [field for field in LearningResource._meta.concrete_fields]
+        self.staged = 0
+        # Sequence of the last staged resource; relation rows carry their resource's
+        self.staged_seq = 0
+        self.outcomes = None
+        self.is_open = False
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _m2m_columns(self, field_name: str) -> Tuple[str, str, str, Any]:
+        """Return the through table, its two columns and the related primary key field"""
+        field = LearningResource._meta.get_field(field_name)
+        through = field.remote_field.through
+        source_column = through._meta.get_field(field.m2m_field_name()).column
+        target_column = through._meta.get_field(field.m2m_reverse_field_name()).column
+        return through._meta.db_table, source_column, target_column, field.related_model._meta.pk
+
+    def open(self) -> None:
+        """Create the temporary staging tables"""
+        if self.connection.vendor != 'postgresql':
+            raise RuntimeError('The COPY loader requires PostgreSQL')
+
+        platform_column = LearningResource._meta.get_field('platform_id').column
+        resource_columns = ', '.join(
+            f'{self._quote(field.column)} {field.db_type(self.connection)}' for field in self.fields
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {self._quote(self.resource_table)} '
+                f'(staged_seq bigint, {resource_columns})'
+            )
+            for field_name, table in self.m2m_tables.items():
+                _, _, _, related_pk = self._m2m_columns(field_name)
+                cursor.execute(
+                    f'CREATE TEMPORARY TABLE {self._quote(table)} (staged_seq bigint, '
+                    f'{self._quote(platform_column)} varchar(255), '
+                    f'platform_course_id varchar(255), '
+                    f'related_id {related_pk.rel_db_type(self.connection)})'
+                )
+        self.is_open = True
+        logger.info(f"Created COPY staging table {self.resource_table}")
+
+    def close(self) -> None:
+        """Drop the staging tables"""
+        if not self.is_open:
+            return
+        with self.connection.cursor() as cursor:
+            for table in [self.resource_table, *self.m2m_tables.values()]:
+                cursor.execute(f'DROP TABLE IF EXISTS {self._quote(table)}')
+        self.is_open = False
+
+    def _copy(self, cursor, table: str, columns: List[str], rows: List[List[Any]]) -> None:
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(_copy_text(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        column_list = ', '.join(self._quote(column) for column in columns)
+        cursor.copy_expert(f'COPY {self._quote(table)} ({column_list}) FROM STDIN', buffer)
+
+    def stage(self, items: List[Dict[str, Any]]) -> int:
+        """COPY a chunk of validated items into the staging tables"""
+        if not items:
+            return 0
+
+        resources = [self.build_resource(data) for data in items]
+        sequences = range(self.staged_seq + 1, self.staged_seq + len(resources) + 1)
+        self.staged_seq += len(resources)
+        resource_rows = []
+        for seq, resource in zip(sequences, resources):
+            row = [seq]
+            for field in self.fields:
+                value = field.pre_save(resource, add=True)
+                row.append(field.get_db_prep_save(value, connection=self.connection))
+            resource_rows.append(row)
+
+        relations = self.resolve_relations(items)
+        platform_column = LearningResource._meta.get_field('platform_id').column
+
+        with self.connection.cursor() as cursor:
+            self._copy(
+                cursor, self.resource_table, ['staged_seq'] + [field.column for field in self.fields], resource_rows
+            )
+            for field_name, table in self.m2m_tables.items():
+                _, _, _, related_pk = self._m2m_columns(field_name)
+                rows = [
+                    [seq, resource.platform_id_id, resource.platform_course_id,
+                     related_pk.get_db_prep_save(related_id, connection=self.connection)]
+                    for seq, resource, related_ids in zip(sequences, resources, relations[field_name])
+                    for related_id in related_ids
+                ]
+                self._copy(cursor, table, ['staged_seq', platform_column, 'platform_course_id', 'related_id'], rows)
+
+        self.staged += len(items)
+        return len(items)
+
+    def merge(self) -> Tuple[List[Any], Dict[str, int]]:
+        """
+        Merge the staging tables into the live tables in one transaction.
+        Returns the ids of the inserted or updated resources and the count per outcome.
+        """
+        table = self._quote(LearningResource._meta.db_table)
+        staging = self._quote(self.resource_table)
+        platform_column = self._quote(LearningResource._meta.get_field('platform_id').column)
+        course_column = self._quote('platform_course_id')
+        hash_column = self._quote('content_hash')
+
+        columns = [self._quote(field.column) for field in self.fields]
+        update_columns = [
+            self._quote(field.column) for field in self.fields
+            if field.name not in INSERT_ONLY_FIELDS
+            and field.name not in ('platform_id', 'platform_course_id')
+        ]
+        column_list = ', '.join(columns)
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(DISTINCT ({platform_column}, {course_column})) FROM {staging}')
+            distinct_staged = cursor.fetchone()[0]
+
+            # The latest staged row wins when the same course was staged twice
+            cursor.execute(
+                f'INSERT INTO {table} ({column_list}) '
+                f'SELECT DISTINCT ON ({platform_column}, {course_column}) {column_list} FROM {staging} '
+                f'ORDER BY {platform_column}, {course_column}, staged_seq DESC '
+                f'ON CONFLICT ({platform_column}, {course_column}) DO UPDATE SET '
+                + ', '.join(f'{column} = EXCLUDED.{column}' for column in update_columns)
+                + f' WHERE {table}.{hash_column} IS DISTINCT FROM EXCLUDED.{hash_column} '
+                f'RETURNING {self._quote("id")}, (xmax = 0)'
+            )
+            written = cursor.fetchall()
+
+            for field_name, m2m_table in self.m2m_tables.items():
+                self._merge_m2m(cursor, field_name, self._quote(m2m_table))
+
+        inserted = sum(1 for _, is_insert in written if is_insert)
+        outcomes = {
+            'inserted': inserted,
+            'updated': len(written) - inserted,
+            'skipped': distinct_staged - len(written),
+        }
+        self.outcomes = outcomes
+        logger.info(
+            f"Merged {distinct_staged} staged learning resources: {outcomes['inserted']} inserted, "
+            f"{outcomes['updated']} updated, {outcomes['skipped']} unchanged"
+        )
+        return [resource_id for resource_id, _ in written], outcomes
+
+    def _merge_m2m(self, cursor, field_name: str, m2m_table: str) -> None:
+        """Replace the through rows of every staged resource with those staged with its latest row"""
+        through_table, source_column, target_column, _ = self._m2m_columns(field_name)
+        through_table = self._quote(through_table)
+        source_column = self._quote(source_column)
+        target_column = self._quote(target_column)
+        table = self._quote(LearningResource._meta.db_table)
+        staging = self._quote(self.resource_table)
+        platform_column = self._quote(LearningResource._meta.get_field('platform_id').column)
+        course_column = self._quote('platform_course_id')
+        id_column = self._quote('id')
+
+        staged_resources = (
+            f'SELECT r.{id_column} FROM {table} r JOIN {staging} s '
+            f'ON r.{platform_column} = s.{platform_column} AND r.{course_column} = s.{course_column}'
+        )
+        # Same choice as the DISTINCT ON in merge(): only the latest staged row's relations count
+        latest = (
+            f'SELECT {platform_column}, {course_column}, max(staged_seq) AS staged_seq FROM {staging} '
+            f'GROUP BY {platform_column}, {course_column}'
+        )
+        staged_pairs = (
+            f'SELECT DISTINCT r.{id_column} AS resource_id, m.related_id FROM {m2m_table} m '
+            f'JOIN ({latest}) l ON l.{platform_column} = m.{platform_column} '
+            f'AND l.{course_column} = m.{course_column} AND l.staged_seq = m.staged_seq '
+            f'JOIN {table} r ON r.{platform_column} = m.{platform_column} AND r.{course_column} = m.{course_column}'
+        )
+
+        cursor.execute(
+            f'DELETE FROM {through_table} t WHERE t.{source_column} IN ({staged_resources}) '
+            f'AND NOT EXISTS (SELECT 1 FROM ({staged_pairs}) p '
+            f'WHERE p.resource_id = t.{source_column} AND p.related_id = t.{target_column})'
+        )
+        cursor.execute(
+            f'INSERT INTO {through_table} ({source_column}, {target_column}) '
+            f'SELECT resource_id, related_id FROM ({staged_pairs}) p '
+            f'ON CONFLICT ({source_column}, {target_column}) DO NOTHING'
+        )
@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional, Tuple
+from django.db.models import Q
+from core.models import Creator, Platform
+import logging
+
+logger = logging.getLogger(__name__)
+
+CreatorKey = Tuple[Optional[str], str]
+
+
+class CreatorResolver:
+    """
+    Resolve scraped creators to Creator ids for a whole batch of resources.
+
+    Creators are deduplicated within the batch and across the crawl through a
+    crawl-scoped map of (platform, platform_creator_id) -> (id, refreshed fields).
+    Only creators that are new or whose refreshed fields changed are written,
+    with a single bulk upsert keyed on (platform, platform_creator_id). Creators without
+    a platform can't take part in the upsert, their NULL platform never conflicts, so
+    they are written one by one against the unique_creator_without_platform constraint.
+    """
+
+    # Fields kept in sync with the platform on every crawl
+    REFRESH_FIELDS = ['name', 'url', 'platform_thumbnail_url']
+
+    def __init__(self):
+        self.known: Dict[CreatorKey, Tuple[Any, Tuple]] = {}
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+
+    def clear(self) -> None:
+        """Forget the crawl-scoped map, e.g. after a rolled back transaction"""
+        self.known.clear()
+
+    def _snapshot(self, values: Dict[str, Any]) -> Tuple:
+        return tuple(values.get(field) for field in self.REFRESH_FIELDS)
+
+    def resolve(self, platform: Platform, creators: List[Dict[str, Any]]) -> List[Any]:
+        """Return the Creator ids for one resource's creators"""
+        return self.resolve_many([(platform, creators)])[0]
+
+    def resolve_many(self, batch: List[Tuple[Platform, List[Dict[str, Any]]]]) -> List[List[Any]]:
+        """Return the Creator ids for each (platform, creators) entry of the batch, in order"""
+        wanted: Dict[CreatorKey, Dict[str, Any]] = {}
+        batch_keys: List[List[CreatorKey]] = []
+        for platform, creators in batch:
+            keys = []
+            for creator_data in creators or []:
+                key = (platform.pk if platform is not None else None, str(creator_data['platform_creator_id']))
+                wanted[key] = {
+                    'name': creator_data['name'],
+                    'url': creator_data.get('url'),
+                    'description': creator_data.get('description') or '',
+                    'platform_thumbnail_url': creator_data.get('platform_thumbnail_url'),
+                }
+                if key not in keys:
+                    keys.append(key)
+            batch_keys.append(keys)
+
+        if wanted:
+            self._load_known([key for key in wanted if key not in self.known])
+            self._write_changed(wanted)
+
+        return [[self.known[key][0] for key in keys] for keys in batch_keys]
+
+    @staticmethod
+    def _key_filter(keys) -> Q:
+        """Rows that may match keys; callers keep only the exact keys. A NULL platform needs isnull"""
+        platform_ids = {platform_id for platform_id, _ in keys if platform_id is not None}
+        condition = Q(platform_id__in=platform_ids)
+        if len(platform_ids) < len({platform_id for platform_id, _ in keys}):
+            condition |= Q(platform__isnull=True)
+        return condition & Q(platform_creator_id__in={platform_creator_id for _, platform_creator_id in keys})
+
+    def _load_known(self, keys: List[CreatorKey]) -> None:
+        """Fetch the creators of the batch that the map hasn't seen yet with a single query"""
+        if not keys:
+            return
+        keys = set(keys)
+        rows = Creator.objects.filter(self._key_filter(keys)).values_list(
+            'platform_id', 'platform_creator_id', 'id', *self.REFRESH_FIELDS
+        )
+        for platform_id, platform_creator_id, creator_id, *refreshed in rows:
+            key = (platform_id, platform_creator_id)
+            if key in keys:
+                self.known[key] = (creator_id, tuple(refreshed))
+
+    def _write_changed(self, wanted: Dict[CreatorKey, Dict[str, Any]]) -> None:
+        """Bulk upsert creators that are new or whose refreshed fields changed"""
+        changed = []
+        for key, values in wanted.items():
+            current = self.known.get(key)
+            if current is None:
+                self.inserted += 1
+            elif current[1] != self._snapshot(values):
+                self.updated += 1
+            else:
+                self.unchanged += 1
+                continue
+            changed.append(Creator(platform_id=key[0], platform_creator_id=key[1], **values))
+
+        if not changed:
+            return
+
+        with_platform = [creator for creator in changed if creator.platform_id is not None]
+        if with_platform:
+            Creator.objects.bulk_create(
+                with_platform,
+                update_conflicts=True,
+                unique_fields=['platform', 'platform_creator_id'],
+                update_fields=self.REFRESH_FIELDS + ['updated_at'],
+            )
+        for creator in changed:
+            if creator.platform_id is None:
+                Creator.objects.update_or_create(
+                    platform__isnull=True,
+                    platform_creator_id=creator.platform_creator_id,
+                    defaults=wanted[(None, creator.platform_creator_id)],
+                )
+
+        # Existing rows keep their primary key on conflict, so read back the real ids
+        changed_keys = [(creator.platform_id, creator.platform_creator_id) for creator in changed]
+        self.known.update({
+            key: (creator_id, self._snapshot(wanted[key]))
+            for key, creator_id in self._fetch_ids(changed_keys).items()
+        })
+        logger.debug(f"Upserted {len(changed)} creators")
+
+    def _fetch_ids(self, keys: List[CreatorKey]) -> Dict[CreatorKey, Any]:
+        keys = set(keys)
+        rows = Creator.objects.filter(self._key_filter(keys)).values_list('platform_id', 'platform_creator_id', 'id')
+        return {
+            (platform_id, platform_creator_id): creator_id
+            for platform_id, platform_creator_id, creator_id in rows
+            if (platform_id, platform_creator_id) in keys
+        }
+
+    def report_stats(self, stats, spider) -> None:
+        """Write insert/update/unchanged counters into the crawl stats"""
+        stats.set_value('database_save/creators/inserted', self.inserted, spider=spider)
+        stats.set_value('database_save/creators/updated', self.updated, spider=spider)
+        stats.set_value('database_save/creators/unchanged', self.unchanged, spider=spider)
@@ -1,17 +1,27 @@
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from django.db import transaction, connections
+from twisted.internet import defer, task
+from scrapy.exceptions import DropItem
+from scrapy.settings import get_settings_priority
 from core.models import (
     LearningResource,
-    Creator,
     Platform,
     Format,
     Language,
     Tag,
     Level
 )
+from core.bulk import sync_many_to_many
+from core.index import save_learning_resource_records
+from .lookup_cache import LookupCaches
+from .creator_resolver import CreatorResolver
+from .fingerprint import content_fingerprint
+from .db_writer import DatabaseWriter
+from .copy_loader import CopyLoader
 from urllib.parse import urlparse
 import logging
 import os
+import time
 import datetime
 
 # Set up direct debug printing
@@ -29,13 +39,90 @@ logger = logging.getLogger(__name__)
 class DatabaseSavePipeline:
     """Pipeline to save validated learning resources and related data to the database"""
 
-    def __init__(self):
+    ITEM_MODE = 'item'
+    BATCH_MODE = 'batch'
+    COPY_MODE = 'copy'
+
+    # Columns refreshed when a buffered resource already exists
+    BATCH_UPDATE_FIELDS = [
+        'name',
+        'description',
+        'short_description',
+        'url',
+        'platform_thumbnail_url',
+        'is_free',
+        'is_limited_free',
+        'dollar_price',
+        'has_certificate',
+        'level',
+        'format',
+        'duration_h',
+        'platform_reviews_count',
+        'platform_reviews_rating',
+        'enrollment_count',
+        'is_active',
+        'html_description',
+        'platform_last_update',
+        'content_hash',
+        'updated_at',
+    ]
+
+    # Outcomes of saving a resource, reported as database_save/resources/<outcome>
+    INSERTED = 'inserted'
+    UPDATED = 'updated'
+    SKIPPED = 'skipped'
+
+    def __init__(
+        self,
+        mode: str = ITEM_MODE,
+        batch_size: int = 100,
+        batch_timeout: float = 30.0,
+        writer_queue_size: int = 0,
+        transaction_size: int = 1,
+        transaction_timeout: float = 10.0,
+        transaction_size_set: bool = False,
+        crawler=None
+    ):
         self.logger = logging.getLogger(__name__)
+        if mode not in (self.ITEM_MODE, self.BATCH_MODE, self.COPY_MODE):
+            raise ValueError(f"Unknown DATABASE_SAVE_MODE: {mode}")
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
+        self.buffer: List[Dict[str, Any]] = []
+        self.last_flush = time.monotonic()
+        self.flush_loop = None
+        self.spider = None
+        self.lookups = LookupCaches()
+        self.creators = CreatorResolver()
+        self.crawler = crawler
+        self.loader = None
+
+        # In item mode, commit every transaction_size items or transaction_timeout seconds
+        # instead of once per item; each item still gets its own savepoint
+        self.transaction_size = max(1, transaction_size)
+        self.transaction_timeout = transaction_timeout
+        # Whether the spider asked for a transaction size, so it can be told it doesn't apply
+        self.transaction_size_set = transaction_size_set
+        self.commit_loop = None
+        self.group_started = None
+        self.group_items = 0
+
+        # With a writer queue all database work runs on the writer thread; without
+        # one it runs inline on the reactor thread
+        self.writer = None
+        if writer_queue_size > 0:
+            self.writer = DatabaseWriter(
+                max_queue_size=writer_queue_size,
+                on_full=self._pause_crawl,
+                on_drained=self._resume_crawl,
+            )
+
         # Add debug information about database configuration
         db_url = os.environ.get('DATABASE_URL', 'Not set in environment')
         self.logger.info(f"DatabaseSavePipeline initialized with DATABASE_URL environment: {db_url}")
         db_print(f"DatabaseSavePipeline initialized with DATABASE_URL environment: {db_url}")
-        
+
         # Print current database connection info
         db_settings = connections.databases.get('default')
         if db_settings:
@@ -61,6 +148,157 @@ class DatabaseSavePipeline:
         except Exception as e:
             db_print(f"No write permission in current directory: {e}", "WARNING")
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            mode=settings.get('DATABASE_SAVE_MODE', cls.ITEM_MODE),
+            batch_size=settings.getint('DATABASE_SAVE_BATCH_SIZE', 100),
+            batch_timeout=settings.getfloat('DATABASE_SAVE_BATCH_TIMEOUT', 30.0),
+            writer_queue_size=settings.getint('DATABASE_WRITER_QUEUE_SIZE', 0),
+            transaction_size=settings.getint('DATABASE_SAVE_TRANSACTION_SIZE', 1),
+            transaction_timeout=settings.getfloat('DATABASE_SAVE_TRANSACTION_TIMEOUT', 10.0),
+            # Set by the spider or on the command line rather than in the project settings
+            transaction_size_set=(
+                settings.getpriority('DATABASE_SAVE_TRANSACTION_SIZE') > get_settings_priority('project')
+            ),
+            crawler=crawler,
+        )
+
+    def _run(self, func, *args):
+        """Run database work on the writer thread if there is one, returning a Deferred, or inline"""
+        if self.writer is not None:
+            return self.writer.submit(func, *args)
+        return func(*args)
+
+    def _run_periodic(self, check) -> None:
+        """Run a LoopingCall check, logging failures instead of letting one stop the loop"""
+        try:
+            result = check()
+        except Exception as e:
+            self.logger.error(f"Periodic database save failed: {str(e)}")
+            return
+        if isinstance(result, defer.Deferred):
+            result.addErrback(self._log_writer_failure)
+
+    def _log_writer_failure(self, failure) -> None:
+        self.logger.error(f"Database writer failed: {failure.getErrorMessage()}")
+
+    def _pause_crawl(self) -> None:
+        """Stop scheduling requests while the writer queue is full so memory stays flat"""
+        if self.crawler is not None and self.crawler.engine is not None:
+            self.logger.info("Database writer queue is full, pausing the crawl")
+            self.crawler.engine.pause()
+            self.crawler.stats.inc_value('database_save/writer/paused', spider=self.spider)
+
+    def _resume_crawl(self) -> None:
+        if self.crawler is not None and self.crawler.engine is not None:
+            self.logger.info("Database writer queue drained, resuming the crawl")
+            self.crawler.engine.unpause()
+
+    def _is_buffered(self) -> bool:
+        return self.mode in (self.BATCH_MODE, self.COPY_MODE)
+
+    def _is_grouped(self) -> bool:
+        return self.mode == self.ITEM_MODE and self.transaction_size > 1
+
+    def open_spider(self, spider):
+        """Start the periodic flush so a slow crawl doesn't hold items in memory indefinitely"""
+        self.spider = spider
+        if self.mode == self.COPY_MODE:
+            if connections['default'].vendor == 'postgresql':
+                self.loader = CopyLoader(self._build_resource, self._resolve_relations)
+                if self.writer is not None:
+                    # Recycling the writer's connection would drop the temporary staging tables
+                    self.writer.keep_connection = True
+            else:
+                self.logger.warning("The 'copy' save mode needs PostgreSQL, falling back to 'batch'")
+                self.mode = self.BATCH_MODE
+        if self._is_buffered() and self.transaction_size_set:
+            self.logger.warning(
+                f"DATABASE_SAVE_TRANSACTION_SIZE only applies in 'item' mode; in '{self.mode}' mode "
+                f"every batch of DATABASE_SAVE_BATCH_SIZE ({self.batch_size}) resources is one transaction"
+            )
+        if self.writer is not None:
+            self.writer.start()
+        if self._is_buffered() and self.batch_timeout > 0:
+            self.flush_loop = task.LoopingCall(self._run_periodic, self._flush_if_stale)
+            self.flush_loop.start(self.batch_timeout, now=False)
+        if self._is_grouped() and self.transaction_timeout > 0:
+            self.commit_loop = task.LoopingCall(self._run_periodic, self._commit_group_if_stale)
+            self.commit_loop.start(self.transaction_timeout, now=False)
+        self.logger.info(
+            f"DatabaseSavePipeline opened in '{self.mode}' mode "
+            f"(batch_size={self.batch_size}, batch_timeout={self.batch_timeout}s, "
+            f"writer={'thread' if self.writer is not None else 'inline'})"
+        )
+        if self.loader is not None:
+            return self._run(self._open_loader)
+        return self._run(self.lookups.load)
+
+    def _open_loader(self) -> None:
+        self.lookups.load()
+        self.loader.open()
+
+    def close_spider(self, spider):
+        """Write whatever is still buffered before the crawl finishes"""
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        self.flush_loop = None
+        if self.commit_loop is not None and self.commit_loop.running:
+            self.commit_loop.stop()
+        self.commit_loop = None
+        self._flush(spider)
+        if self.loader is not None:
+            self._run(self._merge_staged, spider)
+        if self._is_grouped():
+            self._run(self._commit_group, spider)
+        self._run(self._report_stats, spider)
+
+        if self.writer is not None:
+            # Scrapy waits for the queued writes before closing the crawl
+            return self.writer.stop()
+
+    def _update_stats(self, func: Callable, *args) -> None:
+        """Crawl stats aren't thread safe, so updates made on the writer thread run in the reactor"""
+        if self.writer is not None:
+            self.writer.call_in_reactor(func, *args)
+        else:
+            func(*args)
+
+    def _report_stats(self, spider) -> None:
+        crawler = getattr(spider, 'crawler', None)
+        if crawler is not None:
+            # The writer's last task, so the counters no longer change once the reactor reads them
+            self._update_stats(self.lookups.report_stats, crawler.stats, spider)
+            self._update_stats(self.creators.report_stats, crawler.stats, spider)
+
+    def _inc_stat(self, spider, key: str, count: int = 1) -> None:
+        """Increment a crawl stat if the spider is attached to a crawler"""
+        crawler = getattr(spider, 'crawler', None)
+        if crawler is not None:
+            self._update_stats(crawler.stats.inc_value, f'database_save/{key}', count, 0, spider)
+
+    def _record_failure(self, data: Dict[str, Any], error: Exception, spider) -> None:
+        """Count a resource that could not be saved and keep its platform_course_id in the stats"""
+        self._inc_stat(spider, 'items_failed')
+        crawler = getattr(spider, 'crawler', None)
+        if crawler is not None:
+            self._update_stats(
+                self._add_failed_item, crawler.stats, str(data.get('platform_course_id')), str(error), spider
+            )
+        if spider is not None:
+            spider.logger.error(
+                f"Error saving learning resource {data.get('platform_course_id')} "
+                f"to database: {str(error)}"
+            )
+
+    @staticmethod
+    def _add_failed_item(stats, platform_course_id: str, error: str, spider) -> None:
+        failed = stats.get_value('database_save/failed_items', {}, spider=spider)
+        failed[platform_course_id] = error
+        stats.set_value('database_save/failed_items', failed, spider=spider)
+
     def _clean_url(self, url: Any) -> str:
         """Clean and validate URL"""
         if not url:
@@ -73,6 +311,21 @@ class DatabaseSavePipeline:
         except Exception:
             return None
 
+    def _clean_urls(self, data: Dict[str, Any]) -> None:
+        """Clean resource and creator URLs in place"""
+        if 'url' in data:
+            data['url'] = self._clean_url(data['url'])
+        if 'thumbnail_url' in data:
+            data['thumbnail_url'] = self._clean_url(data['thumbnail_url'])
+
+        # Clean creator URLs
+        if 'creators' in data:
+            for creator in data['creators']:
+                if 'url' in creator:
+                    creator['url'] = self._clean_url(creator['url'])
+                if 'platform_thumbnail_url' in creator:
+                    creator['platform_thumbnail_url'] = self._clean_url(creator['platform_thumbnail_url'])
+
     def process_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
         """
         Save the learning resource and its related data to the database.
@@ -82,29 +335,28 @@ class DatabaseSavePipeline:
             db_print(f"Skipping non-learning-resource item type: {item.get('type')}")
             return item
 
+        if self._is_buffered():
+            return self._buffer_item(item, spider)
+
+        return self._run(self._save_item, item, spider)
+
+    def _save_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
+        """Save a single learning resource in its own transaction"""
+        if self._is_grouped():
+            return self._save_grouped_item(item, spider)
         try:
             resource_name = item['data'].get('name', 'unnamed')
             db_print(f"Processing learning resource: {resource_name}")
             self.logger.info(f"Processing learning resource: {resource_name}")
-            
+
             # Clean URLs before saving
             data = item['data']
-            if 'url' in data:
-                data['url'] = self._clean_url(data['url'])
-            if 'thumbnail_url' in data:
-                data['thumbnail_url'] = self._clean_url(data['thumbnail_url'])
-                
-            # Clean creator URLs
-            if 'creators' in data:
-                for creator in data['creators']:
-                    if 'url' in creator:
-                        creator['url'] = self._clean_url(creator['url'])
-                    if 'platform_thumbnail_url' in creator:
-                        creator['platform_thumbnail_url'] = self._clean_url(creator['platform_thumbnail_url'])
+            self._clean_urls(data)
 
             # Save to database
             db_print(f"Calling _save_learning_resource for: {resource_name}")
-            self._save_learning_resource(data, spider)
+            outcome = self._save_learning_resource(data, spider)
+            self._inc_stat(spider, f'resources/{outcome}')
             db_print(f"Successfully saved learning resource: {resource_name}")
             self.logger.info(f"Successfully saved learning resource: {resource_name}")
             return item
@@ -118,115 +370,392 @@ class DatabaseSavePipeline:
             db_print(f"Full error traceback: {trace}", "ERROR")
             raise
 
-    def _get_or_create_tags(self, tag_names: List[str]) -> List[Tag]:
-        """Get or create tags by name using the Tag model's helper method"""
-        return Tag.get_or_create_tags(tag_names)
+    def _save_grouped_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
+        """
+        Save a learning resource inside the open transaction group. The item's atomic block
+        becomes a savepoint, so a failure only rolls back this item and the item is dropped.
+        """
+        data = item['data']
+        self._clean_urls(data)
+        if self.group_started is None:
+            # atomic() creates savepoints instead of transactions while autocommit is off
+            transaction.set_autocommit(False)
+            self.group_started = time.monotonic()
+
+        try:
+            outcome = self._save_learning_resource(data, spider)
+        except Exception as e:
+            self._record_failure(data, e, spider)
+            raise DropItem(f"Could not save learning resource {data.get('platform_course_id')}: {str(e)}")
+        else:
+            self._inc_stat(spider, f'resources/{outcome}')
+        finally:
+            self.group_items += 1
+            if self.group_items >= self.transaction_size or self._is_group_stale():
+                self._commit_group(spider)
+        return item
+
+    def _is_group_stale(self) -> bool:
+        return (
+            self.group_started is not None
+            and self.transaction_timeout > 0
+            and time.monotonic() - self.group_started >= self.transaction_timeout
+        )
+
+    def _commit_group_if_stale(self):
+        # The check runs on the thread that owns the transaction
+        return self._run(self._commit_stale_group, self.spider)
+
+    def _commit_stale_group(self, spider) -> None:
+        if self._is_group_stale():
+            self._commit_group(spider)
 
-    def _save_learning_resource(self, data: Dict[str, Any], spider) -> None:
-        """Synchronous method to save learning resource to database"""
+    def _commit_group(self, spider) -> None:
+        """Commit the open transaction group and return the connection to autocommit"""
+        if self.group_started is None:
+            return
+        items = self.group_items
+        try:
+            transaction.commit()
+        except Exception as e:
+            transaction.rollback()
+            self._reset_caches()
+            self._inc_stat(spider, 'transactions_failed')
+            self._inc_stat(spider, 'items_failed', items)
+            self.logger.error(f"Committing a group of {items} learning resources failed: {str(e)}")
+        else:
+            self._inc_stat(spider, 'transactions_committed')
+            self.logger.info(
+                f"Committed {items} learning resources in {time.monotonic() - self.group_started:.2f}s"
+            )
+        finally:
+            transaction.set_autocommit(True)
+            self.group_started = None
+            self.group_items = 0
+
+    def _buffer_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
+        """Queue the item for the next bulk write and flush once the batch is full or stale"""
+        data = item['data']
+        self._clean_urls(data)
+        self.buffer.append(data)
+        self._inc_stat(spider, 'items_buffered')
+
+        if len(self.buffer) >= self.batch_size or self._is_stale():
+            self._flush(spider)
+        return item
+
+    def _is_stale(self) -> bool:
+        return self.batch_timeout > 0 and time.monotonic() - self.last_flush >= self.batch_timeout
+
+    def _flush_if_stale(self) -> None:
+        if self.buffer and self._is_stale():
+            self._flush(self.spider)
+
+    def _flush(self, spider) -> None:
+        """Hand the buffered items over to be written"""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+
+        batch, self.buffer = self.buffer, []
+        write = self._stage_batch if self.loader is not None else self._write_batch
+        result = self._run(write, batch, spider)
+        if self.writer is not None:
+            result.addErrback(self._log_writer_failure)
+
+    def _write_batch(self, batch: List[Dict[str, Any]], spider) -> None:
+        """Write a batch in one transaction, falling back to per-item saves if it fails"""
+        started = time.monotonic()
+        try:
+            with transaction.atomic():
+                resource_ids, outcomes = self._save_learning_resources_batch(batch, spider)
+        except Exception as e:
+            self.logger.error(
+                f"Batch of {len(batch)} learning resources failed ({str(e)}), falling back to per-item saves"
+            )
+            self._inc_stat(spider, 'batches_failed')
+            self._reset_caches()
+            for data in batch:
+                try:
+                    outcome = self._save_learning_resource(data, spider)
+                    self._inc_stat(spider, f'resources/{outcome}')
+                    self._inc_stat(spider, 'items_saved')
+                except Exception as item_error:
+                    self._record_failure(data, item_error, spider)
+        else:
+            self._inc_stat(spider, 'batches_flushed')
+            self._inc_stat(spider, 'items_saved', len(batch))
+            for outcome, count in outcomes.items():
+                self._inc_stat(spider, f'resources/{outcome}', count)
+            self.logger.info(
+                f"Flushed batch of {len(batch)} learning resources in {time.monotonic() - started:.2f}s "
+                f"({outcomes[self.INSERTED]} inserted, {outcomes[self.UPDATED]} updated, "
+                f"{outcomes[self.SKIPPED]} unchanged)"
+            )
+            if resource_ids:
+                self._index_resources(resource_ids)
+
+    def _stage_batch(self, batch: List[Dict[str, Any]], spider) -> None:
+        """COPY a batch into the staging tables; nothing reaches the live tables until close"""
+        started = time.monotonic()
+        try:
+            self.loader.stage(batch)
+        except Exception as e:
+            self._inc_stat(spider, 'items_failed', len(batch))
+            self.logger.error(f"Could not stage batch of {len(batch)} learning resources: {str(e)}")
+            return
+        self._inc_stat(spider, 'items_staged', len(batch))
+        self.logger.info(f"Staged batch of {len(batch)} learning resources in {time.monotonic() - started:.2f}s")
+
+    def _merge_staged(self, spider) -> Dict[str, int]:
+        """Merge everything staged during the crawl into the live tables, then drop the staging tables"""
+        started = time.monotonic()
+        try:
+            resource_ids, outcomes = self.loader.merge()
+        except Exception as e:
+            self._inc_stat(spider, 'merge_failed')
+            self.logger.error(f"Merging {self.loader.staged} staged learning resources failed: {str(e)}")
+            raise
+        finally:
+            self.loader.close()
+
+        self._inc_stat(spider, 'items_saved', sum(outcomes.values()))
+        for outcome, count in outcomes.items():
+            self._inc_stat(spider, f'resources/{outcome}', count)
+        self.logger.info(f"Merged staged learning resources in {time.monotonic() - started:.2f}s")
+        if resource_ids:
+            self._index_resources(resource_ids)
+        return outcomes
+
+    def _index_resources(self, resource_ids: List[Any]) -> None:
+        """Send bulk-written resources to the search index; a failure here must not lose the save"""
+        try:
+            save_learning_resource_records(LearningResource.objects.filter(id__in=resource_ids))
+        except Exception as e:
+            self.logger.warning(f"Could not index {len(resource_ids)} learning resources: {str(e)}")
+
+    def _get_tag_ids(self, data: Dict[str, Any]) -> List[Any]:
+        """Resolve tag names to ids using the Tag model's bulk helper"""
+        return Tag.get_or_create_tag_ids(data.get('tags', []))
+
+    def _reset_caches(self) -> None:
+        """Rows created inside a rolled back transaction must not stay cached"""
+        self.lookups.load()
+        self.creators.clear()
+        Tag.clear_id_cache()
+
+    def _get_platform(self, data: Dict[str, Any]) -> Platform:
+        return self.lookups.platforms.get(data['platform_id'])
+
+    def _get_format(self, data: Dict[str, Any]) -> Optional[Format]:
+        format_name = data.get('format')
+        if not format_name:
+            return None
+        return self.lookups.formats.get(format_name)
+
+    def _get_level(self, data: Dict[str, Any]) -> Optional[Level]:
+        level_name = data.get('level')
+        if not level_name:
+            return None
+        return self.lookups.levels.get(level_name)
+
+    def _get_creator_ids(self, data: Dict[str, Any], platform: Platform) -> List[Any]:
+        return self.creators.resolve(platform, data.get('creators', []))
+
+    def _get_languages(self, data: Dict[str, Any]) -> List[Language]:
+        return [
+            self.lookups.languages.get(lang_code)
+            for lang_code in data.get('languages', [])
+        ]
+
+    def _resource_fields(
+        self,
+        data: Dict[str, Any],
+        format_obj: Optional[Format],
+        level_obj: Optional[Level]
+    ) -> Dict[str, Any]:
+        """Map validated item data onto LearningResource column values"""
+        return {
+            'name': data['name'],
+            'description': data['description'],
+            'short_description': data.get('short_description') or '',
+            'url': data['url'],
+            'platform_thumbnail_url': data.get('platform_thumbnail_url'),
+            'is_free': data.get('is_free', False),
+            'is_limited_free': data.get('is_limited_free', False),
+            'dollar_price': data.get('dollar_price'),
+            'has_certificate': data.get('has_certificate', False),
+            'level': level_obj,
+            'format': format_obj,
+            'duration_h': data.get('duration_h'),
+            'platform_reviews_count': data.get('platform_reviews_count') or 0,
+            'platform_reviews_rating': data.get('platform_reviews_rating'),
+            'enrollment_count': data.get('enrollment_count') or 0,
+            'is_active': data.get('is_active', True),
+            'html_description': data.get('html_description'),
+            'platform_last_update': data.get('platform_last_update'),
+        }
+
+    def _build_resource(self, data: Dict[str, Any], fingerprint: Optional[str] = None) -> LearningResource:
+        """Build the unsaved LearningResource for validated item data"""
+        return LearningResource(
+            platform_id=self._get_platform(data),
+            platform_course_id=data['platform_course_id'],
+            content_hash=fingerprint or content_fingerprint(data),
+            **self._resource_fields(data, self._get_format(data), self._get_level(data))
+        )
+
+    def _resolve_relations(self, batch: List[Dict[str, Any]]) -> Dict[str, List[List[Any]]]:
+        """Resolve the creator, language and tag ids of every item in batch, in order"""
+        return {
+            'creators': self.creators.resolve_many([
+                (self._get_platform(data), data.get('creators', [])) for data in batch
+            ]),
+            'languages': [[language.pk for language in self._get_languages(data)] for data in batch],
+            'tags': [self._get_tag_ids(data) for data in batch],
+        }
+
+    def _existing_hashes(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """Fetch the stored content hash of every existing resource among keys with a single query"""
+        keys = set(keys)
+        rows = LearningResource.objects.filter(
+            platform_id__in={platform_id for platform_id, _ in keys},
+            platform_course_id__in={platform_course_id for _, platform_course_id in keys},
+        ).values_list('platform_id', 'platform_course_id', 'content_hash')
+        return {
+            (platform_id, platform_course_id): content_hash
+            for platform_id, platform_course_id, content_hash in rows
+            if (platform_id, platform_course_id) in keys
+        }
+
+    def _save_learning_resources_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        spider
+    ) -> Tuple[List[Any], Dict[str, int]]:
+        """
+        Upsert a batch of learning resources keyed on (platform, platform_course_id).
+
+        Resources whose content hash matches the stored one are skipped without any
+        writes. Returns the ids of the written resources and the count per outcome.
+        """
+        # Postgres refuses to upsert the same key twice in one statement, so the latest item wins
+        unique_items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for data in batch:
+            unique_items[(data['platform_id'], data['platform_course_id'])] = data
+
+        outcomes = {self.INSERTED: 0, self.UPDATED: 0, self.SKIPPED: 0}
+        existing_hashes = self._existing_hashes(list(unique_items))
+        changed_items = []
+        for key, data in unique_items.items():
+            fingerprint = content_fingerprint(data)
+            if key not in existing_hashes:
+                outcomes[self.INSERTED] += 1
+            elif existing_hashes[key] != fingerprint:
+                outcomes[self.UPDATED] += 1
+            else:
+                outcomes[self.SKIPPED] += 1
+                continue
+            changed_items.append((data, fingerprint))
+
+        if not changed_items:
+            return [], outcomes
+
+        resources = [self._build_resource(data, fingerprint) for data, fingerprint in changed_items]
+        relations = self._resolve_relations([data for data, _ in changed_items])
+
+        LearningResource.objects.bulk_create(
+            resources,
+            update_conflicts=True,
+            unique_fields=['platform_id', 'platform_course_id'],
+            update_fields=self.BATCH_UPDATE_FIELDS,
+        )
+
+        # Existing rows keep their primary key on conflict, so read back the real ids
+        saved_ids = {
+            (platform_pk, platform_course_id): resource_id
+            for platform_pk, platform_course_id, resource_id in LearningResource.objects.filter(
+                platform_id__in={resource.platform_id_id for resource in resources},
+                platform_course_id__in={resource.platform_course_id for resource in resources},
+            ).values_list('platform_id', 'platform_course_id', 'id')
+        }
+
+        related_ids = {field_name: {} for field_name in relations}
+        for index, resource in enumerate(resources):
+            resource.id = saved_ids[(resource.platform_id_id, resource.platform_course_id)]
+            for field_name, ids_per_item in relations.items():
+                related_ids[field_name][resource.id] = ids_per_item[index]
+
+        for field_name, ids_by_resource in related_ids.items():
+            added, removed = sync_many_to_many(LearningResource, field_name, ids_by_resource)
+            self._inc_stat(spider, f'm2m/{field_name}/added', added)
+            self._inc_stat(spider, f'm2m/{field_name}/removed', removed)
+
+        return [resource.id for resource in resources], outcomes
+
+    def _save_learning_resource(self, data: Dict[str, Any], spider) -> str:
+        """
+        Synchronous method to save learning resource to database.
+        Returns whether the resource was inserted, updated or skipped as unchanged.
+        """
         try:
             resource_name = data.get('name', 'unnamed')
             db_print(f"Starting database transaction for learning resource: {resource_name}")
             self.logger.info(f"Starting database transaction for learning resource: {resource_name}")
-            
+
             with transaction.atomic():
                 # Get or create platform
                 db_print("Creating or getting platform")
-                platform, platform_created = Platform.objects.get_or_create(
-                    name=data['platform_id']
-                )
-                db_print(f"Platform: {platform.name} ({'created' if platform_created else 'existing'})")
-                self.logger.info(f"Platform: {platform.name} ({'created' if platform_created else 'existing'})")
+                platform = self._get_platform(data)
+                db_print(f"Platform: {platform.name}")
+
+                # Skip all writes when the content hasn't changed since the last crawl
+                fingerprint = content_fingerprint(data)
+                stored_fingerprint = LearningResource.objects.filter(
+                    platform_id=platform,
+                    platform_course_id=data['platform_course_id']
+                ).values_list('content_hash', flat=True).first()
+                if stored_fingerprint == fingerprint:
+                    msg = f"Unchanged learning resource: {data['name']} (Platform: {platform.name}, ID: {data['platform_course_id']})"
+                    self.logger.info(msg)
+                    db_print(msg)
+                    return self.SKIPPED
 
                 # Get or create format
-                format_name = data.get('format')
-                format_obj = None
-                if format_name:
-                    db_print(f"Creating or getting format: {format_name}")
-                    format_obj, format_created = Format.objects.get_or_create(
-                        name=format_name
-                    )
-                    db_print(f"Format: {format_obj.name} ({'created' if format_created else 'existing'})")
-                    self.logger.info(f"Format: {format_obj.name} ({'created' if format_created else 'existing'})")
+                format_obj = self._get_format(data)
 
                 # Get or create level
-                level_name = data.get('level')
-                level_obj = None
-                if level_name:
-                    db_print(f"Creating or getting level: {level_name}")
-                    level_obj, level_created = Level.objects.get_or_create(
-                        name=level_name
-                    )
-                    db_print(f"Level: {level_obj.name} ({'created' if level_created else 'existing'})")
-                    self.logger.info(f"Level: {level_obj.name} ({'created' if level_created else 'existing'})")
+                level_obj = self._get_level(data)
 
                 # Create or update creators
-                creators = []
                 db_print(f"Processing {len(data.get('creators', []))} creators")
-                for creator_data in data.get('creators', []):
-                    creator, creator_created = Creator.objects.get_or_create(
-                        platform_id=platform,
-                        platform_creator_id=creator_data['platform_creator_id'],
-                        defaults={
-                            'name': creator_data['name'],
-                            'url': creator_data.get('url'),
-                            'description': creator_data.get('description', ''),
-                            'platform_thumbnail_url': creator_data.get('platform_thumbnail_url')
-                        }
-                    )
-                    creators.append(creator)
-                    db_print(f"Creator: {creator.name} ({'created' if creator_created else 'existing'})")
-                    self.logger.info(f"Creator: {creator.name} ({'created' if creator_created else 'existing'})")
+                creators = self._get_creator_ids(data, platform)
 
                 # Get or create languages
-                languages = []
                 db_print(f"Processing {len(data.get('languages', []))} languages")
-                for lang_code in data.get('languages', []):
-                    lang, lang_created = Language.objects.get_or_create(
-                        iso_code=lang_code,
-                        defaults={'name': lang_code}
-                    )
-                    languages.append(lang)
-                    db_print(f"Language: {lang.iso_code} ({'created' if lang_created else 'existing'})")
-                    self.logger.info(f"Language: {lang.iso_code} ({'created' if lang_created else 'existing'})")
+                languages = self._get_languages(data)
 
                 # Get or create tags
                 db_print(f"Processing {len(data.get('tags', []))} tags")
-                tags = Tag.get_or_create_tags(data.get('tags', []))
+                tags = self._get_tag_ids(data)
                 db_print(f"Created/found {len(tags)} tags")
                 self.logger.info(f"Created/found {len(tags)} tags")
 
                 # Create or update learning resource
                 db_print("About to create or update learning resource")
-                
+
                 # Print key fields for debugging
                 db_print(f"Platform ID: {platform.id}, Platform course ID: {data['platform_course_id']}")
-                
-                resource, created = LearningResource.objects.get_or_create(
+
+                resource, created = LearningResource.objects.update_or_create(
                     platform_id=platform,
                     platform_course_id=data['platform_course_id'],
                     defaults={
-                        'name': data['name'],
-                        'description': data['description'],
-                        'short_description': data.get('short_description', ''),
-                        'url': data['url'],
-                        'platform_thumbnail_url': data.get('platform_thumbnail_url'),
-                        'is_free': data.get('is_free', False),
-                        'is_limited_free': data.get('is_limited_free', False),
-                        'dollar_price': data.get('dollar_price'),
-                        'has_certificate': data.get('has_certificate', False),
-                        'level': level_obj,
-                        'format': format_obj,
-                        'duration_h': data.get('duration_h'),
-                        'platform_reviews_count': data.get('platform_reviews_count'),
-                        'platform_reviews_rating': data.get('platform_reviews_rating'),
-                        'enrollment_count': data.get('enrollment_count'),
-                        'is_active': data.get('is_active', True),
-                        'html_description': data.get('html_description'),
-                        'platform_last_update': data.get('platform_last_update'),
+                        **self._resource_fields(data, format_obj, level_obj),
+                        'content_hash': fingerprint,
                     }
                 )
-                
+
                 db_print(f"Resource {'created' if created else 'updated'} with ID: {resource.id}")
 
                 # Set many-to-many relationships
@@ -240,26 +769,29 @@ class DatabaseSavePipeline:
                 msg = f"{action} learning resource: {data['name']} (Platform: {platform.name}, ID: {data['platform_course_id']})"
                 self.logger.info(msg)
                 db_print(msg)
-                
+
                 # Try to verify that the resource was actually saved
                 verification = LearningResource.objects.filter(
                     platform_id=platform,
                     platform_course_id=data['platform_course_id']
                 ).exists()
-                
+
                 msg = f"Verification of save - resource exists in DB: {verification}"
                 self.logger.info(msg)
                 db_print(msg)
-                
+
                 # Check row count as a sanity check
                 count = LearningResource.objects.count()
                 db_print(f"Total learning resources in database: {count}")
 
+                return self.INSERTED if created else self.UPDATED
+
         except Exception as e:
+            self._reset_caches()
             self.logger.error(f"Error saving learning resource {data.get('name')}: {str(e)}")
             db_print(f"Error saving learning resource {data.get('name')}: {str(e)}", "ERROR")
             import traceback
             trace = traceback.format_exc()
             self.logger.error(f"Full error traceback: {trace}")
             db_print(f"Full error traceback: {trace}", "ERROR")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Optional
+from django.db import close_old_connections, connections
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+from collections import deque
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Tells the writer thread to close its connections and exit
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Run database work on a dedicated writer thread, off the Twisted reactor.
+
+    Work is handed over through a bounded queue and every submission returns a
+    Deferred that fires in the reactor thread with the result. submit never blocks
+    the reactor: when the queue is full the work waits in a backlog, on_full is
+    called (the pipeline pauses the Scrapy engine), and once the backlog is queued
+    and the queue has drained to half its size on_drained is called to resume.
+
+    A single thread keeps writes ordered and lets the pipeline's lookup caches be
+    used without locking. The thread owns its own Django connection, which is
+    recycled between tasks like Django does between requests and closed on stop.
+    Set keep_connection while the connection holds session state (temporary tables).
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10,
+        on_full: Optional[Callable[[], None]] = None,
+        on_drained: Optional[Callable[[], None]] = None
+    ):
+        self.max_queue_size = max(1, max_queue_size)
+        self.tasks = queue.Queue(maxsize=self.max_queue_size)
+        # Work submitted while the queue was full, only touched in the reactor thread
+        self.backlog = deque()
+        self.on_full = on_full
+        self.on_drained = on_drained
+        self.is_full = False
+        self.keep_connection = False
+        self.thread = None
+        self.stopped = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name='database-writer', daemon=True)
+        self.thread.start()
+        logger.info(f"Database writer started with a queue of {self.max_queue_size} tasks")
+
+    def submit(self, func: Callable, *args, **kwargs) -> Deferred:
+        """Queue func to run on the writer thread; the Deferred fires with its result"""
+        deferred = Deferred()
+        self._enqueue((func, args, kwargs, deferred))
+        if not self.is_full and (self.backlog or self.tasks.full()):
+            self.is_full = True
+            if self.on_full is not None:
+                self.on_full()
+        return deferred
+
+    def stop(self) -> Deferred:
+        """Finish the queued work, then stop the thread. The Deferred fires once it has exited."""
+        self.stopped = Deferred()
+        self._enqueue(_STOP)
+        return self.stopped
+
+    def call_in_reactor(self, func: Callable, *args) -> None:
+        """Run func in the reactor thread: handed over from the writer thread, right away elsewhere"""
+        if threading.current_thread() is self.thread:
+            reactor.callFromThread(func, *args)
+        else:
+            func(*args)
+
+    def _enqueue(self, task) -> None:
+        """Queue task without blocking, behind any backlog so work stays in order"""
+        if not self.backlog:
+            try:
+                self.tasks.put_nowait(task)
+                return
+            except queue.Full:
+                pass
+        self.backlog.append(task)
+
+    def _queue_backlog(self) -> None:
+        while self.backlog:
+            try:
+                self.tasks.put_nowait(self.backlog[0])
+            except queue.Full:
+                return
+            self.backlog.popleft()
+
+    def _run(self) -> None:
+        while True:
+            task = self.tasks.get()
+            if task is _STOP:
+                break
+
+            func, args, kwargs, deferred = task
+            # Django drops connections with autocommit off, which would lose a transaction
+            # group the pipeline keeps open across tasks
+            if not self.keep_connection and all(
+                connection.get_autocommit() for connection in connections.all(initialized_only=True)
+            ):
+                close_old_connections()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                reactor.callFromThread(self._complete, deferred, Failure())
+            else:
+                reactor.callFromThread(self._complete, deferred, result)
+
+        # Connections are per thread, so this only closes the writer's own
+        connections.close_all()
+        reactor.callFromThread(self.stopped.callback, None)
+
+    def _complete(self, deferred: Deferred, result: Any) -> None:
+        """Runs in the reactor thread once a task is done"""
+        self._queue_backlog()
+        if self.is_full and not self.backlog and self.tasks.qsize() <= self.max_queue_size // 2:
+            self.is_full = False
+            if self.on_drained is not None:
+                self.on_drained()
+        if isinstance(result, Failure):
+            deferred.errback(result)
+        else:
+            deferred.callback(result)
@@ -1,41 +1,96 @@
-from django.db.models import Q
 from core.models import LearningResource
-from typing import Dict, Any
+from typing import Dict, Any, Set
 from scrapy.exceptions import DropItem
+import sys
 
 class DuplicateFilterPipeline:
     """
     Pipeline to filter out duplicate learning resources based on platform_id and platform_course_id.
+
+    Resources seen earlier in the same crawl are always dropped. Resources that already
+    exist in the database are only dropped when DUPLICATE_FILTER_DROP_EXISTING is set;
+    otherwise they flow on so the save pipeline can update them if their content changed.
+
+    The existing-key index is opt-in with DUPLICATE_FILTER_DROP_EXISTING: the stored keys
+    are then loaded once per platform into memory (at open_spider for the spider's
+    platform) instead of querying the database for every item. Without it the filter
+    never reads the database, so there is nothing to preload.
     """
-    
+
+    def __init__(self, drop_existing: bool = False):
+        self.drop_existing = drop_existing
+        self.seen_keys = set()
+        # platform_id -> platform_course_ids stored in the database
+        self.existing_keys: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(drop_existing=crawler.settings.getbool('DUPLICATE_FILTER_DROP_EXISTING', False))
+
+    def open_spider(self, spider):
+        platform_id = getattr(spider, 'platform_id', None)
+        if self.drop_existing and platform_id:
+            keys = self._load_existing_keys(platform_id)
+            spider.logger.info(f'Loaded {len(keys)} existing course keys for platform {platform_id}')
+            crawler = getattr(spider, 'crawler', None)
+            if crawler is not None:
+                crawler.stats.set_value('duplicate_filter/existing_keys', len(keys), spider=spider)
+
     def process_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
         """
-        Check if the learning resource already exists in the database.
+        Check if the learning resource was already seen in this crawl or exists in the database.
         """
         if item.get('type') != 'learning_resource':
             return item
-            
+
         data = item.get('data', {})
         platform_id = data.get('platform_id')
         platform_course_id = data.get('platform_course_id')
-        
-        if self._check_duplicate(platform_id, platform_course_id):
-            spider.logger.info(
-                f'Dropping duplicate item - Platform: {platform_id}, '
-                f'Course ID: {platform_course_id}'
-            )
-            raise DropItem(
-                f'Duplicate item found for platform {platform_id} '
-                f'and course ID {platform_course_id}'
-            )
-        
-        return item
+        key = (platform_id, platform_course_id)
+
+        if key in self.seen_keys:
+            reason = 'seen'
+        elif self.drop_existing and self._check_duplicate(platform_id, platform_course_id):
+            reason = 'existing'
+        else:
+            self.seen_keys.add(self._intern_key(platform_id, platform_course_id))
+            return item
+
+        crawler = getattr(spider, 'crawler', None)
+        if crawler is not None:
+            crawler.stats.inc_value(f'duplicate_filter/dropped/{reason}', spider=spider)
+        spider.logger.info(
+            f'Dropping duplicate item - Platform: {platform_id}, '
+            f'Course ID: {platform_course_id}'
+        )
+        raise DropItem(
+            f'Duplicate item found for platform {platform_id} '
+            f'and course ID {platform_course_id}'
+        )
+
+    def _intern_key(self, platform_id: Any, platform_course_id: Any) -> tuple:
+        """Share the key strings between the crawl-scoped and the preloaded keys"""
+        if isinstance(platform_id, str):
+            platform_id = sys.intern(platform_id)
+        if isinstance(platform_course_id, str):
+            platform_course_id = sys.intern(platform_course_id)
+        return (platform_id, platform_course_id)
+
+    def _load_existing_keys(self, platform_id: str) -> Set[str]:
+        """Fetch every stored platform_course_id of a platform with a single query, once per crawl"""
+        keys = self.existing_keys.get(platform_id)
+        if keys is None:
+            keys = {
+                sys.intern(platform_course_id)
+                for platform_course_id in LearningResource.objects.filter(
+                    platform_id=platform_id
+                ).values_list('platform_course_id', flat=True).iterator(chunk_size=5000)
+            }
+            self.existing_keys[platform_id] = keys
+        return keys
 
     def _check_duplicate(self, platform_id: str, platform_course_id: str) -> bool:
         """
         Check for duplicates in the database.
         """
-        return LearningResource.objects.filter(
-            Q(platform_id__name=platform_id) & 
-            Q(platform_course_id=platform_course_id)
-        ).exists()
+        return str(platform_course_id) in self._load_existing_keys(platform_id)
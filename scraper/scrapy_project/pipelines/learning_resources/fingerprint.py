@@ -0,0 +1,74 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+from core.models import Tag
+import hashlib
+import json
+
+# Item fields that make up a learning resource's content; bookkeeping fields such
+# as scraped_timestamp are left out so an unchanged course always hashes the same
+FINGERPRINT_FIELDS = [
+    'name',
+    'url',
+    'description',
+    'short_description',
+    'html_description',
+    'is_free',
+    'is_limited_free',
+    'has_certificate',
+    'format',
+    'level',
+    'platform_reviews_count',
+    'enrollment_count',
+    'is_active',
+    'platform_thumbnail_url',
+]
+
+DECIMAL_FIELDS = ['dollar_price', 'duration_h', 'platform_reviews_rating']
+
+CREATOR_FIELDS = ['platform_creator_id', 'name', 'url', 'platform_thumbnail_url']
+
+
+def _normalise_decimal(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        return str(Decimal(str(value)).quantize(Decimal('.01')))
+    except InvalidOperation:
+        return str(value)
+
+
+def _normalise_datetime(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value) if value is not None else None
+
+
+def _normalise_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    return str(value)
+
+
+def content_fingerprint(data: Dict[str, Any]) -> str:
+    """
+    Return a stable SHA-256 hash of a learning resource's normalised content.
+
+    Covers the text, price, rating, enrollment, languages, tags and creators of the
+    item. Lists are sorted and numbers normalised so that re-crawling an unchanged
+    course produces the same hash regardless of ordering or number formatting.
+    """
+    normalised = {field: _normalise_value(data.get(field)) for field in FINGERPRINT_FIELDS}
+    normalised.update({field: _normalise_decimal(data.get(field)) for field in DECIMAL_FIELDS})
+    normalised['platform_last_update'] = _normalise_datetime(data.get('platform_last_update'))
+    normalised['languages'] = sorted(set(data.get('languages') or []))
+    normalised['tags'] = sorted({
+        Tag.clean_tag_name(tag) for tag in data.get('tags') or [] if tag and tag.strip()
+    })
+    normalised['creators'] = sorted((
+        [_normalise_value(creator.get(field)) for field in CREATOR_FIELDS]
+        for creator in data.get('creators') or []
+    ), key=str)
+
+    payload = json.dumps(normalised, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,90 @@
+from typing import Any, Callable, Dict, Optional, Type
+from django.db import models
+from core.models import Platform, Format, Level, Language
+from core.utils import platform_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LookupCache:
+    """
+    In-process cache for a small dimension table keyed on a single column.
+
+    The whole table is read once and lookups are served from memory; only a
+    key that has not been seen yet goes to the database.
+    """
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        key_field: str,
+        defaults: Optional[Callable[[Any], Dict[str, Any]]] = None
+    ):
+        self.model = model
+        self.key_field = key_field
+        self.defaults = defaults or (lambda key: {})
+        self.entries: Dict[Any, models.Model] = {}
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self.model.__name__.lower()
+
+    def load(self) -> None:
+        """(Re)load every row of the table into memory"""
+        self.entries = {
+            getattr(obj, self.key_field): obj
+            for obj in self.model.objects.all()
+        }
+        self.loaded = True
+        logger.info(f"Loaded {len(self.entries)} {self.model.__name__} rows into the lookup cache")
+
+    def get(self, key: Any) -> models.Model:
+        """Return the row for key, creating it on a cache miss"""
+        if not self.loaded:
+            self.load()
+
+        obj = self.entries.get(key)
+        if obj is not None:
+            self.hits += 1
+            return obj
+
+        self.misses += 1
+        obj, created = self.model.objects.get_or_create(
+            **{self.key_field: key},
+            defaults=self.defaults(key)
+        )
+        logger.debug(f"{self.model.__name__} cache miss: {key} ({'created' if created else 'existing'})")
+        self.entries[key] = obj
+        return obj
+
+
+class LookupCaches:
+    """Lookup caches for the dimension tables every learning resource references"""
+
+    def __init__(self):
+        # Platforms are keyed on their primary key so a crawl can never create duplicates
+        self.platforms = LookupCache(
+            Platform,
+            'id',
+            lambda platform_id: {'name': platform_name(platform_id)}
+        )
+        self.formats = LookupCache(Format, 'name')
+        self.levels = LookupCache(Level, 'name')
+        self.languages = LookupCache(Language, 'iso_code', lambda iso_code: {'name': iso_code})
+
+    def __iter__(self):
+        return iter([self.platforms, self.formats, self.levels, self.languages])
+
+    def load(self) -> None:
+        for cache in self:
+            cache.load()
+
+    def report_stats(self, stats, spider) -> None:
+        """Write hit/miss counters into the crawl stats"""
+        for cache in self:
+            stats.set_value(f'database_save/lookup_cache/{cache.name}/hits', cache.hits, spider=spider)
+            stats.set_value(f'database_save/lookup_cache/{cache.name}/misses', cache.misses, spider=spider)
@@ -1,18 +1,41 @@
 import os
-import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from datetime import datetime
 from decimal import Decimal
 from pydantic import HttpUrl, AnyUrl
+from .segments import SegmentWriter
 
 class BaseTempSavePipeline(ABC):
-    """Base class for temporary JSON save pipelines"""
+    """
+    Base class for temporary save pipelines.
+
+    Items are appended to one set of compressed JSON-lines segments per execution,
+    in <subfolder>/execution_<id>/, with a sidecar index for random access by key.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_records: int = 50000,
+        block_records: int = 100
+    ):
         self.base_path = os.path.join(os.path.dirname(__file__), 'data')
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_records = max_segment_records
+        self.block_records = block_records
+        self.writer = None
         self._ensure_directories()
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            max_segment_bytes=settings.getint('TEMP_SAVE_SEGMENT_MAX_BYTES', 64 * 1024 * 1024),
+            max_segment_records=settings.getint('TEMP_SAVE_SEGMENT_MAX_RECORDS', 50000),
+            block_records=settings.getint('TEMP_SAVE_BLOCK_RECORDS', 100),
+        )
+
     @property
     @abstractmethod
     def subfolder(self) -> str:
@@ -24,10 +47,30 @@ class BaseTempSavePipeline(ABC):
         save_path = os.path.join(self.base_path, self.subfolder)
         os.makedirs(save_path, exist_ok=True)
 
-    def _generate_filename(self, item: Dict[str, Any]) -> str:
-        """Generate a unique filename for the item"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        return f"{timestamp}.json"
+    def _segment_set_name(self, spider: Any) -> str:
+        """Name the segment set after the execution, or the spider and start time outside one"""
+        execution_id = getattr(spider, 'execution_id', None)
+        if execution_id is not None:
+            # Shards of one execution run in parallel, so each writes a segment set of its own
+            if int(getattr(spider, 'shards', 1) or 1) > 1:
+                return f"execution_{execution_id}_shard{spider.shard}"
+            return f"execution_{execution_id}"
+        return f"{spider.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    def open_spider(self, spider: Any) -> None:
+        directory = os.path.join(self.base_path, self.subfolder, self._segment_set_name(spider))
+        self.writer = SegmentWriter(
+            directory,
+            max_segment_bytes=self.max_segment_bytes,
+            max_segment_records=self.max_segment_records,
+            block_records=self.block_records,
+            default=self._json_serializer,
+        )
+
+    def close_spider(self, spider: Any) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
 
     def _json_serializer(self, obj: Any) -> Any:
         """Custom JSON serializer for objects not serializable by default json code"""
@@ -39,13 +82,10 @@ class BaseTempSavePipeline(ABC):
             return obj.isoformat()
         raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
 
-    def _save_to_json(self, item: Dict[str, Any]) -> None:
-        """Save the item to a JSON file"""
-        filename = self._generate_filename(item)
-        file_path = os.path.join(self.base_path, self.subfolder, filename)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(item['data'], f, 
-                     default=self._json_serializer,
-                     ensure_ascii=False, 
-                     indent=2) 
\ No newline at end of file
+    def _record_key(self, item: Dict[str, Any]) -> Optional[str]:
+        """Key the record is indexed under, None to leave it out of the index"""
+        return None
+
+    def _save_record(self, item: Dict[str, Any]) -> None:
+        """Append the item data to the current segment"""
+        self.writer.write(item['data'], key=self._record_key(item))
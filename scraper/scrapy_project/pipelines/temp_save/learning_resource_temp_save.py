@@ -1,22 +1,25 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from .base_temp_save import BaseTempSavePipeline
 import logging
 
 class LearningResourceTempSavePipeline(BaseTempSavePipeline):
-    """Pipeline to temporarily save learning resource data to JSON files"""
+    """Pipeline to temporarily save learning resource data to compressed JSON-lines segments"""
     
     @property
     def subfolder(self) -> str:
-        return 'learning_resource_jsons'
+        return 'learning_resource_segments'
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.logger = logging.getLogger(__name__)
         self.logger.info("LearningResourceTempSavePipeline initialized")
 
+    def _record_key(self, item: Dict[str, Any]) -> Optional[str]:
+        return item['data'].get('platform_course_id')
+
     def process_item(self, item: Dict[str, Any], spider: Any) -> Dict[str, Any]:
         self.logger.info(f"Processing item: {item.get('type')}")
         if 'type' in item and item['type'] == 'learning_resource':
             self.logger.info("Saving learning resource")
-            self._save_to_json(item)
+            self._save_record(item)
         return item 
\ No newline at end of file
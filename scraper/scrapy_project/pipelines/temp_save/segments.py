@@ -0,0 +1,151 @@
+import gzip
+import json
+import os
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jl.gz'
+INDEX_FILENAME = 'index.jsonl'
+
+
+def is_segment_directory(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, INDEX_FILENAME))
+
+
+def segment_files(directory: str) -> List[str]:
+    """The segments of a segment set in write order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+class SegmentWriter:
+    """
+    Append-only writer for a set of compressed JSON-lines segments.
+
+    Records are buffered and written as blocks, each an independent gzip member, so a
+    segment is still a plain .jl.gz file for sequential reads while any block can be
+    decompressed on its own. A segment is closed and the next one started once it
+    reaches max_segment_bytes (compressed) or max_segment_records.
+
+    The sidecar index.jsonl gets one line per record, written with its block:
+    {"key": ..., "segment": ..., "offset": <block offset>, "line": <line in block>}.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_records: int = 50000,
+        block_records: int = 100,
+        default: Optional[Callable[[Any], Any]] = None
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_records = max_segment_records
+        self.block_records = max(1, block_records)
+        self.default = default
+        self.block: List[Tuple[Optional[str], str]] = []
+        self.segment_number = -1
+        self.segment = None
+        self.segment_records = 0
+        self.records = 0
+        os.makedirs(directory, exist_ok=True)
+        self.index = open(os.path.join(directory, INDEX_FILENAME), 'a', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any], key: Optional[str] = None) -> None:
+        line = json.dumps(record, default=self.default, ensure_ascii=False, separators=(',', ':'))
+        self.block.append((key, line))
+        self.records += 1
+        if len(self.block) >= self.block_records:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records as one compressed block"""
+        if not self.block:
+            return
+        if self.segment is None or self._segment_is_full():
+            self._rotate()
+
+        offset = self.segment.tell()
+        payload = ''.join(line + '\n' for _, line in self.block).encode('utf-8')
+        self.segment.write(gzip.compress(payload))
+        self.segment.flush()
+
+        segment_name = os.path.basename(self.segment.name)
+        for line_number, (key, _) in enumerate(self.block):
+            if key is not None:
+                self.index.write(json.dumps(
+                    {'key': key, 'segment': segment_name, 'offset': offset, 'line': line_number}
+                ) + '\n')
+        self.index.flush()
+        self.segment_records += len(self.block)
+        self.block = []
+
+    def _segment_is_full(self) -> bool:
+        return (
+            self.segment.tell() >= self.max_segment_bytes
+            or self.segment_records >= self.max_segment_records
+        )
+
+    def _rotate(self) -> None:
+        if self.segment is not None:
+            self.segment.close()
+        self.segment_number += 1
+        self.segment_records = 0
+        name = f'{SEGMENT_PREFIX}{self.segment_number:05d}{SEGMENT_SUFFIX}'
+        self.segment = open(os.path.join(self.directory, name), 'ab')
+
+    def close(self) -> None:
+        self.flush()
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
+        self.index.close()
+
+
+class SegmentReader:
+    """Read a segment set sequentially, or single records through the sidecar index"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._index = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in segment_files(self.directory):
+            with gzip.open(path, 'rt', encoding='utf-8') as segment:
+                for line in segment:
+                    if line.strip():
+                        yield json.loads(line)
+
+    @property
+    def index(self) -> Dict[str, Tuple[str, int, int]]:
+        if self._index is None:
+            self._index = {}
+            with open(os.path.join(self.directory, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    # A key written twice resolves to its latest record
+                    self._index[entry['key']] = (entry['segment'], entry['offset'], entry['line'])
+        return self._index
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Decompress only the block holding key's record"""
+        location = self.index.get(key)
+        if location is None:
+            return None
+        segment_name, offset, line_number = location
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        chunks = []
+        with open(os.path.join(self.directory, segment_name), 'rb') as segment:
+            segment.seek(offset)
+            while not decompressor.eof:
+                data = segment.read(64 * 1024)
+                if not data:
+                    break
+                chunks.append(decompressor.decompress(data))
+        # Records are separated by '\n' only, str.splitlines would also split on U+2028 etc. inside values
+        lines = b''.join(chunks).split(b'\n')
+        return json.loads(lines[line_number])
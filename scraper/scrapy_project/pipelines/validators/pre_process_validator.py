@@ -1,17 +1,23 @@
 from typing import Any, Dict
-from ...validators import LearningResourceInput
+from ...validation import validate_resource, validated_text
 from .base_validator import BaseValidatorPipeline
 
 class PreProcessValidatorPipeline(BaseValidatorPipeline):
-    """Pipeline to validate incoming learning resource data using LearningResourceInput model"""
+    """
+    Pipeline to validate incoming learning resource data in a single pass.
+
+    The validated text fields are kept on the item as plain data so DatabaseValidatorPipeline
+    only has to re-check the ones later stages rewrote.
+    """
     
     def process_item(self, item: Dict[str, Any], spider: Any) -> Dict[str, Any]:
         if 'type' not in item or item['type'] != 'learning_resource':
             return item
             
         try:
-            validated_resource = LearningResourceInput(**item['data'])
-            item['data'] = validated_resource.model_dump()
-            return item
+            validated_resource = validate_resource(item['data'])
         except Exception as e:
-            self._handle_validation_error(e, "learning resource") 
\ No newline at end of file
+            self._handle_validation_error(e, "learning resource")
+        item['validated_text'] = validated_text(validated_resource)
+        item['data'] = validated_resource.model_dump()
+        return item
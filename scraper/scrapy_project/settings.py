@@ -61,7 +61,7 @@ ROBOTSTXT_OBEY = False
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
-DOWNLOAD_DELAY = 1  # 1 second delay between requests
+DOWNLOAD_DELAY = 1  # Starting delay between requests to a domain, adapted by AdaptiveConcurrency
 RANDOMIZE_DOWNLOAD_DELAY = True  # Adds some randomization to be more polite
 # The download delay setting will honor only one of:
 #CONCURRENT_REQUESTS_PER_DOMAIN = 16
@@ -85,21 +85,52 @@ RANDOMIZE_DOWNLOAD_DELAY = True  # Adds some randomization to be more polite
 #    "scrapy_project.middlewares.ScrapyProjectSpiderMiddleware": 543,
 #}
 
+# Sharded crawls (set SHARDED_CRAWL_SHARDS in a Spider row's settings to have scraper.tasks
+# run it that way; SpiderExecutor then adds ShardedCrawlMiddleware to SPIDER_MIDDLEWARES):
+# shards share a page queue and dedupe set in Redis, taking SHARDED_CRAWL_BATCH_SIZE pages
+# at a time. Keys expire SHARDED_CRAWL_KEY_TTL seconds after the last push
+SHARDED_CRAWL_REDIS_URL = os.getenv('SHARDED_CRAWL_REDIS_URL', 'redis://localhost:6379/1')
+SHARDED_CRAWL_BATCH_SIZE = 100
+SHARDED_CRAWL_MAX_IDLE_SECONDS = 300
+SHARDED_CRAWL_KEY_TTL = 24 * 3600
+
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "scrapy_project.middlewares.ScrapyProjectDownloaderMiddleware": 543,
-#}
+DOWNLOADER_MIDDLEWARES = {
+    "scraper.scrapy_project.middlewares.ScrapyProjectDownloaderMiddleware": 543,
+}
+
+# Conditional requests (ScrapyProjectDownloaderMiddleware): ETag / Last-Modified of every page
+# are kept in the HttpValidator table and unchanged pages come back as a 304 that is dropped.
+# Validators are written in bulk every CONDITIONAL_REQUESTS_FLUSH_SIZE changes
+CONDITIONAL_REQUESTS_ENABLED = True
+CONDITIONAL_REQUESTS_FLUSH_SIZE = 500
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
+# CoreStats stays enabled: Execution reads item_scraped_count, finish_reason and elapsed_time_seconds from it
 EXTENSIONS = {
     'scrapy.extensions.telnet.TelnetConsole': None,
     'scrapy.extensions.memusage.MemoryUsage': None,
-    'scrapy.extensions.corestats.CoreStats': None,
     'scrapy.extensions.logstats.LogStats': None,
+    'scraper.scrapy_project.extensions.AdaptiveConcurrency': 500,
 }
 
+# AdaptiveConcurrency tunes each domain's concurrency and delay from latency, errors and
+# 429/503 + Retry-After, between these floors and ceilings. Override them per spider in the
+# Spider row's settings (spider custom_settings would take precedence over the row)
+ADAPTIVE_CONCURRENCY_ENABLED = True
+ADAPTIVE_CONCURRENCY_MIN = 1
+ADAPTIVE_CONCURRENCY_MAX = 8
+ADAPTIVE_CONCURRENCY_MIN_DELAY = 0.25
+ADAPTIVE_CONCURRENCY_MAX_DELAY = 60
+# Average response time above which a domain gets one request fewer
+ADAPTIVE_CONCURRENCY_TARGET_LATENCY = 2.0
+# Downloads per adjustment, and the share of 5xx responses and failed downloads (timeouts,
+# refused connections) in them that triggers a backoff
+ADAPTIVE_CONCURRENCY_WINDOW = 20
+ADAPTIVE_CONCURRENCY_MAX_ERROR_RATE = 0.1
+
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 #ITEM_PIPELINES = {
@@ -125,7 +156,18 @@ EXTENSIONS = {
 #HTTPCACHE_EXPIRATION_SECS = 0
 #HTTPCACHE_DIR = "httpcache"
 #HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+
+# To record a crawl for offline replays, run it once with:
+#   HTTPCACHE_ENABLED = True, HTTPCACHE_SQLITE_MODE = "record",
+#   SITEMAP_FRONTIER_FORCE_REFRESH = True, CONDITIONAL_REQUESTS_ENABLED = False
+# (so every page is downloaded in full), then replay it with the same settings and
+# HTTPCACHE_SQLITE_MODE = "replay".
+# Responses are kept compressed in <HTTPCACHE_DIR>/<spider>.sqlite3; "zstd" needs zstandard
+HTTPCACHE_STORAGE = "scraper.scrapy_project.httpcache.SqliteCacheStorage"
+HTTPCACHE_SQLITE_MODE = "cache"
+HTTPCACHE_SQLITE_COMPRESSION = "gzip"
+HTTPCACHE_SQLITE_COMPRESSION_LEVEL = 6
+HTTPCACHE_SQLITE_COMMIT_EVERY = 100
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"
@@ -148,13 +190,55 @@ ITEM_PIPELINES = {
     'scraper.scrapy_project.pipelines.learning_resources.database_save.DatabaseSavePipeline': 950,
 }
 
+# Database save settings
+# 'item' writes every resource in its own transaction, 'batch' buffers resources
+# and upserts them in bulk keyed on (platform, platform_course_id). 'batch' is much
+# faster for full crawls; set it per spider in the Spider row's settings
+DATABASE_SAVE_MODE = 'item'
+DATABASE_SAVE_BATCH_SIZE = 100  # Flush once this many resources are buffered
+DATABASE_SAVE_BATCH_TIMEOUT = 30  # ... or once the oldest buffered resource is this many seconds old
+# Database work runs on a dedicated writer thread instead of the reactor thread.
+# The crawl pauses while this many writes (batches in 'batch' mode) are queued; 0 writes inline
+DATABASE_WRITER_QUEUE_SIZE = 0
+# In 'item' mode, commit every this many resources (or this many seconds) instead of once
+# per resource. Each resource is saved in a savepoint, so a failing one is rolled back and
+# dropped alone and listed under database_save/failed_items. 1 commits every resource.
+# Not used in 'batch'/'copy' mode, where each batch is one transaction; a spider that sets
+# it anyway gets a warning
+DATABASE_SAVE_TRANSACTION_SIZE = 1
+DATABASE_SAVE_TRANSACTION_TIMEOUT = 10
+
+# Drop resources that already exist in the database instead of letting the save
+# pipeline compare content hashes and update the ones that changed. Turns on the
+# duplicate filter's preloaded key index (one query per platform at open_spider);
+# meant for add-only crawls, enable it in the Spider row's settings
+DUPLICATE_FILTER_DROP_EXISTING = False
+
+# Incremental crawling: sitemap spiders record each URL's <lastmod> and on later runs only
+# request URLs that are new or whose lastmod advanced. Force a full refresh with this setting
+# or -a force_refresh=1; URLs last fetched more than SITEMAP_FRONTIER_MAX_AGE_DAYS ago are
+# requested regardless of lastmod (0 disables)
+SITEMAP_FRONTIER_ENABLED = True
+SITEMAP_FRONTIER_FORCE_REFRESH = False
+SITEMAP_FRONTIER_MAX_AGE_DAYS = 30
+
+# page-data.json responses up to this size are parsed whole with orjson; in larger ones only
+# the subtree a spider reads is located and decoded (see scraper.scrapy_project.page_data)
+PAGE_DATA_FULL_PARSE_BYTES = 256 * 1024
+
+# LearningResourceTempSavePipeline writes one set of gzip JSON-lines segments per execution.
+# A segment is closed at this compressed size or record count; records are compressed in blocks
+TEMP_SAVE_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+TEMP_SAVE_SEGMENT_MAX_RECORDS = 50000
+TEMP_SAVE_BLOCK_RECORDS = 100
+
 # Reactor and Threading Settings
 TWISTED_REACTOR = None  # Let Crochet choose the reactor
 REACTOR_THREADPOOL_MAXSIZE = 1
 TWISTED_REACTOR_MANAGE = False  # Let Crochet handle the reactor lifecycle
-CONCURRENT_REQUESTS = 1  # Reduce concurrent requests to minimum
-CONCURRENT_REQUESTS_PER_DOMAIN = 1
-CONCURRENT_REQUESTS_PER_IP = 1
+CONCURRENT_REQUESTS = 16  # Overall cap; each domain's share is set by AdaptiveConcurrency
+CONCURRENT_REQUESTS_PER_DOMAIN = 2  # Starting concurrency of a domain
+CONCURRENT_REQUESTS_PER_IP = 0  # Slots per domain, as AdaptiveConcurrency expects
 
 # Disable features that might interfere with Crochet
 TELNETCONSOLE_ENABLED = False
@@ -173,7 +257,24 @@ FEEDS = {
         'format': 'jsonlines',
         'encoding': 'utf-8',
         'overwrite': True,
-    }
+        # Bytes of encoded items collected before each write to the feed file
+        'item_export_kwargs': {'buffer_size': 1024 * 1024},
+        # For a compressed feed, name it %(name)s.jl.gz and add:
+        # 'postprocessing': ['scrapy.extensions.postprocessing.GzipPlugin'],
+        # 'gzip_compresslevel': 5,
+    },
+    # Columnar copy of each execution for analytics, needs pyarrow (pip install swotting[parquet]):
+    # 'exports/%(name)s_%(execution_id)s.parquet': {
+    #     'format': 'parquet',
+    #     'overwrite': True,
+    #     'item_export_kwargs': {'row_group_size': 10000, 'compression': 'zstd'},
+    # },
+}
+
+# JSON lines feeds are encoded with orjson, see FastJsonLinesItemExporter; parquet feeds need pyarrow
+FEED_EXPORTERS = {
+    'jsonlines': 'scraper.scrapy_project.exporters.FastJsonLinesItemExporter',
+    'parquet': 'scraper.scrapy_project.exporters.ParquetItemExporter',
 }
 
 # Configure cleanup and shutdown
@@ -0,0 +1,73 @@
+import zlib
+from typing import Any, Dict, Iterable, List
+import orjson
+
+
+class SharedCrawlQueue:
+    """
+    Request queue, dedupe set and idle shards of one sharded execution, kept in Redis so
+    every shard of the execution sees them.
+
+    Keys live under swotting:crawl:<execution_id>: and expire ttl seconds after the last push,
+    so an execution that never finishes doesn't leave them behind.
+    """
+
+    def __init__(self, client, execution_id: int, shards: int, ttl: int = 24 * 3600):
+        self.client = client
+        self.shards = shards
+        self.ttl = ttl
+        prefix = f'swotting:crawl:{execution_id}'
+        self.queue_key = f'{prefix}:queue'
+        self.seen_key = f'{prefix}:seen'
+        self.idle_key = f'{prefix}:idle'
+
+    @classmethod
+    def from_url(cls, url: str, execution_id: int, shards: int, ttl: int = 24 * 3600) -> 'SharedCrawlQueue':
+        import redis
+        return cls(redis.Redis.from_url(url), execution_id, shards, ttl)
+
+    def owner(self, url: str) -> int:
+        """The shard a URL belongs to, stable across processes"""
+        return zlib.crc32(url.encode('utf-8')) % self.shards
+
+    def push(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Queue entries whose url wasn't seen before in the execution; returns how many were queued"""
+        entries = list(entries)
+        if not entries:
+            return 0
+        pipe = self.client.pipeline(transaction=False)
+        for entry in entries:
+            pipe.sadd(self.seen_key, entry['url'])
+        added = pipe.execute()
+        new = [orjson.dumps(entry) for entry, is_new in zip(entries, added) if is_new]
+
+        pipe = self.client.pipeline(transaction=False)
+        if new:
+            pipe.lpush(self.queue_key, *new)
+        for key in (self.queue_key, self.seen_key, self.idle_key):
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+        return len(new)
+
+    def claim(self, shard: int, count: int) -> List[Dict[str, Any]]:
+        """Take up to count entries; the shard stops counting as idle before it looks"""
+        # LRANGE + LTRIM in one MULTI rather than RPOP with a count, which needs Redis 6.2
+        pipe = self.client.pipeline()
+        pipe.srem(self.idle_key, shard)
+        pipe.lrange(self.queue_key, -count, -1)
+        pipe.ltrim(self.queue_key, 0, -count - 1)
+        _, entries, _ = pipe.execute()
+        # Entries are pushed on the left, so the oldest is last
+        return [orjson.loads(entry) for entry in reversed(entries)]
+
+    def park(self, shard: int) -> bool:
+        """Mark the shard idle; True once every shard is idle and the queue is empty"""
+        pipe = self.client.pipeline()
+        pipe.sadd(self.idle_key, shard)
+        pipe.scard(self.idle_key)
+        pipe.llen(self.queue_key)
+        _, idle, queued = pipe.execute()
+        return idle >= self.shards and queued == 0
+
+    def clear(self) -> None:
+        self.client.delete(self.queue_key, self.seen_key, self.idle_key)
@@ -1,5 +1,7 @@
 import scrapy
+from datetime import timedelta
 from scrapy import signals
+from scrapy.spiders import SitemapSpider
 
 
 class BaseSpider(scrapy.Spider):
@@ -8,16 +10,62 @@ class BaseSpider(scrapy.Spider):
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
         spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_opened, signals.spider_opened)
         crawler.signals.connect(spider.spider_closed, signals.spider_closed)
+        spider._setup_frontier(crawler.settings)
         return spider
 
     def __init__(self, platform_id, *args, **kwargs):
         super(BaseSpider, self).__init__(*args, **kwargs)
         self.platform_id = platform_id
+        self.frontier = None
+
+    def _setup_frontier(self, settings):
+        """Sitemap spiders only request URLs whose lastmod advanced since they were last fetched"""
+        if not isinstance(self, SitemapSpider) or not settings.getbool('SITEMAP_FRONTIER_ENABLED'):
+            return
+        # Imported here so spiders without a sitemap don't need the Django models
+        from scraper.scrapy_project.frontier import SitemapFrontier
+
+        # -a force_refresh=1 on a single run, or the setting for a site with unreliable lastmod
+        force_refresh = settings.getbool('SITEMAP_FRONTIER_FORCE_REFRESH') or str(
+            getattr(self, 'force_refresh', '')
+        ).lower() in ('1', 'true', 'yes')
+        max_age_days = settings.getfloat('SITEMAP_FRONTIER_MAX_AGE_DAYS', 0)
+        self.frontier = SitemapFrontier(
+            self.platform_id,
+            force_refresh=force_refresh,
+            max_age=timedelta(days=max_age_days) if max_age_days > 0 else None,
+        )
+
+    def spider_opened(self, spider):
+        if self.frontier is not None:
+            self.frontier.load()
+            self.logger.info(
+                f"Sitemap frontier loaded {len(self.frontier.known)} URLs "
+                f"(force_refresh={self.frontier.force_refresh}, max_age={self.frontier.max_age})"
+            )
 
     def spider_closed(self, spider):
         """Cleanup method called when spider is closed"""
         self.logger.info('Spider closed: %s', spider.name)
+        if self.frontier is not None:
+            saved = self.frontier.save()
+            self.logger.info(f"Sitemap frontier recorded {saved} fetched URLs")
+            self.frontier.report_stats(self.crawler.stats, spider)
+
+    def should_fetch(self, url, lastmod=None):
+        """Whether a sitemap URL needs requesting this run, see SitemapFrontier"""
+        return self.frontier is None or self.frontier.should_fetch(url, lastmod)
+
+    def mark_fetched(self, response):
+        """
+        Call once a response is parsed so its lastmod is recorded in the frontier.
+        Takes the request instead for pages that weren't downloaded because they hadn't changed.
+        """
+        if self.frontier is not None:
+            # The URL that was requested, before any redirects
+            self.frontier.mark_fetched(response.meta.get('redirect_urls', [response.url])[0])
 
     def start_requests(self):
         # Implement the logic to start scraping
@@ -25,4 +73,4 @@ class BaseSpider(scrapy.Spider):
 
     def parse(self, response):
         # Implement the parsing logic
-        pass
\ No newline at end of file
+        pass
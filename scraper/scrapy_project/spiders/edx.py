@@ -1,10 +1,13 @@
 import re
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 from urllib.parse import parse_qs, urlparse
 from uuid import uuid4
-import bs4
 from scrapy.spiders import SitemapSpider
 from scraper.scrapy_project.spiders.base_scraper import BaseSpider
+from scraper.scrapy_project.html_processing import process_html
+from scraper.scrapy_project.page_data import get_path, load_subtree
 import logging
 import os
 
@@ -24,8 +27,8 @@ class EdxSpider(SitemapSpider, BaseSpider):
     base_url = 'https://www.edx.org'
     sitemap_urls = [base_url + '/sitemap.xml']
     custom_settings = {
-        'CONCURRENT_REQUESTS': 4,  # Reduced from 8 for more stability
-        'DOWNLOAD_DELAY': 2,
+        # Concurrency and delay are tuned by AdaptiveConcurrency; set ADAPTIVE_CONCURRENCY_*
+        # in the Spider row's settings to change edX's floor and ceiling
         'RANDOMIZE_DOWNLOAD_DELAY': True,
         'LOG_LEVEL': 'DEBUG',  # Ensure detailed logging
         'CLOSESPIDER_ERRORCOUNT': 5,  # Allow more errors before stopping
@@ -42,6 +45,29 @@ class EdxSpider(SitemapSpider, BaseSpider):
     IS_LIMITED_FREE = True
     LANGUAGE = ['en']
     FORMAT = "Video"
+
+    # Course pages; sitemap_filter runs these once per sitemap entry, so they are compiled here
+    COURSE_URL_PATTERN = re.compile(rf'^{re.escape(base_url)}/learn/[^/]+/[^/]+$')
+    ALTERNATIVE_URL_PATTERNS = {
+        'course': re.compile(r'/course/'),
+        'professional-certificate': re.compile(r'/professional-certificate/'),
+        'xseries': re.compile(r'/xseries/'),
+        'micromasters': re.compile(r'/micromasters/'),
+        'deep-learn-path': re.compile(r'/learn/.+/.+/.+'),  # Deeper learn paths
+    }
+    SITEMAP_LOC_PATTERN = re.compile(rb'<loc>([^<]+)</loc>')
+
+    # Gatsby's page-data.json wraps the course in page context parse never reads
+    COURSE_PATH = ('result', 'pageContext', 'course')
+    # Item fields copied from the course as they are, with their path in it
+    COURSE_FIELDS = (
+        ('name', ('title',)),
+        ('platform_course_id', ('uuid',)),
+        ('platform_last_update', ('updatedAt',)),
+        ('platform_thumbnail_url', ('originalImage', 'src')),
+        ('platform_reviews_count', ('courseReview', 'reviewCount')),
+        ('enrollment_count', ('enrollmentCount',)),
+    )
     
     def __init__(self, *args, **kwargs):
         # Set default platform_id if not provided
@@ -56,6 +82,8 @@ class EdxSpider(SitemapSpider, BaseSpider):
         self.requests_made = 0
         self.successful_parses = 0
         self.sitemap_files_processed = 0
+        self.url_patterns = Counter()
+        self.alternative_matches = Counter()
         
         self.logger.info(f"EdxSpider initialized with TESTING={self.TESTING}, TEST_LIMIT={self.TEST_LIMIT}")
         
@@ -64,78 +92,63 @@ class EdxSpider(SitemapSpider, BaseSpider):
         self.logger.debug(f"Spider init - DATABASE_URL environment: {db_url}")
 
     def sitemap_filter(self, entries):
+        """
+        Yield the course entries of a sitemap as they are parsed, in a single pass.
+        The URL pattern diagnostics are only counted here and logged when the spider closes.
+        """
         count = 0
-        total_entries = list(entries)
-        self.sitemap_urls_found = len(total_entries)
-        
-        self.logger.info(f"Sitemap filter received {self.sitemap_urls_found} entries. Testing mode: {self.TESTING}")
-        
-        # Analyze URL patterns but log only at debug level
-        url_patterns = {}
-        for entry in total_entries:
+        seen = 0
+        for entry in entries:
+            seen += 1
+            self.sitemap_urls_found += 1
             url = entry['loc']
-            parts = url.replace(self.base_url, '').strip('/').split('/')
-            if len(parts) >= 1:
-                pattern = '/'.join(parts[:min(3, len(parts))])
-                url_patterns[pattern] = url_patterns.get(pattern, 0) + 1
-        
-        # Log URL patterns at debug level only
-        self.logger.debug(f"URL patterns found in sitemap:")
-        for pattern, count in sorted(url_patterns.items(), key=lambda x: x[1], reverse=True)[:5]:  # Only log top 5
-            self.logger.debug(f"  - Pattern: {pattern}, Count: {count}")
-            
-        # Move detailed alternative pattern analysis to debug level
-        potential_course_urls = 0
-        current_pattern = rf'^{re.escape(self.base_url)}/learn/[^/]+/[^/]+$'
-        
-        alternative_patterns = [
-            r'/course/',
-            r'/professional-certificate/',
-            r'/xseries/',
-            r'/micromasters/',
-            r'/learn/.+/.+/.+',  # Deeper learn paths
-        ]
-        
-        alternative_matches = {pattern: 0 for pattern in alternative_patterns}
-        
-        for entry in total_entries:
-            url = entry['loc']
-            
-            if not re.match(current_pattern, url):
-                for pattern in alternative_patterns:
-                    if re.search(pattern, url):
-                        # Remove individual URL logging
-                        alternative_matches[pattern] += 1
-                        potential_course_urls += 1
+
+            # Section and subject only: with the slug every course URL would be its own pattern
+            parts = url.replace(self.base_url, '').strip('/').split('/', 2)
+            self.url_patterns['/'.join(parts[:2])] += 1
+
+            if not self.COURSE_URL_PATTERN.match(url):
+                # Count course-like URLs our pattern misses
+                for name, pattern in self.ALTERNATIVE_URL_PATTERNS.items():
+                    if pattern.search(url):
+                        self.alternative_matches[name] += 1
                         break
-        
-        # Log summary of alternative patterns at debug level
-        self.logger.debug(f"Found {potential_course_urls} potential course URLs that don't match our current pattern")
-        for pattern, count in alternative_matches.items():
-            if count > 0:
-                self.logger.debug(f"  - Alternative pattern '{pattern}' matched {count} URLs")
-            
-        # Continue with normal filtering
-        for entry in total_entries:
+                continue
+
+            # Courses whose lastmod hasn't advanced since they were last fetched are skipped
+            json_url = self._convert_to_json_url(url)
+            if not self.should_fetch(json_url, entry.get('lastmod')):
+                continue
+
             # If in testing mode and we've reached the limit, stop
             if self.TESTING and count >= self.TEST_LIMIT:
                 self.logger.debug(f"Test limit reached ({self.TEST_LIMIT}), stopping sitemap filter")
                 break
-                
-            url = entry['loc']
-            pattern = rf'^{re.escape(self.base_url)}/learn/[^/]+/[^/]+$'
-            
-            if re.match(pattern, url):
-                # Remove individual URL logging for matched URLs
-                entry['loc'] = self._convert_to_json_url(entry['loc'])
-                count += 1
-                self.urls_matched_pattern += 1
-                yield entry
-            else:
-                # Remove logging for non-matched URLs
-                pass
-        
-        self.logger.info(f"Sitemap filter yielded {self.urls_matched_pattern} matching URLs out of {self.sitemap_urls_found} total")
+
+            entry['loc'] = json_url
+            count += 1
+            self.urls_matched_pattern += 1
+            yield entry
+
+        self.logger.info(f"Sitemap filter yielded {count} matching URLs out of {seen} entries. Testing mode: {self.TESTING}")
+
+    def _log_sitemap_patterns(self):
+        """Log the URL pattern counts collected by sitemap_filter and add them to the crawl stats"""
+        self.logger.debug("URL patterns found in sitemap:")
+        for pattern, count in self.url_patterns.most_common(5):
+            self.logger.debug(f"  - Pattern: {pattern}, Count: {count}")
+
+        potential_course_urls = sum(self.alternative_matches.values())
+        self.logger.debug(f"Found {potential_course_urls} potential course URLs that don't match our current pattern")
+        for name, count in self.alternative_matches.items():
+            self.logger.debug(f"  - Alternative pattern '{self.ALTERNATIVE_URL_PATTERNS[name].pattern}' matched {count} URLs")
+
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.set_value('sitemap/urls_found', self.sitemap_urls_found, spider=self)
+            crawler.stats.set_value('sitemap/urls_matched', self.urls_matched_pattern, spider=self)
+            for name, count in self.alternative_matches.items():
+                crawler.stats.set_value(f'sitemap/alternative/{name}', count, spider=self)
 
     def start_requests(self):
         self.logger.info("Starting requests for EdxSpider")
@@ -165,10 +178,8 @@ class EdxSpider(SitemapSpider, BaseSpider):
             self.logger.info(f"Found urlset sitemap with {url_count} URLs")
             
             # Move sample URL logging to debug level and reduce to 2 samples
-            import re
-            urls = re.findall(b'<loc>([^<]+)</loc>', body)[:2]
-            for url in urls:
-                self.logger.debug(f"Sample URL from sitemap: {url.decode('utf-8')}")
+            for match in islice(self.SITEMAP_LOC_PATTERN.finditer(body), 2):
+                self.logger.debug(f"Sample URL from sitemap: {match.group(1).decode('utf-8')}")
         else:
             self.logger.warning(f"Unknown sitemap format at {response.url}")
         
@@ -184,13 +195,6 @@ class EdxSpider(SitemapSpider, BaseSpider):
         # Remove individual URL conversion logging
         return json_url
 
-    def _clean_html_description(self, html_description):
-        """Remove <p> tags and newlines from HTML description."""
-        if not html_description:
-            return ""
-        soup = bs4.BeautifulSoup(html_description, 'html.parser')
-        return ' '.join(soup.stripped_strings)
-
     def _get_seat_info(self, seats, enrollment_start=None, enrollment_end=None):
         """
         Extract pricing and certificate information from course seats.
@@ -289,8 +293,9 @@ class EdxSpider(SitemapSpider, BaseSpider):
         # Keep high-level parse logging for production
         self.logger.info(f"Parsing URL: {response.url}")
         try:
-            json_data = response.json()
-            course = json_data.get('result', {}).get('pageContext', {}).get('course', {})
+            course = load_subtree(
+                response.body, self.COURSE_PATH, self.settings.getint('PAGE_DATA_FULL_PARSE_BYTES', 256 * 1024)
+            )
             
             if not course:
                 self.logger.warning(f"No course data found in response from {response.url}")
@@ -299,17 +304,25 @@ class EdxSpider(SitemapSpider, BaseSpider):
             # Move detailed course info to debug level
             self.logger.debug(f"Found course: {course.get('title')}")
             
-            active_run = course.get('activeCourseRun', {})
+            active_run = course.get('activeCourseRun') or {}
             clean_url = response.url.replace('page-data/', '').replace('page-data.json', '')
 
             
+            # Each description is parsed once; the cleaning pipeline reuses the derived forms
+            full_description = process_html(course.get('fullDescription'))
+            short_description = process_html(course.get('shortDescription'))
+
             seat_info = self._get_seat_info(
                 active_run.get('seats', []),
                 enrollment_start=active_run.get('enrollmentStart'),
                 enrollment_end=active_run.get('enrollmentEnd')
             )
+            review_rating = get_path(course, ('courseReview', 'avgCourseRating'))
             
             learning_resource = {
+                field: get_path(course, path) for field, path in self.COURSE_FIELDS
+            }
+            learning_resource.update({
                 'creators': [
                     {
                         'name': owner.get('name'),
@@ -321,38 +334,36 @@ class EdxSpider(SitemapSpider, BaseSpider):
                     }
                     for owner in course.get('owners', [])
                 ],
-                'name': course.get('title'),
                 'url': clean_url,
                 'scraped_timestamp': datetime.now().isoformat(),
                 'platform_id': 'edx',
-                'description': self._clean_html_description(course.get('fullDescription')),
-                'html_description': course.get('fullDescription'),
-                'platform_course_id': course.get('uuid'),
+                'description': full_description.text,
+                'html_description': full_description.html,
                 'languages': course.get('language', self.LANGUAGE),
                 'is_free': seat_info['is_free'],
                 'is_limited_free': seat_info['is_limited_free'],
                 'dollar_price': float(seat_info['dollar_price']) if seat_info['dollar_price'] else None, # should be improved e.g. does not work for this page https://www.edx.org/learn/business-administration/acca-business-and-technology
                 'has_certificate': seat_info['has_certificate'],
-                'short_description': self._clean_html_description(course.get('shortDescription')),
-                'platform_last_update': course.get('updatedAt'),
-                'platform_thumbnail_url': course.get('originalImage', {}).get('src'),
+                'short_description': short_description.text,
                 'duration_h': self._calculate_duration_hours(active_run),
-                'plarform_reviews_count': course.get('courseReview', {}).get('reviewCount'),
-                'platform_reviews_rating': round(float(course.get('courseReview', {}).get('avgCourseRating', 0)), 2) if course.get('courseReview', {}).get('avgCourseRating') else None,
+                'platform_reviews_rating': round(float(review_rating), 2) if review_rating else None,
                 'level': self._standardize_level(course.get('levelType')),
-                'short_description': self._clean_html_description(course.get('shortDescription')),
-                'enrollment_count': course.get('enrollmentCount', None),
                 'is_active': active_run.get('isEnrollable', True),
                 'tags': self._get_course_tags(course),
                 'format': self.FORMAT,
-            }
+            })
 
             self.successful_parses += 1
+            self.mark_fetched(response)
             self.logger.info(f"Successfully parsed course: {course.get('title')} ({self.successful_parses} total)")
             
             yield {
                 'type': 'learning_resource',
-                'data': learning_resource
+                'data': learning_resource,
+                'processed_html': {
+                    'description': full_description.as_dict(),
+                    'short_description': short_description.as_dict(),
+                },
             }
             
         except Exception as e:
@@ -370,4 +381,5 @@ class EdxSpider(SitemapSpider, BaseSpider):
         self.logger.info(f"- URLs matching pattern: {self.urls_matched_pattern}")
         self.logger.info(f"- Total requests made: {self.requests_made}")
         self.logger.info(f"- Successfully parsed courses: {self.successful_parses}")
+        self._log_sitemap_patterns()
         # super().closed(reason)
\ No newline at end of file
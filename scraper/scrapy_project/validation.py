@@ -0,0 +1,77 @@
+from typing import Any, Dict, Iterable, List, Union
+from pydantic import TypeAdapter, ValidationError
+from .validators import CreatorBase, ValidatedLearningResource
+
+# Compiled once per process; validating a list goes through a single core validator call
+RESOURCE_ADAPTER = TypeAdapter(ValidatedLearningResource)
+RESOURCE_LIST_ADAPTER = TypeAdapter(List[ValidatedLearningResource])
+
+# Fields the pipelines may rewrite between the first validation and the database save
+TEXT_FIELDS = ('name', 'description', 'short_description')
+CREATOR_TEXT_FIELDS = ('name', 'description')
+
+
+def validate_resource(data: Dict[str, Any]) -> ValidatedLearningResource:
+    """Validate and coerce a learning resource's data; raises ValidationError"""
+    return RESOURCE_ADAPTER.validate_python(data)
+
+
+def validate_resources(batch: List[Dict[str, Any]]) -> List[Union[ValidatedLearningResource, ValidationError]]:
+    """
+    Validate a list of learning resources in one call. The result has the model, or the
+    ValidationError for that item, at each position.
+    """
+    try:
+        return RESOURCE_LIST_ADAPTER.validate_python(batch)
+    except ValidationError:
+        pass
+
+    # Some items are invalid: validate them one by one to tell which
+    results = []
+    for data in batch:
+        try:
+            results.append(RESOURCE_ADAPTER.validate_python(data))
+        except ValidationError as e:
+            results.append(e)
+    return results
+
+
+def validated_text(model: ValidatedLearningResource) -> Dict[str, Any]:
+    """The validated values of the fields later stages may rewrite, as plain data an item can carry"""
+    return {
+        **{field: getattr(model, field) for field in TEXT_FIELDS},
+        'creators': [
+            {field: getattr(creator, field) for field in CREATOR_TEXT_FIELDS} for creator in model.creators
+        ],
+    }
+
+
+def _revalidate(model_class: Any, validated: Dict[str, Any], values: Dict[str, Any], fields: Iterable[str]) -> None:
+    # Field validators don't look at the other fields, so an unvalidated instance is enough
+    model = None
+    for field in fields:
+        if field not in values:
+            values[field] = validated[field]
+        elif values[field] != validated[field]:
+            if model is None:
+                model = model_class.model_construct()
+            model_class.__pydantic_validator__.validate_assignment(model, field, values[field])
+            values[field] = getattr(model, field)
+
+
+def revalidate_changes(validated: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """
+    Re-run the validators of only the text fields that changed in data since validated_text
+    was taken, updating data in place. If creators were added or removed the data is
+    validated from scratch. Raises ValidationError.
+    """
+    creators = data.get('creators') or []
+    if len(creators) != len(validated['creators']):
+        model = validate_resource(data)
+        data.clear()
+        data.update(model.model_dump())
+        return
+
+    _revalidate(ValidatedLearningResource, validated, data, TEXT_FIELDS)
+    for creator_validated, creator_data in zip(validated['creators'], creators):
+        _revalidate(CreatorBase, creator_validated, creator_data, CREATOR_TEXT_FIELDS)
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, List, Dict
 from pydantic import BaseModel, HttpUrl, UUID4, field_validator, Field
 from decimal import Decimal
-import pycountry
+from core.languages import resolve_language, is_language_code
 
 class CreatorBase(BaseModel):
     name: str
@@ -158,36 +158,8 @@ class LearningResourceInput(LearningResourceBase):
         if not v:
             raise ValueError('At least one language must be specified')
         
-        clean_languages = []
-        for lang in v:
-            lang = lang.strip()
-            # Try to find language by name or code
-            try:
-                # Try as 2-letter code
-                language = pycountry.languages.get(alpha_2=lang.lower())
-                if language:
-                    clean_languages.append(language.alpha_2)
-                    continue
-
-                # Try as 3-letter code
-                language = pycountry.languages.get(alpha_3=lang.lower())
-                if language:
-                    clean_languages.append(language.alpha_2)
-                    continue
-
-                # Try as name
-                language = pycountry.languages.get(name=lang.title())
-                if language and hasattr(language, 'alpha_2'):
-                    clean_languages.append(language.alpha_2)
-                    continue
-
-                # If not found, keep original for manual review
-                clean_languages.append(lang.lower())
-
-            except (AttributeError, KeyError):
-                clean_languages.append(lang.lower())
-
-        return clean_languages
+        # Unknown languages are kept for manual review
+        return [resolve_language(lang) or lang.strip().lower() for lang in v]
 
 class LearningResourceOutput(LearningResourceBase):
     """Validation model for learning resource data before saving to database"""
@@ -203,9 +175,19 @@ class LearningResourceOutput(LearningResourceBase):
         for lang in v:
             lang = lang.strip().lower()
             # Verify it's a valid ISO 639-1 code
-            language = pycountry.languages.get(alpha_2=lang)
-            if not language:
+            if not is_language_code(lang):
                 raise ValueError(f'Invalid ISO 639-1 language code: {lang}')
             clean_languages.append(lang)
 
-        return clean_languages
\ No newline at end of file
+        return clean_languages
+
+class ValidatedLearningResource(LearningResourceInput):
+    """
+    Input coercions and output checks in a single pass: languages are resolved like
+    LearningResourceInput does, then held to LearningResourceOutput's ISO 639-1 rule.
+    """
+
+    @field_validator('languages')
+    @classmethod
+    def validate_languages_resolved(cls, v: List[str]) -> List[str]:
+        return LearningResourceOutput.validate_languages_output(v)
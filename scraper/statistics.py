@@ -16,4 +16,46 @@ class SpiderStatisticsManager:
         return self.stats.get(stat_name, 0)
 
     def set_stat(self, stat_name: str, value):
-        self.stats[stat_name] = value 
\ No newline at end of file
+        self.stats[stat_name] = value 
+
+
+# Stats every shard reports about the same thing (a snapshot, a gauge, a wall clock), so
+# the largest value is kept rather than the sum
+MAX_STATS = ('elapsed_time_seconds', 'frontier/known_urls', 'duplicate_filter/existing_keys')
+MAX_STAT_SUFFIXES = ('max', '/concurrency', '/delay')
+
+
+def merge_shard_stats(shard_stats):
+    """
+    Combine the crawl stats of the shards of one execution: counts are summed, snapshots and
+    maxima keep the largest value, start_time/finish_time span all shards and the per-shard
+    stats are kept under 'shards'. Takes stats as stored on an Execution (JSON-safe).
+    """
+    merged = {}
+    for stats in shard_stats:
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or key.startswith('sharded/'):
+                continue
+            if key not in merged:
+                merged[key] = value
+            elif key in MAX_STATS or key.endswith(MAX_STAT_SUFFIXES):
+                merged[key] = max(merged[key], value)
+            elif key.endswith('min'):
+                merged[key] = min(merged[key], value)
+            else:
+                merged[key] += value
+
+    # ISO timestamps in the same timezone order as strings
+    for key, pick in (('start_time', min), ('finish_time', max)):
+        values = [stats[key] for stats in shard_stats if stats.get(key)]
+        if values:
+            merged[key] = pick(values)
+    reasons = sorted({stats['finish_reason'] for stats in shard_stats if stats.get('finish_reason')})
+    if reasons:
+        merged['finish_reason'] = ', '.join(reasons)
+    if merged.get('conditional/requests'):
+        merged['conditional/hit_rate'] = round(
+            merged.get('conditional/not_modified', 0) / merged['conditional/requests'], 4
+        )
+    merged['shards'] = shard_stats
+    return merged
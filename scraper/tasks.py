@@ -1,4 +1,4 @@
-from celery import shared_task
+from celery import chord, shared_task
 from celery.utils.log import get_task_logger
 from django.utils.timezone import now
 from scraper.logging import SpiderExecutionLogger
@@ -12,7 +12,8 @@ from scrapy import signals
 import importlib
 import logging
 
-from scraper.statistics import SpiderStatisticsManager
+from scraper.statistics import SpiderStatisticsManager, merge_shard_stats
+from scraper.scrapy_project.shared_queue import SharedCrawlQueue
 from scraper.executor import SpiderExecutor
 
 # Configure crochet to use the reactor without trying to install it
@@ -24,9 +25,20 @@ def start_spiders(self):
     """Start all active spiders"""
     logger.info("Starting scheduled spider runs")
     for spider in SpiderModel.objects.filter(active=True):
-        run_spider.delay(spider.id)
+        schedule_spider(spider)
     return "Scheduled all active spiders"
 
+def schedule_spider(spider_model):
+    """
+    Queue a run of the spider; one with SHARDED_CRAWL_SHARDS > 1 in its Spider row's
+    settings runs as that many shards in parallel
+    """
+    shards = int((spider_model.settings or {}).get('SHARDED_CRAWL_SHARDS', 1))
+    if shards > 1:
+        run_sharded_spider.delay(spider_model.id, shards)
+    else:
+        run_spider.delay(spider_model.id)
+
 @shared_task(
     bind=True,
     rate_limit='3/m',  # Limit to 3 spiders per minute
@@ -44,3 +56,48 @@ def run_spider(self, spider_id):
         logger.error(f"Spider task failed: {str(e)}", exc_info=True)
         raise
 
+@shared_task(bind=True)
+def run_sharded_spider(self, spider_id, shards=2):
+    """
+    Run one execution of a spider as shards crawl tasks in parallel. The shards split the
+    sitemaps and share their pages through Redis (see ShardedCrawlMiddleware); the execution
+    gets their merged stats once all of them are done.
+    """
+    spider_model = SpiderModel.objects.get(id=spider_id)
+    execution = Execution.objects.create(spider=spider_model, time_started=now())
+    logger.info(f"Starting execution {execution.id} of {spider_model.name} in {shards} shards")
+    chord(
+        run_spider_shard.s(spider_id, execution.id, shard, shards) for shard in range(shards)
+    )(finish_sharded_execution.s(execution.id))
+    return execution.id
+
+@shared_task(
+    bind=True,
+    soft_time_limit=3600,
+    acks_late=True
+)
+def run_spider_shard(self, spider_id, execution_id, shard, shards):
+    """Run one shard of a sharded execution and return its crawl stats"""
+    try:
+        spider_model = SpiderModel.objects.get(id=spider_id)
+        execution = Execution.objects.get(id=execution_id)
+        executor = SpiderExecutor(spider_model, execution=execution, shard=shard, shards=shards)
+        return executor.execute()
+    except Exception as e:
+        logger.error(f"Shard {shard} of execution {execution_id} failed: {str(e)}", exc_info=True)
+        raise
+
+@shared_task
+def finish_sharded_execution(shard_stats, execution_id):
+    """Store the merged stats of all shards on the coordinating execution"""
+    execution = Execution.objects.get(id=execution_id)
+    stats = merge_shard_stats([stats or {} for stats in shard_stats])
+    execution.stats = stats
+    execution.time_ended = now()
+    execution.items_scraped = stats.get('item_scraped_count', 0)
+    execution.save(update_fields=['stats', 'time_ended', 'items_scraped'])
+
+    SharedCrawlQueue.from_url(
+        get_project_settings().get('SHARDED_CRAWL_REDIS_URL'), execution_id, len(shard_stats)
+    ).clear()
+    return f"Execution {execution_id}: {execution.items_scraped} items from {len(shard_stats)} shards"
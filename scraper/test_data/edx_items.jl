@@ -0,0 +1,10 @@
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "mitx-6.00.1x", "name": "Introduction to Computer Science and Programming Using Python", "description": "<p>This course is the first of a two-course sequence: <strong>Introduction to Computer Science and Programming Using Python</strong>, and Introduction to Computational Thinking and Data Science.</p>\n<p>Together, they are designed to help people with no prior exposure to computer science or programming learn to think computationally and write programs to tackle useful problems.</p>\n<ul>\n<li>Python&nbsp;3 basics</li>\n<li>Simple algorithms &mdash; search and sort</li>\n<li>Testing &amp; debugging</li>\n</ul>", "short_description": "<p>An introduction to computer science as a tool to solve real-world analytical problems using Python 3.5.</p>", "html_description": "<p>This course is the first of a two-course sequence: <strong>Introduction to Computer Science and Programming Using Python</strong>, and Introduction to Computational Thinking and Data Science.</p>\n<p>Together, they are designed to help people with no prior exposure to computer science or programming learn to think computationally and write programs to tackle useful problems.</p>\n<ul>\n<li>Python&nbsp;3 basics</li>\n<li>Simple algorithms &mdash; search and sort</li>\n<li>Testing &amp; debugging</li>\n</ul>", "url": "https://www.edx.org/learn/mitx-6.00.1x", "creators": [{"name": "MITx", "platform_id": "edx", "platform_creator_id": "mitx", "description": "<p>MITx on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "harvardx-cs50", "name": "CS50's Introduction to Computer Science", "description": "<p>This is CS50x , Harvard University's introduction to the intellectual enterprises of computer science and the art of programming for majors and non-majors alike, with or without prior programming experience.</p><p>Languages include C, Python, SQL, and JavaScript plus CSS and HTML.&nbsp;</p><p><br></p><p>Problem sets inspired by real-world domains of biology, cryptography, finance, forensics, and gaming.</p>", "short_description": "<p>An introduction to the intellectual enterprises of computer science and the art of programming.</p>", "html_description": "<p>This is CS50x , Harvard University's introduction to the intellectual enterprises of computer science and the art of programming for majors and non-majors alike, with or without prior programming experience.</p><p>Languages include C, Python, SQL, and JavaScript plus CSS and HTML.&nbsp;</p><p><br></p><p>Problem sets inspired by real-world domains of biology, cryptography, finance, forensics, and gaming.</p>", "url": "https://www.edx.org/learn/harvardx-cs50", "creators": [{"name": "HarvardX", "platform_id": "edx", "platform_creator_id": "harvardx", "description": "<p>HarvardX on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "delftx-sol", "name": "Solar Energy: Photovoltaic (PV) Energy Conversion", "description": "<p class=\"MsoNormal\" style=\"margin-bottom:0in;line-height:normal\"><span style=\"font-size:10.0pt;font-family:&quot;Arial&quot;,sans-serif\">Learn how solar cells convert light into electricity &amp; how PV systems are designed.</span></p>\n<!--[if gte mso 9]><xml><o:OfficeDocumentSettings></o:OfficeDocumentSettings></xml><![endif]-->\n<p class=\"MsoListParagraphCxSpFirst\"><![if !supportLists]><span>&middot;<span>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</span></span><![endif]>Efficiency limits &ndash; Shockley&ndash;Queisser</p>", "short_description": "Learn how solar cells convert light into electricity &amp;amp; how to design PV systems.", "html_description": "<p class=\"MsoNormal\" style=\"margin-bottom:0in;line-height:normal\"><span style=\"font-size:10.0pt;font-family:&quot;Arial&quot;,sans-serif\">Learn how solar cells convert light into electricity &amp; how PV systems are designed.</span></p>\n<!--[if gte mso 9]><xml><o:OfficeDocumentSettings></o:OfficeDocumentSettings></xml><![endif]-->\n<p class=\"MsoListParagraphCxSpFirst\"><![if !supportLists]><span>&middot;<span>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</span></span><![endif]>Efficiency limits &ndash; Shockley&ndash;Queisser</p>", "url": "https://www.edx.org/learn/delftx-sol", "creators": [{"name": "DelftX", "platform_id": "edx", "platform_creator_id": "delftx", "description": "<p>DelftX on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "ibm-ds0101en", "name": "Data Science Foundations", "description": "<h3>About this course</h3><p>Data Science is one of the hottest professions of the decade &ndash; and the demand for data scientists keeps growing.</p><p>Learn the fundamentals of data science &amp; machine learning: <em>data types &lt;int&gt;, &lt;str&gt;</em>, pandas, and SQL.</p><p>Earn a verified certificate &#8212; share it on LinkedIn.</p>", "short_description": "What is data science? Who is a data scientist &#39;s day like?", "html_description": "<h3>About this course</h3><p>Data Science is one of the hottest professions of the decade &ndash; and the demand for data scientists keeps growing.</p><p>Learn the fundamentals of data science &amp; machine learning: <em>data types &lt;int&gt;, &lt;str&gt;</em>, pandas, and SQL.</p><p>Earn a verified certificate &#8212; share it on LinkedIn.</p>", "url": "https://www.edx.org/learn/ibm-ds0101en", "creators": [{"name": "IBM", "platform_id": "edx", "platform_creator_id": "ibm", "description": "<p>IBM on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "usmx-mba", "name": "Business Analytics for Data-Driven Decision Making", "description": "<div><p><strong>Week 1:</strong> Getting started<br/>Week 2: Descriptive statistics &amp;amp; visualization<br />Week 3: Regression &#150; linear models</p></div><div><p>AT&T and P&G case studies.</p></div>", "short_description": "<p>Use data to make better decisions&nbsp;&mdash; no prior experience required.</p>", "html_description": "<div><p><strong>Week 1:</strong> Getting started<br/>Week 2: Descriptive statistics &amp;amp; visualization<br />Week 3: Regression &#150; linear models</p></div><div><p>AT&T and P&G case studies.</p></div>", "url": "https://www.edx.org/learn/usmx-mba", "creators": [{"name": "University System of Maryland", "platform_id": "edx", "platform_creator_id": "university-system-of-maryland", "description": "<p>University System of Maryland on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "uqx-write101x", "name": "English Grammar and Style", "description": "<p>Do you want to improve your writing? Are you unsure about when to use &quot;who&quot; vs &quot;whom&quot;, or &lsquo;affect&rsquo; vs &lsquo;effect&rsquo;?</p>\n<p>This course will help you write clear, concise &amp; error-free sentences&hellip;</p>\n<table><tr><td>Module 1</td><td>Nouns &amp;&nbsp;pronouns</td></tr><tr><td>Module 2</td><td>Verbs</td></tr></table>", "short_description": "Learn the grammar &amp; style rules that make writing easier to read.", "html_description": "<p>Do you want to improve your writing? Are you unsure about when to use &quot;who&quot; vs &quot;whom&quot;, or &lsquo;affect&rsquo; vs &lsquo;effect&rsquo;?</p>\n<p>This course will help you write clear, concise &amp; error-free sentences&hellip;</p>\n<table><tr><td>Module 1</td><td>Nouns &amp;&nbsp;pronouns</td></tr><tr><td>Module 2</td><td>Verbs</td></tr></table>", "url": "https://www.edx.org/learn/uqx-write101x", "creators": [{"name": "UQx", "platform_id": "edx", "platform_creator_id": "uqx", "description": "<p>UQx on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "tsinghuax-chinese", "name": "Chinese for Beginners", "description": "<p>Learn basic Mandarin: <ruby>汉<rp>(</rp><rt>hàn</rt><rp>)</rp>字<rp>(</rp><rt>zì</rt><rp>)</rp></ruby> and everyday phrases.</p><p>No prior knowledge needed&#12290;</p>", "short_description": "<p>Everyday Mandarin for absolute beginners.</p>", "html_description": "<p>Learn basic Mandarin: <ruby>汉<rp>(</rp><rt>hàn</rt><rp>)</rp>字<rp>(</rp><rt>zì</rt><rp>)</rp></ruby> and everyday phrases.</p><p>No prior knowledge needed&#12290;</p>", "url": "https://www.edx.org/learn/tsinghuax-chinese", "creators": [{"name": "PekingX", "platform_id": "edx", "platform_creator_id": "pekingx", "description": "<p>PekingX on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "linuxfoundationx-lfs101x", "name": "Introduction to Linux", "description": "<p>Develop a good working knowledge of Linux using both the graphical interface and command line.</p><pre><code>$ ls -l /etc\n$ grep -r &quot;root&quot; /etc/passwd</code></pre><p>Covers the <code>&lt;bash&gt;</code> shell, permissions &amp; more.</p><script type=\"text/javascript\">window.dataLayer = [];</script>", "short_description": "Develop a good working knowledge of Linux.", "html_description": "<p>Develop a good working knowledge of Linux using both the graphical interface and command line.</p><pre><code>$ ls -l /etc\n$ grep -r &quot;root&quot; /etc/passwd</code></pre><p>Covers the <code>&lt;bash&gt;</code> shell, permissions &amp; more.</p><script type=\"text/javascript\">window.dataLayer = [];</script>", "url": "https://www.edx.org/learn/linuxfoundationx-lfs101x", "creators": [{"name": "The Linux Foundation", "platform_id": "edx", "platform_creator_id": "the-linux-foundation", "description": "<p>The Linux Foundation on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "edx-accessibility", "name": "Web Accessibility", "description": "<p>Make web content accessible:<ol><li>Use <code>alt</code> text&nbsp;<li>Contrast ratios &gt; 4.5:1<li>Keyboard navigation</ol><p>Malformed markup in the wild: 1 < 2 and <b>bold text", "short_description": "Accessibility for everyone &ndash; including x&nbspy and &amp;copy; notices.", "html_description": "<p>Make web content accessible:<ol><li>Use <code>alt</code> text&nbsp;<li>Contrast ratios &gt; 4.5:1<li>Keyboard navigation</ol><p>Malformed markup in the wild: 1 < 2 and <b>bold text", "url": "https://www.edx.org/learn/edx-accessibility", "creators": [{"name": "W3Cx", "platform_id": "edx", "platform_creator_id": "w3cx", "description": "<p>W3Cx on edX</p>"}]}}
+{"type": "learning_resource", "data": {"platform_id": "edx", "platform_course_id": "berkeleyx-cs169", "name": "Agile Software Development", "description": "<title>Agile</title><p>Build SaaS apps with Ruby on Rails.</p><p><![CDATA[Legacy CDATA text]]> and TDD/BDD with RSpec &amp; Cucumber.</p><style>.x{color:red}</style><template><p>hidden</p></template>", "short_description": "<p>Agile development &amp;nbsp;for SaaS.</p>", "html_description": "<title>Agile</title><p>Build SaaS apps with Ruby on Rails.</p><p><![CDATA[Legacy CDATA text]]> and TDD/BDD with RSpec &amp; Cucumber.</p><style>.x{color:red}</style><template><p>hidden</p></template>", "url": "https://www.edx.org/learn/berkeleyx-cs169", "creators": [{"name": "BerkeleyX", "platform_id": "edx", "platform_creator_id": "berkeleyx", "description": "<p>BerkeleyX on edX</p>"}]}}
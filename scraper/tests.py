@@ -1,3 +1,591 @@
-from django.test import TestCase
+import http.server
+import json
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from unittest import mock
 
-# Create your tests here.
+import crochet
+from bs4 import BeautifulSoup
+from algoliasearch_django.decorators import disable_auto_indexing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils.timezone import now
+from scrapy.crawler import CrawlerRunner
+from scrapy.exceptions import DropItem
+from scrapy.settings import Settings
+from scrapy.spiders import SitemapSpider, Spider
+from scrapy.statscollectors import StatsCollector
+from twisted.internet import defer, task
+
+from scraper.dumps import iter_dump_items
+from scraper.executor import SpiderExecutor
+from scraper.management.commands.benchmark_page_data import sample_page
+from scraper.management.commands.benchmark_text_cleaner import SAMPLE_FIELDS, legacy_clean_text
+from core.models import Creator, LearningResource, Tag
+from scraper.models import Execution, Spider as SpiderModel
+from scraper.scrapy_project.html_processing import html_to_text, process_html
+from scraper.scrapy_project.page_data import get_path, load_subtree
+from scraper.scrapy_project.pipelines.learning_resources.clean_text import TextCleanerPipeline
+from scraper.scrapy_project.pipelines.learning_resources.duplicate_filter import DuplicateFilterPipeline
+from scraper.scrapy_project.pipelines.learning_resources.fingerprint import content_fingerprint
+from scraper.scrapy_project.pipelines.learning_resources.database_save import DatabaseSavePipeline
+from scraper.scrapy_project.pipelines.temp_save.segments import SegmentReader, SegmentWriter
+from scraper.scrapy_project.shared_queue import SharedCrawlQueue
+from scraper.tasks import finish_sharded_execution
+
+SHARDED_MIDDLEWARE = 'scraper.scrapy_project.middlewares.ShardedCrawlMiddleware'
+
+
+class InMemoryRedis:
+    """The Redis commands SharedCrawlQueue uses, for a single process; pipelines run in order"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return _InMemoryPipeline(self)
+
+    def sadd(self, key, value):
+        members = self.data.setdefault(key, set())
+        added = str(value) not in members
+        members.add(str(value))
+        return int(added)
+
+    def srem(self, key, value):
+        members = self.data.get(key, set())
+        removed = str(value) in members
+        members.discard(str(value))
+        return int(removed)
+
+    def scard(self, key):
+        return len(self.data.get(key, ()))
+
+    def lpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        for value in values:
+            items.insert(0, value)
+        return len(items)
+
+    def _range(self, items, start, stop):
+        start = max(len(items) + start, 0) if start < 0 else start
+        stop = len(items) + stop if stop < 0 else stop
+        return slice(start, max(start, stop + 1))
+
+    def lrange(self, key, start, stop):
+        items = self.data.get(key, [])
+        return items[self._range(items, start, stop)]
+
+    def ltrim(self, key, start, stop):
+        items = self.data.get(key, [])
+        self.data[key] = items[self._range(items, start, stop)]
+        return True
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.commands]
+
+
+class _SitemapHandler(http.server.BaseHTTPRequestHandler):
+    """A sitemap index of SITEMAPS sitemaps whose page ranges overlap, and JSON pages"""
+
+    SITEMAPS = 4
+    PAGES_PER_SITEMAP = 15
+    PAGES = (SITEMAPS - 1) * (PAGES_PER_SITEMAP - 5) + PAGES_PER_SITEMAP
+    hits = Counter()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.hits[self.path] += 1
+        base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        if self.path == '/sitemap.xml':
+            body = '<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + ''.join(
+                f'<sitemap><loc>{base}/sitemap-{index}.xml</loc></sitemap>' for index in range(self.SITEMAPS)
+            ) + '</sitemapindex>'
+        elif self.path.startswith('/sitemap-'):
+            index = int(self.path[len('/sitemap-'):-len('.xml')])
+            # Each sitemap repeats the last five pages of the previous one
+            first = index * (self.PAGES_PER_SITEMAP - 5)
+            body = '<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + ''.join(
+                f'<url><loc>{base}/page/{page}</loc></url>' for page in range(first, first + self.PAGES_PER_SITEMAP)
+            ) + '</urlset>'
+        else:
+            body = json.dumps({'path': self.path})
+        body = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubSitemapSpider(SitemapSpider):
+    name = 'stub_sitemap'
+    sitemap_base = None
+
+    def __init__(self, *args, **kwargs):
+        self.sitemap_urls = [f'{self.sitemap_base}/sitemap.xml']
+        super().__init__(*args, **kwargs)
+
+    def parse(self, response):
+        yield {'path': response.json()['path'], 'shard': self.shard}
+
+
+class ShardedCrawlTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _SitemapHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        StubSitemapSpider.sitemap_base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        _SitemapHandler.hits.clear()
+        self.redis = InMemoryRedis()
+        from_url = lambda url, execution_id, shards, ttl=0: SharedCrawlQueue(self.redis, execution_id, shards, ttl)
+        patcher = mock.patch.object(SharedCrawlQueue, 'from_url', side_effect=from_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _settings(self, **overrides):
+        return Settings({
+            'SPIDER_MIDDLEWARES': {SHARDED_MIDDLEWARE: 543},
+            'SHARDED_CRAWL_BATCH_SIZE': 7,
+            'SHARDED_CRAWL_MAX_IDLE_SECONDS': 60,
+            'ROBOTSTXT_OBEY': False,
+            'TELNETCONSOLE_ENABLED': False,
+            'LOG_ENABLED': False,
+            **overrides,
+        })
+
+    def _crawl(self, settings, execution_id, shards, run_shards):
+        """Run the given shards of an execution side by side; returns their crawlers"""
+        runner = CrawlerRunner(settings)
+        crawlers = [runner.create_crawler(StubSitemapSpider) for _ in run_shards]
+
+        @crochet.wait_for(timeout=60)
+        def crawl():
+            return defer.DeferredList([
+                runner.crawl(crawler, execution_id=execution_id, shard=shard, shards=shards)
+                for crawler, shard in zip(crawlers, run_shards)
+            ])
+
+        crawl()
+        return crawlers
+
+    def _json_stats(self, crawler):
+        # What SpiderExecutor hands the coordinator for a shard
+        return json.loads(json.dumps(crawler.stats.get_stats(), cls=DjangoJSONEncoder))
+
+    def test_shards_claim_every_url_once_and_stop_when_all_idle(self):
+        crawlers = self._crawl(self._settings(), execution_id=1, shards=2, run_shards=[0, 1])
+        stats = [crawler.stats.get_stats() for crawler in crawlers]
+
+        pages = _SitemapHandler.PAGES
+        self.assertEqual(len([path for path in _SitemapHandler.hits if path.startswith('/page/')]), pages)
+        self.assertEqual(len(_SitemapHandler.hits), 1 + _SitemapHandler.SITEMAPS + pages)
+        self.assertEqual(set(_SitemapHandler.hits.values()), {1})
+
+        queued = sum(shard_stats.get('sharded/queued', 0) for shard_stats in stats)
+        self.assertEqual(queued, _SitemapHandler.SITEMAPS + pages)
+        self.assertEqual(sum(shard_stats.get('sharded/claimed', 0) for shard_stats in stats), queued)
+        self.assertEqual(sum(shard_stats.get('item_scraped_count', 0) for shard_stats in stats), pages)
+        # Whichever shard ran out of work first parked until the other was idle too, then both
+        # closed on their own long before the idle limit
+        self.assertEqual([shard_stats['finish_reason'] for shard_stats in stats], ['finished', 'finished'])
+        self.assertTrue(all(shard_stats['elapsed_time_seconds'] < 30 for shard_stats in stats))
+        self.assertEqual(self.redis.llen('swotting:crawl:1:queue'), 0)
+
+    def test_shard_closes_after_max_idle_when_other_shards_never_start(self):
+        [crawler] = self._crawl(
+            self._settings(SHARDED_CRAWL_MAX_IDLE_SECONDS=0), execution_id=2, shards=2, run_shards=[1]
+        )
+        stats = crawler.stats.get_stats()
+
+        self.assertEqual(stats['finish_reason'], 'finished')
+        self.assertEqual(self.redis.scard('swotting:crawl:2:idle'), 1)
+
+    def test_finish_sharded_execution_merges_shard_stats(self):
+        crawlers = self._crawl(self._settings(), execution_id=3, shards=2, run_shards=[0, 1])
+        shard_stats = [self._json_stats(crawler) for crawler in crawlers]
+        spider = SpiderModel.objects.create(name='StubSitemap', module='scraper/tests.py')
+        execution = Execution.objects.create(spider=spider, time_started=now())
+        self.redis.data.clear()
+        SharedCrawlQueue(self.redis, execution.id, 2).push([{'url': 'http://example.com/left-over'}])
+
+        finish_sharded_execution(shard_stats, execution.id)
+
+        execution.refresh_from_db()
+        self.assertEqual(sum(stats.get('item_scraped_count', 0) for stats in shard_stats), _SitemapHandler.PAGES)
+        self.assertEqual(execution.items_scraped, _SitemapHandler.PAGES)
+        self.assertEqual(execution.stats['item_scraped_count'], _SitemapHandler.PAGES)
+        self.assertEqual(
+            execution.stats['downloader/request_count'],
+            sum(stats.get('downloader/request_count', 0) for stats in shard_stats),
+        )
+        # Per-shard stats are only kept under 'shards'
+        self.assertNotIn('sharded/shard', execution.stats)
+        self.assertEqual(
+            execution.stats['elapsed_time_seconds'], max(stats['elapsed_time_seconds'] for stats in shard_stats)
+        )
+        self.assertEqual(execution.stats['start_time'], min(stats['start_time'] for stats in shard_stats))
+        self.assertEqual(execution.stats['finish_reason'], 'finished')
+        self.assertEqual(execution.stats['shards'], shard_stats)
+        self.assertIsNotNone(execution.time_ended)
+        self.assertEqual(self.redis.data, {})
+
+    def test_executor_attaches_the_middleware_only_to_shards(self):
+        spider = SpiderModel.objects.create(name='StubSitemap', module='scraper/tests.py')
+
+        self.assertNotIn(SHARDED_MIDDLEWARE, SpiderExecutor(spider).settings.getdict('SPIDER_MIDDLEWARES'))
+        self.assertIn(
+            SHARDED_MIDDLEWARE, SpiderExecutor(spider, shard=0, shards=2).settings.getdict('SPIDER_MIDDLEWARES')
+        )
+
+
+class PageDataTests(SimpleTestCase):
+    PATH = ('result', 'pageContext', 'course')
+
+    def assertMatchesFullParse(self, body):
+        self.assertEqual(load_subtree(body, self.PATH, max_full_parse_bytes=0), get_path(json.loads(body), self.PATH))
+
+    def test_subtree_matches_full_parse(self):
+        self.assertMatchesFullParse(sample_page(related_courses=20))
+        self.assertMatchesFullParse(b'{"result": {"pageContext": {"x": "\\"course\\": 1", "course": {"course": [2]}}}}')
+        self.assertMatchesFullParse(b'{"result": {"pageContext": {"course": null}}}')
+
+    def test_missing_key_is_not_taken_from_a_sibling(self):
+        for body in (
+            b'{"result":{"pageContext":{"a":{"b":1}},"z":{"course":"WRONG"}}}',
+            b'{"result":{"pageContext":{"a":{"course":"WRONG"}},"course":"WRONG"}}',
+            b'{"result":{"pageContext":{}},"pageContext":{"course":"WRONG"}}',
+            b'{"result":{"pageContext":[{"course":"WRONG"}]}}',
+            b'{"other":{"result":{"pageContext":{"course":"WRONG"}}}}',
+        ):
+            with self.subTest(body=body):
+                self.assertIsNone(load_subtree(body, self.PATH, max_full_parse_bytes=0))
+                self.assertMatchesFullParse(body)
+
+
+class SegmentTests(SimpleTestCase):
+    LINE_BREAKS = '\u2028\u2029\u0085\x1c\x1d\x1e\x0b\x0c\r'
+
+    def test_records_round_trip_with_unicode_line_breaks(self):
+        records = [
+            {'id': str(number), 'description': f'{number}{self.LINE_BREAKS}{number}', 'tags': list(self.LINE_BREAKS)}
+            for number in range(7)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            writer = SegmentWriter(directory, block_records=3)
+            for record in records:
+                writer.write(record, key=record['id'])
+            writer.close()
+            reader = SegmentReader(directory)
+
+            self.assertEqual(list(reader), records)
+            for record in records:
+                self.assertEqual(reader.get(record['id']), record)
+
+
+class DatabaseSavePipelineTests(TestCase):
+    def test_periodic_failures_do_not_stop_the_loop(self):
+        pipeline = DatabaseSavePipeline(mode=DatabaseSavePipeline.BATCH_MODE)
+        raising = mock.Mock(side_effect=RuntimeError('boom'))
+        # What a check returns when the work ran on the writer thread
+        failing_deferred = mock.Mock(side_effect=lambda: defer.fail(RuntimeError('boom')))
+        for failing in (raising, failing_deferred):
+            with self.subTest(failing=failing):
+                loop = task.LoopingCall(pipeline._run_periodic, failing)
+                loop.clock = task.Clock()
+                loop.start(1, now=False)
+                with self.assertLogs(pipeline.logger, 'ERROR'):
+                    loop.clock.advance(1)
+                    loop.clock.advance(1)
+
+                self.assertEqual(failing.call_count, 2)
+                self.assertTrue(loop.running)
+                loop.stop()
+
+
+def learning_resource_data(platform_course_id, **overrides):
+    """Validated item data for a minimal edX learning resource"""
+    return {
+        'platform_id': 'edx',
+        'platform_course_id': platform_course_id,
+        'name': f'Course {platform_course_id}',
+        'description': f'About course {platform_course_id}',
+        'url': f'https://www.edx.org/learn/{platform_course_id}',
+        'creators': [{'platform_creator_id': f'creator-{platform_course_id}', 'name': f'School {platform_course_id}'}],
+        **overrides,
+    }
+
+
+def stats_spider():
+    spider = Spider(name='stats_spider')
+    spider.crawler = mock.Mock(stats=StatsCollector(mock.Mock(settings=Settings())))
+    return spider
+
+
+class GroupedDatabaseSaveTests(TransactionTestCase):
+    @disable_auto_indexing()
+    def test_failing_item_rolls_back_to_its_savepoint_and_is_dropped(self):
+        pipeline = DatabaseSavePipeline(transaction_size=3, transaction_timeout=0)
+        spider = stats_spider()
+        pipeline.open_spider(spider)
+
+        pipeline.process_item({'type': 'learning_resource', 'data': learning_resource_data('first')}, spider)
+        # The creator is written before the resource fails, the savepoint must undo it
+        with self.assertRaises(DropItem):
+            pipeline.process_item(
+                {'type': 'learning_resource', 'data': learning_resource_data('broken', name=None)}, spider
+            )
+        self.assertFalse(connection.get_autocommit())
+        pipeline.process_item({'type': 'learning_resource', 'data': learning_resource_data('second')}, spider)
+        pipeline.close_spider(spider)
+
+        self.assertTrue(connection.get_autocommit())
+        self.assertEqual(
+            set(LearningResource.objects.values_list('platform_course_id', flat=True)), {'first', 'second'}
+        )
+        self.assertFalse(Creator.objects.filter(platform_creator_id='creator-broken').exists())
+        stats = spider.crawler.stats
+        self.assertEqual(stats.get_value('database_save/transactions_committed'), 1)
+        self.assertEqual(stats.get_value('database_save/resources/inserted'), 2)
+        self.assertEqual(list(stats.get_value('database_save/failed_items')), ['broken'])
+
+    def test_only_a_transaction_size_set_above_the_project_settings_counts_as_set(self):
+        settings = Settings()
+        settings.setmodule('scraper.scrapy_project.settings', priority='project')
+        self.assertFalse(DatabaseSavePipeline.from_crawler(mock.Mock(settings=settings)).transaction_size_set)
+
+        settings.set('DATABASE_SAVE_TRANSACTION_SIZE', 1, priority='spider')
+        self.assertTrue(DatabaseSavePipeline.from_crawler(mock.Mock(settings=settings)).transaction_size_set)
+
+
+class TextCleanerParityTests(SimpleTestCase):
+    # Stored edX course items, descriptions as the course API returns them
+    EDX_ITEMS = os.path.join(os.path.dirname(__file__), 'test_data', 'edx_items.jl')
+
+    def _edx_fields(self):
+        for item in iter_dump_items([self.EDX_ITEMS]):
+            data = item['data']
+            for key in ('name', 'description', 'short_description', 'html_description'):
+                yield data[key]
+            for creator in data['creators']:
+                yield creator['name']
+                yield creator['description']
+
+    def test_matches_the_legacy_cleaner_on_stored_edx_descriptions(self):
+        for text in [*self._edx_fields(), *SAMPLE_FIELDS]:
+            with self.subTest(text=text):
+                self.assertEqual(html_to_text(text), legacy_clean_text(text))
+
+    def test_matches_the_legacy_cleaner_on_entities_and_non_body_text(self):
+        for text, expected in (
+            ('&amp;copy;', '&copy;'),
+            ('x&nbspy', 'x&nbspy'),
+            ('<p>x&nbspy &copy2020</p>', 'x&nbspy &copy2020'),
+            ('<title>Course</title><p>Body</p>', 'CourseBody'),
+            ('<p><![CDATA[kept]]> text</p>', 'kept text'),
+            ('<ruby>字<rt>zì</rt></ruby><script>x()</script>', '字'),
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(legacy_clean_text(text), expected)
+                self.assertEqual(html_to_text(text), expected)
+
+    def test_processed_text_matches_the_spiders_stripped_strings(self):
+        for item in iter_dump_items([self.EDX_ITEMS]):
+            markup = item['data']['html_description']
+            with self.subTest(markup=markup):
+                processed = process_html(markup)
+
+                self.assertEqual(processed.text, ' '.join(BeautifulSoup(markup, 'html.parser').stripped_strings))
+                self.assertNotIn('<script', processed.html)
+                self.assertNotIn('<style', processed.html)
+
+
+class MalformedMarkupTests(SimpleTestCase):
+    MALFORMED = (
+        ('a <b', 'a <b'),
+        ('1 < 2 and 3 > 2', '1 < 2 and 3 > 2'),
+        ('<p>Intro</p> <i', 'Intro <i'),
+        ('<p>Unclosed <b>bold', 'Unclosed bold'),
+        ('x</>y', 'xy'),
+    )
+
+    def test_unbalanced_markup_keeps_its_text(self):
+        for markup, expected in self.MALFORMED:
+            with self.subTest(markup=markup):
+                processed = process_html(markup)
+                item = {
+                    'type': 'learning_resource',
+                    'data': {'name': markup, 'description': processed.text, 'short_description': None},
+                    'processed_html': {'description': processed.as_dict()},
+                }
+
+                TextCleanerPipeline().process_item(item, spider=None)
+
+                self.assertEqual(processed.text, expected)
+                self.assertEqual(item['data']['description'], expected)
+                self.assertEqual(item['data']['name'], legacy_clean_text(markup))
+
+
+class ContentFingerprintTests(TestCase):
+    def test_fingerprint_ignores_ordering_and_number_formatting(self):
+        data = learning_resource_data('course', tags=['Python', 'SQL'], languages=['en', 'fr'], dollar_price=49)
+        reordered = learning_resource_data(
+            'course', tags=[' sql', 'python', 'Python'], languages=['fr', 'en'], dollar_price='49.00'
+        )
+
+        self.assertEqual(content_fingerprint(data), content_fingerprint(reordered))
+        self.assertNotEqual(content_fingerprint(data), content_fingerprint({**data, 'dollar_price': '49.01'}))
+
+    @disable_auto_indexing()
+    def test_unchanged_resources_are_skipped_and_changed_ones_updated(self):
+        pipeline = DatabaseSavePipeline()
+        spider = stats_spider()
+        pipeline.open_spider(spider)
+
+        def save(data):
+            pipeline.process_item({'type': 'learning_resource', 'data': data}, spider)
+            return LearningResource.objects.get(platform_course_id=data['platform_course_id'])
+
+        inserted = save(learning_resource_data('course'))
+        skipped = save(learning_resource_data('course'))
+        changed = learning_resource_data('course', description='A new description')
+        updated = save(changed)
+        pipeline.close_spider(spider)
+
+        stats = spider.crawler.stats
+        self.assertEqual(stats.get_value('database_save/resources/inserted'), 1)
+        self.assertEqual(stats.get_value('database_save/resources/skipped'), 1)
+        self.assertEqual(stats.get_value('database_save/resources/updated'), 1)
+        self.assertEqual(inserted.content_hash, content_fingerprint(learning_resource_data('course')))
+        # A skipped resource isn't written at all
+        self.assertEqual(skipped.updated_at, inserted.updated_at)
+        self.assertEqual(updated.description, 'A new description')
+        self.assertEqual(updated.content_hash, content_fingerprint(changed))
+        self.assertEqual(updated.creators.count(), 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'The COPY loader needs PostgreSQL')
+class CopyLoaderTests(TestCase):
+    def setUp(self):
+        # Tag ids cached by an earlier test may have been rolled back
+        Tag.clear_id_cache()
+
+    @disable_auto_indexing()
+    def copy_load(self, items):
+        """Run one crawl's worth of items through the 'copy' save mode and return its stats"""
+        pipeline = DatabaseSavePipeline(mode=DatabaseSavePipeline.COPY_MODE, batch_size=2, batch_timeout=0)
+        spider = stats_spider()
+        pipeline.open_spider(spider)
+        for data in items:
+            pipeline.process_item({'type': 'learning_resource', 'data': data}, spider)
+        pipeline.close_spider(spider)
+        return spider.crawler.stats
+
+    def tag_names(self, platform_course_id):
+        resource = LearningResource.objects.get(platform_course_id=platform_course_id)
+        return set(resource.tags.values_list('name', flat=True))
+
+    def test_latest_staged_row_and_its_relations_win(self):
+        stats = self.copy_load([
+            learning_resource_data('twice', tags=['python', 'sql']),
+            learning_resource_data('once', tags=['rust']),
+            # Staged in a later COPY chunk than the first row for the same course
+            learning_resource_data('twice', name='Renamed course', tags=['sql', 'go']),
+        ])
+
+        self.assertEqual(stats.get_value('database_save/resources/inserted'), 2)
+        self.assertEqual(LearningResource.objects.get(platform_course_id='twice').name, 'Renamed course')
+        self.assertEqual(self.tag_names('twice'), {'sql', 'go'})
+        self.assertEqual(self.tag_names('once'), {'rust'})
+        self.assertEqual(LearningResource.objects.get(platform_course_id='once').creators.count(), 1)
+
+    def test_merge_skips_unchanged_rows_and_replaces_changed_relations(self):
+        self.copy_load([learning_resource_data('kept', tags=['python']), learning_resource_data('edited', tags=['sql'])])
+        created = LearningResource.objects.get(platform_course_id='kept')
+
+        stats = self.copy_load([
+            learning_resource_data('kept', tags=['python']),
+            learning_resource_data('edited', description='Rewritten', tags=['go']),
+            learning_resource_data('added'),
+        ])
+
+        self.assertEqual(stats.get_value('database_save/resources/inserted'), 1)
+        self.assertEqual(stats.get_value('database_save/resources/updated'), 1)
+        self.assertEqual(stats.get_value('database_save/resources/skipped'), 1)
+        kept = LearningResource.objects.get(platform_course_id='kept')
+        self.assertEqual((kept.id, kept.updated_at), (created.id, created.updated_at))
+        self.assertEqual(LearningResource.objects.get(platform_course_id='edited').description, 'Rewritten')
+        self.assertEqual(self.tag_names('edited'), {'go'})
+
+
+class DuplicateFilterTests(TestCase):
+    @disable_auto_indexing()
+    def setUp(self):
+        pipeline = DatabaseSavePipeline()
+        pipeline.process_item({'type': 'learning_resource', 'data': learning_resource_data('stored')}, stats_spider())
+        self.spider = stats_spider()
+        self.spider.platform_id = 'edx'
+
+    def process(self, pipeline, platform_course_id, platform_id='edx'):
+        data = {'platform_id': platform_id, 'platform_course_id': platform_course_id}
+        return pipeline.process_item({'type': 'learning_resource', 'data': data}, self.spider)
+
+    def test_existing_keys_are_preloaded_once_and_dropped(self):
+        pipeline = DuplicateFilterPipeline(drop_existing=True)
+        with self.assertNumQueries(1):
+            pipeline.open_spider(self.spider)
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(DropItem):
+                self.process(pipeline, 'stored')
+            self.process(pipeline, 'new')
+            with self.assertRaises(DropItem):
+                self.process(pipeline, 'new')
+        # Another platform's keys are loaded on its first item
+        with self.assertNumQueries(1):
+            self.process(pipeline, 'stored', platform_id='coursera')
+            self.process(pipeline, 'other', platform_id='coursera')
+
+        stats = self.spider.crawler.stats
+        self.assertEqual(stats.get_value('duplicate_filter/existing_keys'), 1)
+        self.assertEqual(stats.get_value('duplicate_filter/dropped/existing'), 1)
+        self.assertEqual(stats.get_value('duplicate_filter/dropped/seen'), 1)
+
+    def test_existing_resources_pass_without_drop_existing(self):
+        pipeline = DuplicateFilterPipeline()
+        with self.assertNumQueries(0):
+            pipeline.open_spider(self.spider)
+            self.process(pipeline, 'stored')
+            with self.assertRaises(DropItem):
+                self.process(pipeline, 'stored')